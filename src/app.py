@@ -1,6 +1,6 @@
 from datetime import timedelta
 from infrastructure.repositories.alert_repository import AlertRepository
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
 from infrastructure.repositories.chat_history_repository import ChatHistoryRepository
 from controllers.chat_bot_controller import ChatbotController
 from infrastructure.repositories.tags_repository import TagsRepository
@@ -14,18 +14,22 @@ from infrastructure.repositories.goal_repository import GoalRepository
 from infrastructure.repositories.sub_goal_repository import SubGoalRepository
 from infrastructure.repositories.workstream_repository import WorkstreamRepository
 from infrastructure.repositories.self_reflection_repository import SelfReflectionRepository
+from infrastructure.repositories.agent_creation_job_repository import AgentCreationJobRepository
 from usecases.functionality_usecase import AgentFunctionalityUsecase
 from controllers.agent_controller import AgentController
 from controllers.group_chat_controller import GroupChatController
 from infrastructure.repositories.agent_repository import AgentRepository
 from infrastructure.repositories.group_chat_repository import GroupChatRepository
 from usecases.agent_usecase import AgentUsecase
+from usecases.agent_blueprint_engine import AgentBlueprintEngine
 from usecases.group_chat_usecase import GroupChatUsecase
 from infrastructure.llm.llm_service import LLMService
 from infrastructure.repositories.api_repository import APIRepository
 from infrastructure.scheduling_service import SchedulingService
 from infrastructure.embedding_service import EmbeddingService
 from infrastructure.api_descriptions import setup_embeddings
+from infrastructure.api_imports import API_CLIENT_FACTORIES
+from infrastructure.api_signature_index import get_api_signature_index
 from infrastructure.performance_analyzer import PerformanceAnalyzer
 from infrastructure.repositories.skill_repository import SkillRepository
 from controllers.feedback_controller import FeedbackController
@@ -56,8 +60,8 @@ CORS(app,
 
 
 llm_service = LLMService(model_name="gemini-1.5-flash")
-open_ai_service = OpenAiLLMService(model_name="gpt-4o-2024-08-06",
-                                   api_key=os.getenv('OPENAI_API_KEY'))
+open_ai_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06",
+                                         api_key=os.getenv('OPENAI_API_KEY'))
 
 # Session Configuration
 app.config['SESSION_PERMANENT'] = True  
@@ -90,10 +94,13 @@ skill_repo = SkillRepository()
 tag_repo = TagsRepository()
 trait_repo = TraitsRepository()
 category_repo = CategoryRepository()
+agent_creation_job_repo = AgentCreationJobRepository()
 
 scheduling_service = SchedulingService('refined-analogy-435508-n3',
                                        'us-central1')
 embedding_service = EmbeddingService()
+# Reflect the API clients once at startup rather than on the first step that calls them.
+get_api_signature_index().warm(list(set(API_CLIENT_FACTORIES.values())))
 agent_usecase = AgentUsecase(open_ai_service, api_repo, agent_repo, goal_repo,
                              sub_goal_repo, workstream_repo, scheduling_service,
                              embedding_service, self_reflection_repo, skill_repo,
@@ -101,7 +108,8 @@ agent_usecase = AgentUsecase(open_ai_service, api_repo, agent_repo, goal_repo,
 
 performance_analyzer = PerformanceAnalyzer(LLMService("gemini-1.5-flash"))
 functionality_usecase = AgentFunctionalityUsecase()
-agent_controller = AgentController(agent_usecase,functionality_usecase, self_reflection_repo,)
+blueprint_engine = AgentBlueprintEngine(agent_usecase, job_repository=agent_creation_job_repo)
+agent_controller = AgentController(agent_usecase,functionality_usecase, self_reflection_repo, blueprint_engine)
 
 user_feedback_usecase = UserFeedbackUseCase(agent_repo, goal_repo,
                                             sub_goal_repo, workstream_repo)
@@ -191,6 +199,10 @@ def create_agent_step3():
     if request.method == 'GET':
         return agent_controller.get_goals()
 
+    # The creation runs on the background job queue unless AGENT_CREATION_ASYNC is turned off
+    if os.getenv("AGENT_CREATION_ASYNC", "true").lower() not in ("0", "false", "no"):
+        return agent_controller.submit_agent_creation()
+
     response = agent_controller.create_agent()
 
     if response[1] == 202:
@@ -335,5 +347,29 @@ def refresh_agent_cache():
     """
     return group_chat_controller.refresh_agent_cache()
 
+@app.route('/agents/create/jobs/<job_id>', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def get_agent_creation_job(job_id):
+    """
+    Status and partial results of a queued agent creation
+    """
+    return agent_controller.get_agent_creation_job(job_id)
+
+@app.route('/agents/create/jobs/<job_id>/events', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def stream_agent_creation_events(job_id):
+    """
+    Server-sent events of a queued agent creation, one per generated node
+    """
+    return agent_controller.stream_agent_creation_events(job_id)
+
+@app.route('/llm/cache/stats', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def llm_cache_stats():
+    """
+    Hit/miss counters of the shared LLM response cache
+    """
+    return jsonify(open_ai_service.cache_stats()), 200
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -1,11 +1,16 @@
+import json
+import os
+import threading
+import time
 import uuid
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, request, jsonify, session
 from domain.models.agent import Agent
 from domain.models.goal import Goal
 from domain.models.kpi import KPI
 from domain.models.module import Module
 from domain.models.workstream import Workstream
 from infrastructure.llm.llm_service import LLMService
+from infrastructure.job_queue import JobProgress, JobQueue, get_job_queue
 from infrastructure.performance_analyzer import PerformanceAnalyzer
 from infrastructure.embedding_service import UserEmbeddingService
 from infrastructure.repositories.agent_repository import AgentRepository
@@ -14,6 +19,7 @@ from infrastructure.repositories.sub_goal_repository import SubGoalRepository
 from infrastructure.repositories.workstream_repository import WorkstreamRepository
 from infrastructure.repositories.self_reflection_repository import SelfReflectionRepository
 from domain.models.self_reflection import SelfReflection
+from usecases.agent_blueprint_engine import AgentBlueprintEngine
 from usecases.agent_usecase import AgentUsecase
 from usecases.functionality_usecase import AgentFunctionalityUsecase
 from usecases.performance_tracker import PerformanceTracker
@@ -21,8 +27,11 @@ from usecases.performance_tracker import PerformanceTracker
 user_embedding_service = UserEmbeddingService()
 
 class AgentController:
-    def __init__(self, agent_usecase: AgentUsecase,functionality_usecase: AgentFunctionalityUsecase, self_reflection_repository: SelfReflectionRepository = None):
+    def __init__(self, agent_usecase: AgentUsecase,functionality_usecase: AgentFunctionalityUsecase, self_reflection_repository: SelfReflectionRepository = None,
+                 blueprint_engine: AgentBlueprintEngine = None, job_queue: JobQueue = None):
         self.agent_usecase = agent_usecase
+        self.blueprint_engine = blueprint_engine or AgentBlueprintEngine(agent_usecase)
+        self.job_queue = job_queue or get_job_queue()
         self.functionality_usecase = functionality_usecase
         self.self_reflection_repository = self_reflection_repository
 
@@ -284,25 +293,167 @@ class AgentController:
             
             
 
-    def create_agent(self):
-        data = request.json
-        
-        print(request.json , "lllllllllllllllll")
+    def _get_agent_creation_params(self):
+        """
+        Reads the goals from the request and the role, report and self reflection from the session,
+        so the creation can run outside of the request.
+
+        :return: The creation parameters and None, or None and an error response.
+        """
+        data = request.json or {}
         
         print(data, "data")
 
         goals_dict = data.get('goals', None)
         if goals_dict is None:
-            return jsonify({
+            return None, (jsonify({
                 'error': 'Goals are required.'
-                }), 400
+                }), 400)
+
+        self_reflection_id = session.get('self_reflection_id')
+        if self_reflection_id is None or 'role' not in session or 'report' not in session:
+            return None, (jsonify({'error': 'Session expired or invalid'}), 400)
+
+        print(session['role'], session['report'], "sessions")
+        return {
+            'goals': goals_dict,
+            'role': session['role'],
+            'report': session['report'],
+            'self_reflection_id': self_reflection_id,
+        }, None
+
+    def create_agent(self):
+        params, error_response = self._get_agent_creation_params()
+        if error_response is not None:
+            return error_response
+
+        try:
+            result = self.run_agent_creation(params)
+            return jsonify(result), 202
+
+        except Exception as e:
+            print(e)
+            return jsonify({
+                'error': str(e)
+                }), 500   
+
+    def submit_agent_creation(self):
+        """
+        Queues the agent creation on the background job queue and returns the job ID right away.
+        The job is polled with get_agent_creation_job.
+        """
+        params, error_response = self._get_agent_creation_params()
+        if error_response is not None:
+            return error_response
+
+        try:
+            job_id = self.job_queue.submit("agent_creation", self._run_agent_creation_job, params)
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f"/agents/create/jobs/{job_id}"
+                }), 202
+
+        except Exception as e:
+            return jsonify({
+                'error': str(e)
+                }), 500
 
+    def get_agent_creation_job(self, job_id: str):
+        try:
+            job = self.job_queue.get(job_id)
+            if job is None:
+                return jsonify({'error': 'Job not found'}), 404
+            return jsonify(job), 200
+
+        except Exception as e:
+            return jsonify({
+                'error': str(e)
+                }), 500
+
+    def stream_agent_creation_events(self, job_id: str):
+        """
+        Streams the events of an agent creation job as server-sent events: one event per generated
+        stage, sub-goal, workstream and module with the time it took, then "completed" or "failed",
+        or "not_found" when the job is purged while it is streamed. A reconnecting client resumes
+        after the ID sent in its Last-Event-ID header.
+        """
+        try:
+            if self.job_queue.get(job_id) is None:
+                return jsonify({'error': 'Job not found'}), 404
+        except Exception as e:
+            return jsonify({
+                'error': str(e)
+                }), 500
+
+        try:
+            after_seq = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+        except ValueError:
+            after_seq = 0
+        poll_interval = float(os.getenv("AGENT_JOB_EVENTS_POLL_SECONDS", "0.5"))
+        keep_alive_interval = 15
+
+        def stream():
+            seq = after_seq
+            last_sent_at = time.time()
+            while True:
+                # The status is read first: a final status means the final event is already stored.
+                job = self.job_queue.get(job_id)
+                if job is None:
+                    # The job was purged or expired while it was streamed.
+                    event = {'type': 'not_found', 'job_id': job_id, 'error': 'Job not found'}
+                    yield f"event: not_found\ndata: {json.dumps(event)}\n\n"
+                    return
+                is_final = job['status'] in JobQueue.FINAL_STATUSES
+                events = self.job_queue.get_events(job_id, seq)
+                for seq, event in events:
+                    yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                if is_final:
+                    return
+
+                if events:
+                    last_sent_at = time.time()
+                elif time.time() - last_sent_at > keep_alive_interval:
+                    yield ": keep-alive\n\n"
+                    last_sent_at = time.time()
+                time.sleep(poll_interval)
+
+        return Response(stream(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+
+    def _run_agent_creation_job(self, progress: JobProgress, params: dict) -> dict:
+        return self.run_agent_creation(params, progress)
+
+    def run_agent_creation(self, params: dict, progress: JobProgress = None) -> dict:
+        """
+        Runs the agent creation pipeline. It does not touch the request or the session, so it can
+        run on a background worker.
+
+        :param params: The parameters returned by _get_agent_creation_params.
+        :param progress: Optional job progress to publish partial results, stage timings and node events to.
+        :return: The created agent's ID and workstreams.
+        """
+        update = progress.update if progress else (lambda key, value: None)
+        emit = progress.emit if progress else (lambda event: None)
+        timings = {}
+
+        def timed(stage: str, func):
+            started_at = time.perf_counter()
+            result = func()
+            timings[stage] = time.perf_counter() - started_at
+            update('timings', timings)
+            return result
+
+        role = params['role']
+        report = params['report']
+        self_reflection_id = params['self_reflection_id']
+
+        job = None
         try:
             id = uuid.uuid4().hex
             user_id = uuid.uuid4().hex 
-            print(session['role'], session['report'], "sessions")
-            role = session['role']
-            report = session['report']
             description = {
                 'user_persona': report['user_persona'],
                 'specific_needs': report['specific_needs'],
@@ -314,52 +465,72 @@ class AgentController:
             
 
             goals = []
-            for goal_dict in goals_dict:
+            for goal_dict in params['goals']:
                 goal = Goal.from_dict(goal_dict)
                 goal.id = uuid.uuid4().hex
                 goal.agent_id = id
                 goals.append(goal)
 
             # Get self_reflection from repository
-            self_reflection_id = session.get('self_reflection_id')
-            if self_reflection_id is None:
-                return jsonify({'error': 'Session expired or invalid'}), 400
             self_reflection = self.self_reflection_repository.get_self_reflection(self_reflection_id)
+
+            # Resume the unfinished creation job of this session, if any, from its checkpoints
+            job = self.blueprint_engine.start_job(self_reflection_id, role, report)
+            checkpointed = self.blueprint_engine.checkpointed
             
             
             # Generate skills
-            skills = self.agent_usecase.generate_skills(role, report['specific_needs'],self_reflection,id)
+            skills = timed("skills", lambda: checkpointed(job, "skills", lambda: self.agent_usecase.generate_skills(role, report['specific_needs'],self_reflection,id)))
             print(len(skills), 'skills generated')
+            update('skills', skills)
+            emit({'type': 'skills', 'data': skills, 'duration': timings['skills']})
             
             
             #Generate traits
-            traits = self.agent_usecase.generate_traits(role, report['specific_needs'],self_reflection)
+            traits = timed("traits", lambda: checkpointed(job, "traits", lambda: self.agent_usecase.generate_traits(role, report['specific_needs'],self_reflection)))
             print(len(traits), 'traits generated')
+            update('traits', traits)
+            emit({'type': 'traits', 'data': traits, 'duration': timings['traits']})
             
             #Generate tags
-            tags = self.agent_usecase.generate_tags(role, report['specific_needs'],self_reflection)
+            tags = timed("tags", lambda: checkpointed(job, "tags", lambda: self.agent_usecase.generate_tags(role, report['specific_needs'],self_reflection)))
             print(len(tags), 'tags generated')
+            update('tags', tags)
+            emit({'type': 'tags', 'data': tags, 'duration': timings['tags']})
             
             # Generate relevant APIs
-            relevant_apis = self.agent_usecase.generate_relevant_apis(role,description )
+            relevant_apis = timed("relevant_apis", lambda: checkpointed(job, "relevant_apis", lambda: self.agent_usecase.generate_relevant_apis(role,description )))
             agent.available_apis = relevant_apis
+            update('relevant_apis', relevant_apis)
+            emit({'type': 'relevant_apis', 'data': relevant_apis, 'duration': timings['relevant_apis']})
 
             # Update self_reflection.available_apis
             self_reflection.available_apis = relevant_apis
             self.self_reflection_repository.update_self_reflection(self_reflection)
 
-            # Generate sub_goals and update SelfReflection
-            sub_goals  = self.agent_usecase.generate_sub_goals(role, report, goals, self_reflection)
-            print(len(sub_goals), 'sub goals generated')
+            # Generate sub_goals, workstreams and modules as one dependency graph and update SelfReflection
+            nodes = {'sub_goals': [], 'workstreams': [], 'modules': []}
+            nodes_lock = threading.Lock()
+
+            def on_node(node_type: str, key: str, value: dict, duration: float) -> None:
+                with nodes_lock:
+                    nodes[node_type + 's'].append(value[node_type])
+                    update('nodes', nodes)
+                emit({'type': node_type, 'key': key, 'data': value, 'duration': duration, 'restored': duration is None})
 
-            # Generate workstreams and update SelfReflection
-            workstreams = self.agent_usecase.generate_workstreams(role, report, sub_goals,relevant_apis, self_reflection)
-            print(len(workstreams), 'workstreams generated')
+            for goal in goals:
+                emit({'type': 'goal', 'key': goal.id, 'data': goal.to_dict(), 'duration': None, 'restored': False})
+            sub_goals, workstreams = timed("blueprint", lambda: self.blueprint_engine.generate(
+                role, report, goals, relevant_apis, self_reflection, job, on_node))
 
             
 
             # Create the agent with goals, sub_goals, workstreams, and skills
-            self.agent_usecase.create_agent(agent, goals, sub_goals, workstreams, skills,id,traits,tags)
+            timed("store", lambda: self.agent_usecase.create_agent(agent, goals, sub_goals, workstreams, skills,id,traits,tags))
+            self.blueprint_engine.complete_job(job)
+
+            # Verify the stored nodes in the background when the verification policy asks for it
+            self.agent_usecase.verify_nodes_after_commit(workstreams, relevant_apis)
 
             # domain_name = 'https://' + request.host
             # print(domain_name)
@@ -369,16 +540,15 @@ class AgentController:
 
             # self.agent_usecase.schedule_feedbacks(agent.id, domain_name, 'weekly')
 
-            return jsonify({
+            return {
                 'message': 'Agent created successfully.',
+                'agent_id': id,
                 'workstreams': [workstream.to_dict() for workstream in workstreams]
-                }), 202
+                }
 
         except Exception as e:
-            print(e)
-            return jsonify({
-                'error': str(e)
-                }), 500   
+            self.blueprint_engine.fail_job(job, e)
+            raise e
     
     def process_workstream(self):
         try:
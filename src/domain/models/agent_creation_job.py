@@ -0,0 +1,58 @@
+from typing import Any, Dict
+from datetime import datetime
+
+
+class AgentCreationJob:
+    def __init__(
+        self,
+        id: str,
+        fingerprint: str,
+        status: str = "running",
+        created_at: datetime = None,
+        updated_at: datetime = None,
+        error: str = None,
+        checkpoints: Dict[str, Any] = None,
+    ) -> None:
+        """
+        Tracks the progress of an agent creation so a failed or repeated request can resume it.
+
+        :param id: ID of the job, the self reflection ID of the session creating the agent.
+        :param fingerprint: Hash of the role and report the job was started with.
+        :param status: Status of the job ("running", "failed" or "completed").
+        :param created_at: Timestamp when the job was started.
+        :param updated_at: Timestamp of the last status change.
+        :param error: Error message of the last failure, if any.
+        :param checkpoints: Results of the completed nodes, keyed by their position in the agent hierarchy.
+        """
+        self.id = id
+        self.fingerprint = fingerprint
+        self.status = status
+        self.created_at = created_at or datetime.utcnow()
+        self.updated_at = updated_at or self.created_at
+        self.error = error
+        self.checkpoints = checkpoints if checkpoints is not None else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the job to a dictionary. Checkpoints are stored separately, one document per node.
+        """
+        return {
+            "id": self.id,
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "error": self.error,
+        }
+
+    @staticmethod
+    def from_dict(job_data: Dict[str, Any], checkpoints: Dict[str, Any] = None) -> "AgentCreationJob":
+        return AgentCreationJob(
+            id=job_data["id"],
+            fingerprint=job_data["fingerprint"],
+            status=job_data.get("status", "running"),
+            created_at=datetime.fromisoformat(job_data["created_at"]) if job_data.get("created_at") else None,
+            updated_at=datetime.fromisoformat(job_data["updated_at"]) if job_data.get("updated_at") else None,
+            error=job_data.get("error"),
+            checkpoints=checkpoints,
+        )
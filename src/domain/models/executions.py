@@ -5,11 +5,11 @@ from datetime import datetime
 class ModuleExecution:
     def __init__(
         self,
-        execution_id: str,
         agent_id: str,  
         execution_time: datetime,
         result: str,
         summary: str = "",
+        execution_id: str = None,
     ) -> None:
         """
         Represents the execution of a module within a workstream, including agent information.
@@ -23,6 +23,7 @@ class ModuleExecution:
         :param result: Details or output of the execution result.
         :param summary: Summary of the execution.
         """
+        self.execution_id = execution_id or uuid.uuid4().hex
         self.agent_id = agent_id
         self.execution_time = execution_time
         self.result = result
@@ -33,6 +34,7 @@ class ModuleExecution:
         Converts the ModuleExecution object to a dictionary.
         """
         return {
+            "execution_id": self.execution_id,
             "agent_id": self.agent_id,  
             "execution_time": self.execution_time.isoformat(),
             "result": self.result,
@@ -45,6 +47,7 @@ class ModuleExecution:
         Creates a ModuleExecution object from a dictionary.
         """
         return ModuleExecution(
+            execution_id=execution_data.get("execution_id"),
             agent_id=execution_data["agent_id"],  
             execution_time=datetime.fromisoformat(execution_data["execution_time"]),
             result=execution_data["result"],
@@ -10,17 +10,19 @@ class Frequency(Enum):
     NOT_REQUIRED = "not_required"
 
 class Module:
-    def __init__(self, module: str, kpis: list[KPI], frequency: str, apis: list[str] = []):
+    def __init__(self, module: str, kpis: list[KPI], frequency: str, apis: list[str] = [], verified: bool = None):
         self.module = module
         self.kpis = kpis
         self.frequency = frequency
         self.apis = apis
+        self.verified = verified
     def to_dict(self) -> dict:
         return {
             "module": self.module,
             "kpis": [kpi.to_dict() for kpi in self.kpis],
             "frequency": self.frequency,
-            "apis": self.apis
+            "apis": self.apis,
+            "verified": self.verified
         }
     
     @staticmethod
@@ -29,5 +31,6 @@ class Module:
             module=module_data["module"],
             kpis=[KPI.from_dict(kpi_data) for kpi_data in module_data["kpis"]],
             frequency=module_data["frequency"],
-            apis=module_data["apis"]
+            apis=module_data["apis"],
+            verified=module_data.get("verified")
         )
@@ -6,7 +6,7 @@ from domain.models.module import Module
 
 
 class Workstream:
-    def __init__(self, work_stream_id: str, sub_goal_id: str, goal_id: str, agent_id: str, workstream: str, modules: list[Module], frequency: str, kpis: list[KPI] = []):
+    def __init__(self, work_stream_id: str, sub_goal_id: str, goal_id: str, agent_id: str, workstream: str, modules: list[Module], frequency: str, kpis: list[KPI] = [], verified: bool = None):
         self.id = work_stream_id
         self.sub_goal_id = sub_goal_id
         self.goal_id = goal_id
@@ -15,6 +15,7 @@ class Workstream:
         self.modules = modules
         self.frequency = frequency
         self.kpis = kpis
+        self.verified = verified
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -25,7 +26,8 @@ class Workstream:
             "workstream": self.workstream,
             "modules": [module.to_dict() for module in self.modules],
             "frequency": self.frequency,
-            "kpis": [kpi.to_dict() for kpi in self.kpis]
+            "kpis": [kpi.to_dict() for kpi in self.kpis],
+            "verified": self.verified
         }
     
     @staticmethod
@@ -38,5 +40,6 @@ class Workstream:
             workstream=workstream_data["workstream"],
             modules=[Module.from_dict(module_data) for module_data in workstream_data["modules"]],
             frequency=workstream_data["frequency"],
-            kpis=[KPI.from_dict(kpi_data) for kpi_data in workstream_data["kpis"]] if "kpis" in workstream_data else []
+            kpis=[KPI.from_dict(kpi_data) for kpi_data in workstream_data["kpis"]] if "kpis" in workstream_data else [],
+            verified=workstream_data.get("verified")
         )
\ No newline at end of file
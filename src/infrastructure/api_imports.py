@@ -1,3 +1,7 @@
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List
+
 from infrastructure.apis.News.GNews.gnews_api import GNewsClient
 from infrastructure.apis.coinlore_api import CoinloreAPI
 from infrastructure.apis.finance.alpha_vantage.alpha_vantage_api import AlphaVantageClient
@@ -27,41 +31,116 @@ from .apis.statista_api import StatistaAPI
 from .apis.hunter_api import HunterAPI
 
 
-def get_flat_api_instance_tree() -> dict:
+# Factories of the API clients, by the API names used in the industry tree.
+API_CLIENT_FACTORIES: Dict[str, Callable[..., Any]] = {
+    "alpha_vantage_api": AlphaVantageClient,
+    "crypto_compare_api": CryptoCompareAPI,
+    "binance_api": BinanceAPI,
+    "coinlore_api": CoinloreAPI,
+    "free_forex_api": FreeForexAPI,
+    "ecb_exchange_rates_api": ECBExchangeRatesAPI,
+    "quickbook_api": SlackService,
+    "slack_api": SlackService,
+    "news_api": NewsAPIInitializer,
+    "gnews_api": GNewsClient,
+    "guardian_media_api": GuardianNewsAPI,
+    "hacker_news_api": HackerNewsAPI,
+    "twitter_api": TwitterClient,
+    "pinterest_api": PinterestClient,
+    "reddit_api": RedditClient,
+    "hubspot_api": HubSpotAPI,
+    "trello_api": TrelloAPI,
+    "crunchbase_api": SlackService,
+    "statista_api": SlackService,
+    "github_search_api_call": GitHubAPIIntializer,
+    "google_services_api": GoogleServicesClient,
+    "health_care_api": HealthCareAPI,
+    "cdc_api": CDCAPI,
+    "human_api": SlackService,
+    "open_fda_api": OpenFDAAPI,
+    "here_api": HereAPI,
+}
+
+
+class ApiInstanceRegistry:
+    """
+    Creates each API client on first use and keeps it for the life of the process, instead of
+    constructing every client on every lookup. The clients read their credentials from the
+    environment, as they always have.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = factories
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {api_name: threading.Lock() for api_name in factories}
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def get(self, api_name: str) -> Any:
+        """
+        Returns the client of an API, creating it on first use.
+
+        :param api_name: The name of the API as defined in the industry tree.
+        :return: The API client, or None when there is no such API.
+        """
+        if api_name not in self._factories:
+            return None
+
+        instance = self._instances.get(api_name)
+        if instance is not None:
+            return instance
+
+        # One lock per API, so a slow client (e.g. a login) does not hold up the others.
+        with self._locks[api_name]:
+            instance = self._instances.get(api_name)
+            if instance is None:
+                instance = self._factories[api_name]()
+                self._instances[api_name] = instance
+            return instance
+
+    def clear(self) -> None:
+        """
+        Drops every cached client, e.g. after the credentials in the environment changed.
+        """
+        for api_name, lock in self._locks.items():
+            with lock:
+                self._instances.pop(api_name, None)
+
+
+api_registry = ApiInstanceRegistry(API_CLIENT_FACTORIES)
+
+
+def get_api_instance(api_name: str) -> Any:
+    """
+    Returns the process-wide client of an API, creating it on first use.
+    """
+    return api_registry.get(api_name)
+
+
+class _LazyApiInstanceTree(Mapping):
+    """Read-only view of the registry that only builds the clients that are looked up."""
+
+    def __init__(self, registry: ApiInstanceRegistry):
+        self._registry = registry
+
+    def __getitem__(self, api_name: str) -> Any:
+        instance = self._registry.get(api_name)
+        if instance is None:
+            raise KeyError(api_name)
+        return instance
+
+    def __iter__(self):
+        return iter(self._registry.names())
+
+    def __len__(self) -> int:
+        return len(self._registry.names())
+
+
+def get_flat_api_instance_tree() -> Mapping:
     """
-    Generate and return a flat tree structure where API names map directly to their class instances.
+    Return a flat tree structure where API names map directly to their class instances.
+    The instances come from the API registry, so only the looked up clients are built,
+    once per process.
     """
-    try:
-        tree = {
-            "alpha_vantage_api": AlphaVantageClient(),
-            "crypto_compare_api": CryptoCompareAPI(),
-            "binance_api": BinanceAPI(),
-            "coinlore_api": CoinloreAPI(),
-            "free_forex_api": FreeForexAPI(),
-            "ecb_exchange_rates_api": ECBExchangeRatesAPI(),
-            "quickbook_api": SlackService(),
-            "slack_api": SlackService(),
-            "news_api": NewsAPIInitializer(),
-            "gnews_api": GNewsClient(),
-            "guardian_media_api": GuardianNewsAPI(),
-            "hacker_news_api": HackerNewsAPI(),
-            "twitter_api": TwitterClient(),
-            "pinterest_api": PinterestClient(),
-            "reddit_api": RedditClient(),
-            "hubspot_api": HubSpotAPI(),
-            "trello_api": TrelloAPI(),
-            "crunchbase_api": SlackService(),
-            "statista_api": SlackService(),
-            "github_search_api_call": GitHubAPIIntializer(),
-            "google_services_api": GoogleServicesClient(),
-            "health_care_api": HealthCareAPI(),
-            "cdc_api": CDCAPI(),
-            "human_api": SlackService(),
-            "open_fda_api": OpenFDAAPI(),
-            "here_api": HereAPI(),
-        }
-
-        return tree
-    except Exception as e:
-        print(f"Error inside get_flat_api_instance_tree: {e}")
-        raise
+    return _LazyApiInstanceTree(api_registry)
@@ -254,7 +254,7 @@ class API_to_endpoint_mapper:
             statista = StatistaAPI("aapi_keyyy")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(statista)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["statista_api_call"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(statista, endpoints_schema.get("statista_api_call")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -270,7 +270,7 @@ class API_to_endpoint_mapper:
         :return: The result of the executed API function.
         """
         try:
-            github_api = GitHubAPIIntializer()
+            github_api = get_api_instance("github_search_api_call")
             llm_func_service = LLM_function_calling_service()
             functions = llm_func_service.get_function_map(github_api)
             response = llm_func_service.function_call_for_api(query, functions)
@@ -290,10 +290,10 @@ class API_to_endpoint_mapper:
         """
         try:
             print("inside the news api")
-            news = NewsAPIInitializer()
+            news = get_api_instance("news_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(news)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["news_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(news, endpoints_schema.get("news_api")), functions_map)
             return {
                 "status": "success",
                 "response": response
@@ -321,7 +321,7 @@ class API_to_endpoint_mapper:
             hunter = HunterAPI()
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(hunter)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["hunter_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(hunter, endpoints_schema.get("hunter_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -339,10 +339,10 @@ class API_to_endpoint_mapper:
                         or any other operation supported by the HubSpot API.
         """
         try:
-            hubspot_api = HubSpotAPI()
+            hubspot_api = get_api_instance("hubspot_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(hubspot_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["hubspot_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(hubspot_api, endpoints_schema.get("hubspot_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -359,7 +359,7 @@ class API_to_endpoint_mapper:
             quickbook_api = QuickBooksAPI()
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(quickbook_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["quickbook_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(quickbook_api, endpoints_schema.get("quickbook_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -383,10 +383,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            slack_service = SlackService()
+            slack_service = get_api_instance("slack_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(slack_service)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["slack_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(slack_service, endpoints_schema.get("slack_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -410,10 +410,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the ECB Exchange Rates API.
         """
         try:
-            ecb_exchange_rates = ECBExchangeRatesAPI()
+            ecb_exchange_rates = get_api_instance("ecb_exchange_rates_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(ecb_exchange_rates)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["ecb_exchange_rates_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(ecb_exchange_rates, endpoints_schema.get("ecb_exchange_rates_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -428,10 +428,10 @@ class API_to_endpoint_mapper:
                          may include search terms, filters, or other parameters to retrieve specific content. 
         """
         try:
-            guardian_media = GuardianNewsAPI()
+            guardian_media = get_api_instance("guardian_media_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(guardian_media)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["guardian_media_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(guardian_media, endpoints_schema.get("guardian_media_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -445,10 +445,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the Binance API.
         """
         try:
-            binance = BinanceAPI()
+            binance = get_api_instance("binance_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(binance)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["binance_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(binance, endpoints_schema.get("binance_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -462,10 +462,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the CDC API.
         """
         try:
-            cdc = CDCAPI()
+            cdc = get_api_instance("cdc_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(cdc)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["cdc_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(cdc, endpoints_schema.get("cdc_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -479,10 +479,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the Free Forex API.
         """
         try:
-            free_forex = FreeForexAPI()
+            free_forex = get_api_instance("free_forex_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(free_forex)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["free_forex_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(free_forex, endpoints_schema.get("free_forex_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -496,10 +496,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the HealthCare.gov API.
         """
         try:
-            health_care = HealthCareAPI()
+            health_care = get_api_instance("health_care_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(health_care)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["health_care_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(health_care, endpoints_schema.get("health_care_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -516,7 +516,7 @@ class API_to_endpoint_mapper:
             human = HumanAPI()
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(human)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["human_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(human, endpoints_schema.get("human_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -530,10 +530,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the OpenFDA API.
         """
         try:
-            open_fda = OpenFDAAPI()
+            open_fda = get_api_instance("open_fda_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(open_fda)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["open_fda_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(open_fda, endpoints_schema.get("open_fda_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -572,10 +572,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            trello_api = TrelloAPI()
+            trello_api = get_api_instance("trello_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(trello_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["trello_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(trello_api, endpoints_schema.get("trello_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -596,10 +596,10 @@ class API_to_endpoint_mapper:
             The result of the executed API function, which may vary based on the specific operation performed.
         """
         try:
-            hackernews = HackerNewsAPI()
+            hackernews = get_api_instance("hacker_news_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(hackernews)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["hackernews_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(hackernews, endpoints_schema.get("hackernews_api")), functions_map)
             return response
         
         except Exception as e:
@@ -624,10 +624,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            crypto_compare_api = CryptoCompareAPI()
+            crypto_compare_api = get_api_instance("crypto_compare_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(crypto_compare_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["crypto_compare_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(crypto_compare_api, endpoints_schema.get("crypto_compare_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -646,10 +646,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            coinlore = CoinloreAPI()
+            coinlore = get_api_instance("coinlore_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(coinlore)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["coinlore_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(coinlore, endpoints_schema.get("coinlore_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -667,10 +667,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            alpha_api = AlphaVantageClient()
+            alpha_api = get_api_instance("alpha_vantage_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(alpha_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["alpha_vantage_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(alpha_api, endpoints_schema.get("alpha_vantage_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -688,10 +688,10 @@ class API_to_endpoint_mapper:
             operation performed.
         """
         try:
-            here_api = HereAPI()
+            here_api = get_api_instance("here_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(here_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["here_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(here_api, endpoints_schema.get("here_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -708,10 +708,10 @@ class API_to_endpoint_mapper:
 
         """
         try:
-            twitter_api = TwitterClient()
+            twitter_api = get_api_instance("twitter_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(twitter_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["twitter_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(twitter_api, endpoints_schema.get("twitter_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -725,10 +725,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the Pinterest API.
         """
         try:
-            pinterest_api = PinterestClient()
+            pinterest_api = get_api_instance("pinterest_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(pinterest_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["pinterest_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(pinterest_api, endpoints_schema.get("pinterest_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -742,10 +742,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the Reddit API.
         """
         try:
-            reddit_api = RedditClient()
+            reddit_api = get_api_instance("reddit_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(reddit_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["reddit_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(reddit_api, endpoints_schema.get("reddit_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -759,10 +759,10 @@ class API_to_endpoint_mapper:
             query (str): A string representing the query to execute against the Google News API.
         """
         try:
-            gnews_api = GNewsClient()
+            gnews_api = get_api_instance("gnews_api")
             llm_func_service = OpenAIFunctionCallingService()
             functions_map = llm_func_service.get_function_map(gnews_api)
-            response = llm_func_service.function_call_for_api(query, endpoints_schema["gnews_api"], functions_map)
+            response = llm_func_service.function_call_for_api(query, llm_func_service.get_functions_schema(gnews_api, endpoints_schema.get("gnews_api")), functions_map)
             return response
         except Exception as e:
             raise e
@@ -0,0 +1,233 @@
+import hashlib
+import inspect
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from chromadb.utils import embedding_functions
+
+from infrastructure.api_descriptions import api_data
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
+from infrastructure.llm.open_ai_schemas import ArraySchema
+
+
+class EmbeddingApiRouter:
+    """
+    Routes a query to the relevant APIs of the industry tree with a single vector similarity pass
+    instead of asking the LLM about every branch. Every API leaf is described by its industry path,
+    its display name, its description and optionally the docstrings of its endpoints. Those documents
+    are embedded once per process (and on disk when a cache path is set), so routing a query costs
+    one embedding call.
+
+    Cosine similarities are calibrated into confidence scores between 0 and 1: similarities up to
+    similarity_floor score 0 and similarities from similarity_ceiling on score 1, linearly in between.
+    The APIs are then selected like the LLM traversal selects them, against the same threshold. The
+    LLM is only asked about the APIs whose confidence is within the ambiguity margin of the threshold.
+    """
+
+    def __init__(self, tree: Dict[str, Any],
+                 embedding_function: Callable[[List[str]], List[List[float]]] = None,
+                 ambiguity_margin: float = None,
+                 max_apis: int = 3,
+                 similarity_floor: float = None,
+                 similarity_ceiling: float = None,
+                 include_endpoints: bool = None,
+                 embeddings_cache_path: str = None):
+        self.tree = tree
+        self.embedding_function = embedding_function or embedding_functions.GoogleGenerativeAiEmbeddingFunction(
+            api_key=os.getenv('GEMINI_API_KEY')
+        )
+        self.ambiguity_margin = ambiguity_margin if ambiguity_margin is not None else float(
+            os.getenv("API_ROUTER_AMBIGUITY_MARGIN", "0.05"))
+        self.max_apis = max_apis
+        self.similarity_floor = similarity_floor if similarity_floor is not None else float(
+            os.getenv("API_ROUTER_SIMILARITY_FLOOR", "0.45"))
+        self.similarity_ceiling = similarity_ceiling if similarity_ceiling is not None else float(
+            os.getenv("API_ROUTER_SIMILARITY_CEILING", "0.8"))
+        if include_endpoints is None:
+            include_endpoints = os.getenv("API_ROUTER_INCLUDE_ENDPOINTS", "false").lower() in ("1", "true", "yes")
+        self.include_endpoints = include_endpoints
+        self.embeddings_cache_path = embeddings_cache_path if embeddings_cache_path is not None else os.getenv(
+            "API_ROUTER_EMBEDDINGS_PATH")
+        self._index: Optional[List[Tuple[str, List[float]]]] = None
+        self._lock = threading.Lock()
+
+    def build_documents(self) -> List[Tuple[str, str]]:
+        """
+        Describes every API leaf of the tree.
+
+        :return: A list of (api name, document) tuples. An API reachable through several paths of the
+                 tree, or described by several endpoints, has several documents.
+        """
+        descriptions = {api["name"]: api["description"] for api in api_data}
+        documents = []
+
+        def walk(node: Any, path: List[str]) -> None:
+            if isinstance(node, dict):
+                for branch_name, branch_node in node.items():
+                    walk(branch_node, path + [branch_name])
+            elif isinstance(node, str):
+                display_name = path[-1]
+                document = f"{' > '.join(path)}. {descriptions.get(display_name, '')}".strip()
+                documents.append((node, document))
+
+        walk(self.tree, [])
+
+        if self.include_endpoints:
+            documents.extend(self._build_endpoint_documents({api_name for api_name, _ in documents}))
+        return documents
+
+    def _build_endpoint_documents(self, api_names: set) -> List[Tuple[str, str]]:
+        from infrastructure.api_imports import get_flat_api_instance_tree
+
+        documents = []
+        try:
+            instances = get_flat_api_instance_tree()
+        except Exception as e:
+            print(f"Skipping endpoint documents of the API router: {e}")
+            return documents
+
+        for api_name in api_names:
+            instance = instances.get(api_name)
+            if instance is None:
+                continue
+            for method_name, method in inspect.getmembers(instance, predicate=callable):
+                if method_name.startswith("_"):
+                    continue
+                docstring = inspect.getdoc(method)
+                if docstring:
+                    summary = docstring.strip().split("\n\n")[0]
+                    documents.append((api_name, f"{method_name.replace('_', ' ')}: {summary}"))
+        return documents
+
+    def _get_index(self) -> List[Tuple[str, List[float]]]:
+        if self._index is not None:
+            return self._index
+
+        with self._lock:
+            if self._index is None:
+                documents = self.build_documents()
+                vectors = self._embed_documents([document for _, document in documents])
+                self._index = [(api_name, self._normalize(vector)) for (api_name, _), vector in zip(documents, vectors)]
+                print(f"API router indexed {len(self._index)} documents")
+            return self._index
+
+    def _embed_documents(self, documents: List[str]) -> List[List[float]]:
+        cache = {}
+        if self.embeddings_cache_path and os.path.exists(self.embeddings_cache_path):
+            with open(self.embeddings_cache_path) as cache_file:
+                cache = json.load(cache_file)
+
+        keys = [hashlib.sha256(document.encode("utf-8")).hexdigest() for document in documents]
+        missing = [document for key, document in zip(keys, documents) if key not in cache]
+        if missing:
+            for document, vector in zip(missing, self.embedding_function(missing)):
+                cache[hashlib.sha256(document.encode("utf-8")).hexdigest()] = [float(value) for value in vector]
+            if self.embeddings_cache_path:
+                with open(self.embeddings_cache_path, "w") as cache_file:
+                    json.dump(cache, cache_file)
+
+        return [cache[key] for key in keys]
+
+    def score(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Scores every API of the tree against the query.
+
+        :param query: The input query describing the functionality.
+        :return: A list of (api name, cosine similarity) tuples, best first. An API scores the best
+                 similarity among its documents.
+        """
+        index = self._get_index()
+        query_vector = self._normalize(self.embedding_function([query])[0])
+
+        scores: Dict[str, float] = {}
+        for api_name, vector in index:
+            similarity = sum(a * b for a, b in zip(query_vector, vector))
+            if similarity > scores.get(api_name, -1.0):
+                scores[api_name] = similarity
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def confidence(self, similarity: float) -> float:
+        """
+        :return: The confidence score, between 0 and 1, of an API with the given cosine similarity.
+        """
+        span = self.similarity_ceiling - self.similarity_floor
+        if span <= 0:
+            return 1.0 if similarity >= self.similarity_ceiling else 0.0
+        return max(0.0, min(1.0, (similarity - self.similarity_floor) / span))
+
+    def route(self, query: str, threshold: float = 0.6) -> List[Tuple[str, float]]:
+        """
+        Returns the APIs relevant to the query with their confidence scores, best first: every API
+        whose confidence reaches the threshold, or the top max_apis APIs when none does, as the LLM
+        traversal does. When some APIs are within the ambiguity margin of the threshold, the LLM
+        decides in a single call which of those are needed.
+
+        :param query: The input query describing the functionality.
+        :param threshold: The minimum confidence score of a relevant API.
+        :return: A list of (api name, confidence score) tuples.
+        """
+        ranked = [(api_name, self.confidence(similarity)) for api_name, similarity in self.score(query)]
+        if not ranked:
+            return []
+
+        borderline = [api_name for api_name, confidence in ranked
+                      if abs(confidence - threshold) <= self.ambiguity_margin]
+        needed = self._choose_with_llm(query, borderline) if borderline else None
+
+        def is_selected(api_name: str, confidence: float) -> bool:
+            if needed is not None and api_name in borderline:
+                return api_name in needed
+            return confidence >= threshold
+
+        selected = [(api_name, confidence) for api_name, confidence in ranked if is_selected(api_name, confidence)]
+        return selected or ranked[:self.max_apis]
+
+    def _choose_with_llm(self, query: str, candidates: List[str]) -> Optional[List[str]]:
+        """
+        :return: The candidates the LLM deems needed for the query, or None when it could not be asked,
+                 in which case the candidates are selected by their confidence alone.
+        """
+        llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
+        system_instruction = "Choose the APIs needed to perform the given task. Only return names from the provided list."
+        prompt = (
+            f"Task: '{query}'. Candidate APIs: {candidates}. "
+            "Return the candidate API names that are needed to perform the task, best first, "
+            "or an empty list when none of them is.")
+        try:
+            response = llm_service.generate_content_with_Structured_schema(
+                system_instruction=system_instruction,
+                query=prompt,
+                response_schema=ArraySchema,
+                use_cache=True)
+            return [api_name for api_name in response.array if api_name in candidates]
+        except Exception as e:
+            print(f"Error choosing among borderline APIs with the LLM: {e}")
+            return None
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> List[float]:
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else list(vector)
+
+
+_default_router: Optional[EmbeddingApiRouter] = None
+_default_router_lock = threading.Lock()
+
+
+def get_api_router() -> EmbeddingApiRouter:
+    """
+    Returns the process-wide API router over the industry tree. Its index is built on first use.
+    """
+    global _default_router
+    if _default_router is not None:
+        return _default_router
+
+    with _default_router_lock:
+        if _default_router is None:
+            from infrastructure.api_trees import Fetch_Industry_Tree
+
+            _default_router = EmbeddingApiRouter(Fetch_Industry_Tree.get_industry_tree())
+        return _default_router
@@ -0,0 +1,333 @@
+import inspect
+import re
+import threading
+import typing
+from typing import Any, Callable, Dict, List, Optional
+
+
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    dict: "object",
+}
+
+
+def annotation_to_json_schema(annotation: Any) -> Optional[Dict[str, Any]]:
+    """
+    Converts a type annotation to a JSON schema fragment.
+
+    :return: The schema, or None when the annotation is missing or has no JSON equivalent.
+    """
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return None
+    if annotation in _JSON_TYPES:
+        return {"type": _JSON_TYPES[annotation]}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        # Optional[X] is Union[X, None].
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) != 1:
+            return None
+        schema = annotation_to_json_schema(members[0])
+        if schema is None:
+            return None
+        if len(members) != len(args):
+            schema = dict(schema, type=[schema["type"], "null"])
+        return schema
+    if origin is typing.Literal:
+        values = list(args)
+        schema = annotation_to_json_schema(type(values[0])) if values else None
+        return dict(schema, enum=values) if schema else None
+    if origin in (list, tuple, set):
+        schema = {"type": "array"}
+        items = annotation_to_json_schema(args[0]) if args else None
+        if items is not None:
+            schema["items"] = items
+        return schema
+    if origin is dict:
+        return {"type": "object"}
+    return None
+
+
+def parse_docstring_parameters(docstring: str) -> Dict[str, str]:
+    """
+    Extracts the parameter descriptions of a docstring written in either of the styles used by the
+    API clients: ":param name: description" or a Google style "Args:" section.
+
+    :return: A dict of parameter names to descriptions.
+    """
+    descriptions: Dict[str, str] = {}
+    if not docstring:
+        return descriptions
+
+    for match in re.finditer(r":param\s+(?:[\w\[\], .]+\s+)?(\w+):\s*(.+?)(?=\n\s*:|\n\s*\n|\Z)", docstring, re.S):
+        descriptions[match.group(1)] = " ".join(match.group(2).split())
+
+    section = re.search(r"\n\s*(?:Args|Arguments|Parameters):\s*\n(.*?)(?=\n\s*\w[\w ]*:\s*\n|\Z)", "\n" + docstring, re.S)
+    if section:
+        current = None
+        for line in section.group(1).splitlines():
+            match = re.match(r"\s*(\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)", line)
+            if match and match.group(1) not in ("Returns", "Raises"):
+                current = match.group(1)
+                descriptions.setdefault(current, match.group(3).strip())
+            elif current and line.strip():
+                descriptions[current] = f"{descriptions[current]} {line.strip()}".strip()
+    return descriptions
+
+
+class ParameterSignature:
+    """
+    A parameter of an API endpoint.
+
+    :param name: Name of the parameter.
+    :param annotation: The type annotation, or inspect.Parameter.empty when there is none.
+    :param default: The default value, or inspect.Parameter.empty when the parameter is required.
+    :param description: Description of the parameter from the endpoint's docstring, if any.
+    """
+
+    def __init__(self, name: str, annotation: Any, default: Any, description: str = None):
+        self.name = name
+        self.annotation = annotation
+        self.default = default
+        self.description = description
+
+    @property
+    def required(self) -> bool:
+        return self.default is inspect.Parameter.empty
+
+    def to_json_schema(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: The JSON schema of the parameter, or None when its type is unknown.
+        """
+        schema = annotation_to_json_schema(self.annotation)
+        if schema is None:
+            return None
+        if self.description:
+            schema["description"] = self.description
+        if not self.required and isinstance(self.default, (str, int, float, bool)):
+            schema["default"] = self.default
+        return schema
+
+
+class EndpointSignature:
+    """
+    An endpoint of an API client: a public method with its parameters and docstring.
+
+    :param name: Name of the method.
+    :param parameters: The parameters of the method, without self.
+    :param docstring: The cleaned docstring of the method.
+    """
+
+    def __init__(self, name: str, parameters: List[ParameterSignature], docstring: str = ""):
+        self.name = name
+        self.parameters = parameters
+        self.docstring = docstring
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return [parameter.name for parameter in self.parameters]
+
+    @property
+    def summary(self) -> str:
+        lines = []
+        for line in self.docstring.strip().split("\n\n")[0].splitlines():
+            if line.strip().startswith(":") or re.match(r"\s*(Args|Arguments|Parameters|Returns):", line):
+                break
+            lines.append(line.strip())
+        return " ".join(lines)
+
+    def to_tool_schema(self) -> Dict[str, Any]:
+        """
+        Describes the endpoint in the OpenAI function tool format used by endpoints_schema.
+        Parameters without a type annotation are described as strings.
+        """
+        properties = {}
+        for parameter in self.parameters:
+            schema = parameter.to_json_schema()
+            if schema is None:
+                schema = {"type": "string"}
+                if parameter.description:
+                    schema["description"] = parameter.description
+            properties[parameter.name] = schema
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.summary or self.name.replace("_", " "),
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": [parameter.name for parameter in self.parameters if parameter.required],
+                    "additionalProperties": False,
+                },
+            },
+        }
+
+
+class ApiSignatureIndex:
+    """
+    Index of the endpoints of the API clients. Every class is reflected once, the first time it is
+    looked up or when the index is warmed at startup, and the endpoint names, parameters, defaults,
+    annotations and docstrings are reused by the function maps, the parameter lookups and the tool
+    schemas instead of running dir(), getattr() and inspect.signature() on every call.
+
+    Generator methods, such as the pagination iterators of the clients, are not endpoints: their
+    results cannot be passed to the model, so they are left out of the index.
+    """
+
+    def __init__(self):
+        self._classes: Dict[type, Dict[str, EndpointSignature]] = {}
+        self._lock = threading.Lock()
+
+    def warm(self, classes: List[type]) -> None:
+        for cls in classes:
+            self.endpoints(cls)
+        print(f"API signature index built for {len(self._classes)} classes")
+
+    def endpoints(self, class_or_instance: Any) -> Dict[str, EndpointSignature]:
+        """
+        :param class_or_instance: An API client class, or an instance of one.
+        :return: The endpoints of the class by name.
+        """
+        cls = class_or_instance if inspect.isclass(class_or_instance) else type(class_or_instance)
+        endpoints = self._classes.get(cls)
+        if endpoints is not None:
+            return endpoints
+
+        with self._lock:
+            endpoints = self._classes.get(cls)
+            if endpoints is None:
+                endpoints = self._index_class(cls)
+                self._classes[cls] = endpoints
+            return endpoints
+
+    @staticmethod
+    def _index_class(cls: type) -> Dict[str, EndpointSignature]:
+        endpoints = {}
+        for name, member in inspect.getmembers(cls):
+            if name.startswith("_") or inspect.isclass(member) or not callable(member):
+                continue
+            if inspect.isgeneratorfunction(member) or inspect.isasyncgenfunction(member):
+                continue
+            try:
+                signature = inspect.signature(member)
+            except (TypeError, ValueError):
+                continue
+            docstring = inspect.getdoc(member) or ""
+            descriptions = parse_docstring_parameters(docstring)
+            parameters = [
+                ParameterSignature(parameter.name, parameter.annotation, parameter.default,
+                                   descriptions.get(parameter.name))
+                for parameter in signature.parameters.values()
+                if parameter.name not in ("self", "cls")
+                and parameter.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            ]
+            endpoints[name] = EndpointSignature(name, parameters, docstring)
+        return endpoints
+
+    def function_map(self, instance: Any) -> Dict[str, Callable[..., Any]]:
+        """
+        :return: The endpoints of the instance by name, bound to the instance.
+        """
+        return {name: getattr(instance, name) for name in self.endpoints(instance)}
+
+    def endpoint(self, function: Callable[..., Any]) -> Optional[EndpointSignature]:
+        """
+        :return: The indexed signature of a bound endpoint, or None for any other callable.
+        """
+        owner = getattr(function, "__self__", None)
+        if owner is None or not inspect.ismethod(function):
+            return None
+        return self.endpoints(owner).get(function.__name__)
+
+    def parameter_names(self, function: Callable[..., Any]) -> List[str]:
+        """
+        :return: The parameter names of a function, from the index when it is an indexed endpoint.
+        """
+        endpoint = self.endpoint(function)
+        if endpoint is not None:
+            return endpoint.parameter_names
+        signature = inspect.signature(function)
+        return [parameter.name for parameter in signature.parameters.values() if parameter.name != "self"]
+
+    @staticmethod
+    def endpoint_key(function: Any) -> str:
+        """
+        :return: A stable identifier of an endpoint, e.g. "module.Class.method", usable as a persistent key.
+        """
+        owner = getattr(function, "__self__", None)
+        if owner is not None:
+            cls = owner if inspect.isclass(owner) else type(owner)
+            return f"{cls.__module__}.{cls.__qualname__}.{function.__name__}"
+        if callable(function):
+            return f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', function.__name__)}"
+        return str(function)
+
+    def parameter_schemas(self, function: Callable[..., Any], parameter_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Derives the JSON schemas of the given parameters of an endpoint from its type hints, defaults
+        and docstring.
+
+        :return: The schema of every parameter, or None for the parameters whose type is unknown.
+        """
+        endpoint = self.endpoint(function)
+        parameters = {parameter.name: parameter for parameter in endpoint.parameters} if endpoint else {}
+        return {
+            name: parameters[name].to_json_schema() if name in parameters else None
+            for name in parameter_names
+        }
+
+    def required_parameters(self, function: Callable[..., Any]) -> List[str]:
+        endpoint = self.endpoint(function)
+        return [parameter.name for parameter in endpoint.parameters if parameter.required] if endpoint else []
+
+    def tool_schemas(self, class_or_instance: Any, handwritten: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the tool schemas of the endpoints of an API client. Hand-written schemas, which
+        usually carry better descriptions, are kept for the endpoints that still exist; endpoints
+        without one get a schema generated from their signature, and schemas of endpoints that no
+        longer exist are dropped.
+
+        :param class_or_instance: An API client class, or an instance of one.
+        :param handwritten: The hand-written schemas of the API in endpoints_schema, if any.
+        """
+        endpoints = self.endpoints(class_or_instance)
+        schemas = []
+        covered = set()
+        for schema in handwritten or []:
+            name = schema.get("function", {}).get("name")
+            if name in endpoints:
+                schemas.append(schema)
+                covered.add(name)
+        stale = [schema.get("function", {}).get("name") for schema in handwritten or []
+                 if schema.get("function", {}).get("name") not in endpoints]
+        if stale:
+            print(f"Dropping schemas of missing endpoints: {stale}")
+        schemas.extend(endpoint.to_tool_schema() for name, endpoint in endpoints.items() if name not in covered)
+        return schemas
+
+
+_default_index: Optional[ApiSignatureIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_api_signature_index() -> ApiSignatureIndex:
+    """
+    Returns the process-wide API signature index.
+    """
+    global _default_index
+    if _default_index is not None:
+        return _default_index
+
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = ApiSignatureIndex()
+        return _default_index
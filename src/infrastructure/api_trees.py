@@ -2,9 +2,13 @@ import os
 import random
 from typing import Any, Dict, List, Tuple
 from infrastructure.llm.llm_function_calling_service import LLM_function_calling_service
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
 from infrastructure.api_imports import *
+from infrastructure.api_router import get_api_router
+from infrastructure.api_signature_index import get_api_signature_index
+from infrastructure.endpoint_selection_cache import api_method_set_version, get_endpoint_selection_cache
 import inspect
+from concurrent.futures import ThreadPoolExecutor
 
 class Fetch_Industry_Tree:
     @staticmethod
@@ -93,8 +97,7 @@ class API_Utils:
         :return: A list of parameter names.
         """
         try:
-            signature = inspect.signature(function)
-            parameters = [param.name for param in signature.parameters.values() if param.name != 'self']
+            parameters = get_api_signature_index().parameter_names(function)
             print("here are the list of parameters required", parameters)
             return parameters
         except Exception as e:
@@ -108,8 +111,7 @@ class API_Utils:
            :param industry_map: A dictionary of available industries.
            :return: The chosen industry.
            """
-           api_key = os.getenv("OPENAI_API_KEY")
-           llm_service = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=api_key)
+           llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
            chosen_industry, confidence_score, endpoint_score = llm_service.decide_next_branch(query=query, options=industry_map)
            
            return chosen_industry, confidence_score
@@ -125,9 +127,8 @@ class API_Utils:
         :return: A tuple containing the path taken, the final function (endpoint), and the parameters needed.
         """
         tree_fetch = Fetch_Industry_Tree()
-        api_key = os.getenv("OPENAI_API_KEY")
         industry_tree = tree_fetch.get_industry_tree()
-        llm_service = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=api_key)
+        llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
         function_llm = LLM_function_calling_service()
 
         industry, confidence_score = self.choose_industry_based_on_query(query, industry_tree)
@@ -171,14 +172,33 @@ class API_Utils:
         above the threshold are explored. If no APIs meet the threshold, the top 3 APIs by
         confidence are returned.
 
+        The API_ROUTING_MODE environment variable selects how the tree is searched: "embedding"
+        (the default) routes the query with a single vector similarity pass, "llm_batched" scores
+        all the children of a node in one LLM call (see batched_multi_traverse_api_tree) and "llm"
+        asks the LLM about every branch. The embedding router falls back to "llm_batched" when it
+        cannot be used.
+
         :param query: The input query describing the functionality.
         :param threshold: The minimum confidence score required to continue exploring a path.
         :return: A list of valid API names (strings) that meet the threshold confidence, or
                 the top 3 APIs if none meet the threshold.
         """
+        routing_mode = os.getenv("API_ROUTING_MODE", "embedding").lower()
+        if routing_mode == "embedding":
+            try:
+                routed_apis = get_api_router().route(query, threshold)
+                print("routed apis", routed_apis)
+                return [api_name for api_name, confidence in routed_apis]
+            except Exception as e:
+                print(f"Embedding API routing failed, falling back to the LLM traversal: {e}")
+                routing_mode = "llm_batched"
+
+        if routing_mode == "llm_batched":
+            return self.batched_multi_traverse_api_tree(query, threshold)
+
         tree_fetch = Fetch_Industry_Tree()
         industry_tree = tree_fetch.get_industry_tree()
-        llm_service = OpenAiLLMService(model_name="gpt-4", api_key=os.getenv("OPENAI_API_KEY"))
+        llm_service = get_openai_llm_service(model_name="gpt-4")
         function_llm = LLM_function_calling_service()
 
         industry, initial_confidence = self.choose_industry_based_on_query(query, industry_tree)
@@ -227,6 +247,51 @@ class API_Utils:
 
 
 
+    def batched_multi_traverse_api_tree(self, query: str, threshold: float = 0.6, max_workers: int = None) -> List[str]:
+        """
+        Variant of multi_traverse_api_tree that scores all the children of a node in one LLM call and
+        explores the nodes of a level concurrently. Branches scoring below the threshold are pruned,
+        except for the best child of a node, so every explored node leads to at least one API.
+
+        :param query: The input query describing the functionality.
+        :param threshold: The minimum confidence score required to explore a branch or keep an API.
+        :param max_workers: The number of nodes scored at the same time.
+        :return: A list of valid API names (strings) that meet the threshold confidence, or
+                the top 3 APIs if none meet the threshold.
+        """
+        industry_tree = Fetch_Industry_Tree().get_industry_tree()
+        llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
+        max_workers = max_workers or int(os.getenv("API_TRAVERSAL_MAX_WORKERS", "8"))
+
+        def expand(node: Dict[str, Any]) -> List[Tuple[float, Any, str]]:
+            scores = llm_service.score_branches(query, node)
+            ranked = sorted(((scores[name][0], name) for name in node), reverse=True)
+            return [(confidence, node[name], scores[name][1])
+                    for rank, (confidence, name) in enumerate(ranked) if rank == 0 or confidence >= threshold]
+
+        explored_apis = {}
+        frontier = [industry_tree]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier:
+                next_frontier = []
+                for children in executor.map(expand, frontier):
+                    for confidence, child, score_reason in children:
+                        if isinstance(child, dict):
+                            next_frontier.append(child)
+                        elif isinstance(child, str):
+                            # An API reachable through several paths keeps its best score
+                            explored_apis[child] = max(confidence, explored_apis.get(child, 0.0))
+                frontier = next_frontier
+
+        ranked_apis = sorted(explored_apis.items(), key=lambda item: item[1], reverse=True)
+        valid_api_names = [api for api, confidence in ranked_apis if confidence >= threshold]
+
+        # If no APIs meet the threshold, return the top 3 by confidence
+        if not valid_api_names:
+            valid_api_names = [api for api, confidence in ranked_apis[:3]]
+
+        return valid_api_names
+
     def select_highest_confidence_path(self, paths: List[Tuple[float, List[str], Any, List[str]]]) -> Tuple[List[str], Any, List[str], float]:
         """
         Selects the path with the highest confidence score from a list of paths.
@@ -252,29 +317,39 @@ class API_Utils:
         return path_taken, final_method, parameters, highest_score
     
     
-    def select_endpoint(self, api_name: str, query: str) -> Tuple[str, List[str], float]:
+    def select_endpoint(self, api_name: str, query: str, use_cache: bool = True) -> Tuple[Any, List[str], float, str]:
         
         """
         Selects an endpoint for a given API name based on a query.
-        Uses decide_next_branch to choose an endpoint from the function map.
+        Uses decide_next_branch to choose an endpoint from the function map. Confident selections
+        are remembered in the endpoint selection cache, so the same step against the same API is
+        answered without the LLM until the API's method set changes.
         :param api_name: The name of the API as defined in the tree.
         :param query: A natural language query describing the desired functionality.
-        :return: A tuple containing the selected endpoint and its parameters.
+        :param use_cache: Whether to look up and store the selection in the endpoint selection cache.
+        :return: A tuple containing the selected endpoint, its parameters, the confidence score and the reason for it.
         """
         function_llm = LLM_function_calling_service()
         try:
             
-            api_tree = get_flat_api_instance_tree()
-            api_instance = api_tree.get(api_name)
+            api_instance = get_api_instance(api_name)
             if not api_instance:
                 raise KeyError(f"API '{api_name}' not found in the API tree.")
 
+            cache = get_endpoint_selection_cache() if use_cache else None
+            api_version = api_method_set_version(api_instance) if cache is not None else None
+            if cache is not None:
+                cached = cache.get(query, api_name, api_version)
+                if cached is not None and callable(getattr(api_instance, cached["endpoint_name"], None)):
+                    print("here is the cached endpoint", cached["endpoint_name"])
+                    return (getattr(api_instance, cached["endpoint_name"]), cached["parameters"],
+                            cached["confidence"], cached["score_reason"])
+
             function_map = function_llm.get_function_map(class_instance=api_instance)
             if not function_map:
                 raise ValueError(f"No function map available for API '{api_name}'.")
 
-            api_key = os.getenv("OPENAI_API_KEY")
-            llm_service = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=api_key)
+            llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
             selected_endpoint, confidence_score, endpoint_score = llm_service.decide_next_branch(query, function_map)
             print("here is the selected endpoint", selected_endpoint)
             
@@ -285,8 +360,19 @@ class API_Utils:
            
             parameters = self.get_function_parameters(final_method)
 
+            if cache is not None:
+                cache.set(query, api_name, api_version, selected_endpoint, parameters, confidence_score, endpoint_score)
+
             return final_method, parameters , confidence_score, endpoint_score
 
         except Exception as e:
             print(f"Error in select_endpoint : {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def forget_endpoint(self, api_name: str, query: str) -> None:
+        """
+        Drops the cached endpoint selection of a query, e.g. after the selected endpoint kept failing.
+        """
+        cache = get_endpoint_selection_cache()
+        if cache is not None:
+            cache.invalidate(query, api_name)
@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 import os
 
 class GNewsClient:
@@ -13,7 +13,7 @@ class GNewsClient:
             "topic": category,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def fetch_top_headlines(self, lang="en"):
@@ -21,7 +21,7 @@ class GNewsClient:
             "token": self.api_key,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def fetch_technology_news(self, lang="en"):
@@ -30,7 +30,7 @@ class GNewsClient:
             "topic": "technology",
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def fetch_topic_news(self, topic, lang="en"):
@@ -39,7 +39,7 @@ class GNewsClient:
             "topic": topic,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def search_news(self, query, lang="en"):
@@ -48,7 +48,7 @@ class GNewsClient:
             "q": query,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}search", params=params)
+        response = http_transport.get(f"{self.BASE_URL}search", params=params)
         return response.json()
 
     def fetch_news_by_country(self, country, lang="en"):
@@ -57,7 +57,7 @@ class GNewsClient:
             "country": country,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def fetch_news_by_language(self, lang):
@@ -65,7 +65,7 @@ class GNewsClient:
             "token": self.api_key,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def fetch_news_by_source(self, source, lang="en"):
@@ -74,7 +74,7 @@ class GNewsClient:
             "lang": lang,
             "sources": source
         }
-        response = requests.get(f"{self.BASE_URL}top-headlines", params=params)
+        response = http_transport.get(f"{self.BASE_URL}top-headlines", params=params)
         return response.json()
 
     def search_news(self, query, lang="en"):
@@ -83,6 +83,6 @@ class GNewsClient:
             "q": query,
             "lang": lang
         }
-        response = requests.get(f"{self.BASE_URL}search", params=params)
+        response = http_transport.get(f"{self.BASE_URL}search", params=params)
         return response.json()
 
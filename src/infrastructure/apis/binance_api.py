@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 
 class BinanceAPI:
     BASE_URL = "https://api.binance.com/api/v3"
@@ -13,7 +13,7 @@ class BinanceAPI:
         """
         endpoint = f"{BinanceAPI.BASE_URL}/ticker/price"
         params = {'symbol': symbol} if symbol else {}
-        response = requests.get(endpoint, params=params)
+        response = http_transport.get(endpoint, params=params)
         return response.json()
 
     @staticmethod
@@ -26,7 +26,7 @@ class BinanceAPI:
         """
         endpoint = f"{BinanceAPI.BASE_URL}/depth"
         params = {'symbol': symbol}
-        response = requests.get(endpoint, params=params)
+        response = http_transport.get(endpoint, params=params)
         return response.json()
 
     @staticmethod
@@ -39,7 +39,7 @@ class BinanceAPI:
         """
         endpoint = f"{BinanceAPI.BASE_URL}/trades"
         params = {'symbol': symbol}
-        response = requests.get(endpoint, params=params)
+        response = http_transport.get(endpoint, params=params)
         return response.json()
 
     @staticmethod
@@ -52,7 +52,7 @@ class BinanceAPI:
         """
         endpoint = f"{BinanceAPI.BASE_URL}/historicalTrades"
         params = {'symbol': symbol}
-        response = requests.get(endpoint, params=params)
+        response = http_transport.get(endpoint, params=params)
         return response.json()
 
     @staticmethod
@@ -66,7 +66,7 @@ class BinanceAPI:
         """
         endpoint = f"{BinanceAPI.BASE_URL}/klines"
         params = {'symbol': symbol, 'interval': interval}
-        response = requests.get(endpoint, params=params)
+        response = http_transport.get(endpoint, params=params)
         return response.json()
 
     @staticmethod
@@ -77,5 +77,5 @@ class BinanceAPI:
         :return: JSON response with exchange information.
         """
         endpoint = f"{BinanceAPI.BASE_URL}/exchangeInfo"
-        response = requests.get(endpoint)
+        response = http_transport.get(endpoint)
         return response.json()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import requests
+from infrastructure import http_transport
 import logging
 import os
+from infrastructure.response_cache import cached_endpoint
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,7 +20,7 @@ class YelpClient:
     def _get(self, endpoint, params={}):
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_transport.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Successfully fetched data from {endpoint}")
             return response.json()
@@ -39,6 +41,7 @@ class YelpClient:
         endpoint = f"businesses/{business_id}/reviews"
         return self._get(endpoint)
 
+    @cached_endpoint(ttl=7 * 24 * 60 * 60)
     def list_categories(self):
         endpoint = "categories"
         return self._get(endpoint)
@@ -1,5 +1,6 @@
 import os
 import requests
+from infrastructure import http_transport
 from typing import Dict, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -57,7 +58,7 @@ class CalendlyApi:
             requests.exceptions.RequestException: If the API request fails
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.request(method, url, headers=self.headers, json=data, params=params)
+        response = http_transport.request(method, url, headers=self.headers, json=data, params=params)
         response.raise_for_status()
         return response.json()
 
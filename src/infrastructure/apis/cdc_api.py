@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 from typing import Any, Dict, List
 
 class CDCAPI:
@@ -30,7 +31,7 @@ class CDCAPI:
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(url, params=params)
+        response = http_transport.get(url, params=params)
 
         if response.status_code == 200:
             return response.json()
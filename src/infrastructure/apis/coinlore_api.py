@@ -1,7 +1,9 @@
 import os
 import requests
+from infrastructure import http_transport
 from flask import current_app
 from dotenv import load_dotenv
+from infrastructure.response_cache import cached_endpoint
 
 class CoinloreAPI:
     """
@@ -49,7 +51,7 @@ class CoinloreAPI:
         """
         url = f"{self.BASE_URL}/{endpoint}"
         try:
-            response = requests.get(url, params=params)
+            response = http_transport.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -72,6 +74,7 @@ class CoinloreAPI:
         """Get top exchanges and markets for a specific cryptocurrency."""
         return self._make_request("coin/markets/", {"id": coin_id})
 
+    @cached_endpoint(ttl=60 * 60)
     def get_all_exchanges(self) -> dict:
         """Get all exchanges listed on the platform."""
         return self._make_request("exchanges/")
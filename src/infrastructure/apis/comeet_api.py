@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 
 class ComeetApi:
     def __init__(self, api_key: str, company_id: str):
@@ -21,7 +21,7 @@ class ComeetApi:
         :return: JSON response with position data.
         """
         url = f"{self.base_url}/positions"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -32,7 +32,7 @@ class ComeetApi:
         :return: JSON response with position details.
         """
         url = f"{self.base_url}/positions/{position_uid}"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -44,7 +44,7 @@ class ComeetApi:
         :return: JSON response with the created candidate data.
         """
         url = f"{self.base_url}/positions/{position_uid}/candidates"
-        response = requests.post(url, headers=self.headers, json=candidate_data)
+        response = http_transport.post(url, headers=self.headers, json=candidate_data)
         response.raise_for_status()
         return response.json()
 
@@ -55,7 +55,7 @@ class ComeetApi:
         :return: JSON response with candidate data.
         """
         url = f"{self.base_url}/positions/{position_uid}/candidates"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -66,7 +66,7 @@ class ComeetApi:
         :return: JSON response with candidate details.
         """
         url = f"{self.base_url}/candidates/{candidate_uid}"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -78,7 +78,7 @@ class ComeetApi:
         :return: JSON response with the updated candidate data.
         """
         url = f"{self.base_url}/candidates/{candidate_uid}/status"
-        response = requests.put(url, headers=self.headers, json=status_data)
+        response = http_transport.put(url, headers=self.headers, json=status_data)
         response.raise_for_status()
         return response.json()
 
@@ -88,7 +88,7 @@ class ComeetApi:
         :return: JSON response with hiring manager data.
         """
         url = f"{self.base_url}/hiring/managers"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -98,7 +98,7 @@ class ComeetApi:
         :return: JSON response with interview template data.
         """
         url = f"{self.base_url}/interviews/templates"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -110,7 +110,7 @@ class ComeetApi:
         :return: JSON response with scheduled interview data.
         """
         url = f"{self.base_url}/candidates/{candidate_uid}/interviews"
-        response = requests.post(url, headers=self.headers, json=interview_data)
+        response = http_transport.post(url, headers=self.headers, json=interview_data)
         response.raise_for_status()
         return response.json()
 
@@ -120,6 +120,6 @@ class ComeetApi:
         :return: JSON response with report data.
         """
         url = f"{self.base_url}/reports"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
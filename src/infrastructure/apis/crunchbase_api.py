@@ -1,5 +1,5 @@
 from enum import Enum
-import requests
+from infrastructure import http_transport
 from flask import current_app, json
 from typing import Any, Dict, List, Optional
 
@@ -61,7 +61,7 @@ class CrunchbaseAPI:
         }
 
         # Make the POST request to the Crunchbase API
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        response = http_transport.post(url, headers=headers, data=json.dumps(payload))
 
         if response.status_code == 200:
             return response.json()
@@ -114,7 +114,7 @@ class CrunchbaseAPI:
         }
 
         # Make the POST request to the Crunchbase API
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        response = http_transport.post(url, headers=headers, data=json.dumps(payload))
 
         if response.status_code == 200:
             # process to get only the three properties
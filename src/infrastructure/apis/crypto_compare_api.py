@@ -1,7 +1,8 @@
 from enum import Enum
 from typing import Dict, Optional, Any
-import requests
+from infrastructure import http_transport
 import os  # Import os module to access environment variables
+from infrastructure.response_cache import cached_endpoint
 
 class CryptoCompareEndpoint(Enum):
     PRICE = "price"
@@ -51,7 +52,7 @@ class CryptoCompareAPI:
             params = {}
         params['api_key'] = self.api_key
         params = {k: v for k, v in params.items() if v is not None}
-        response = requests.get(f"{self.BASE_URL}{endpoint}", params=params)
+        response = http_transport.get(f"{self.BASE_URL}{endpoint}", params=params)
         response.raise_for_status()
         return response.json()
 
@@ -234,6 +235,7 @@ class CryptoCompareAPI:
         }
         return self._get(endpoint, params)
 
+    @cached_endpoint(ttl=24 * 60 * 60)
     def get_coin_list(self) -> Dict[str, Any]:
         """
         Retrieve the complete list of cryptocurrencies.
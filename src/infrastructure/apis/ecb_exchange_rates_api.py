@@ -1,6 +1,8 @@
 import requests
+from infrastructure import http_transport
 import os
 from typing import List, Optional, Dict, Any
+from infrastructure.response_cache import cached_endpoint
 
 class ECBExchangeRatesAPI:
     """
@@ -18,6 +20,7 @@ class ECBExchangeRatesAPI:
         self.base_url = "https://api.exchangeratesapi.io/" 
         self.api_key = os.getenv("ECB_API_KEY")  # Get API key from environment variable
 
+    @cached_endpoint(ttl=24 * 60 * 60)
     def get_supported_symbols(self) -> Dict[str, Any]:
         """
         Retrieves a list of supported currency symbols from the API.
@@ -25,7 +28,7 @@ class ECBExchangeRatesAPI:
         Returns:
             Dict[str, Any]: A dictionary containing supported currency symbols.
         """
-        response = requests.get(f"{self.base_url}symbols", params={"access_key": self.api_key})
+        response = http_transport.get(f"{self.base_url}symbols", params={"access_key": self.api_key})
         return response.json()
 
     def get_latest_rates(self, base_currency: str = 'EUR', symbols: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -42,7 +45,7 @@ class ECBExchangeRatesAPI:
         params = {'access_key': self.api_key, 'base': base_currency}
         if symbols:
             params['symbols'] = ','.join(symbols)
-        response = requests.get(f"{self.base_url}latest", params=params)
+        response = http_transport.get(f"{self.base_url}latest", params=params)
         return response.json()
 
     def get_historical_rates(self, date: str, base_currency: str = 'EUR', symbols: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -60,7 +63,7 @@ class ECBExchangeRatesAPI:
         params = {'access_key': self.api_key, 'base': base_currency}
         if symbols:
             params['symbols'] = ','.join(symbols)
-        response = requests.get(f"{self.base_url}{date}", params=params)
+        response = http_transport.get(f"{self.base_url}{date}", params=params)
         return response.json()
 
     def convert_currency(self, from_currency: str, to_currency: str, amount: float, date: Optional[str] = None) -> Dict[str, Any]:
@@ -84,7 +87,7 @@ class ECBExchangeRatesAPI:
         }
         if date:
             params['date'] = date
-        response = requests.get(f"{self.base_url}convert", params=params)
+        response = http_transport.get(f"{self.base_url}convert", params=params)
         return response.json()
 
     def get_time_series(self, start_date: str, end_date: str, base_currency: str = 'EUR', symbols: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -108,7 +111,7 @@ class ECBExchangeRatesAPI:
         }
         if symbols:
             params['symbols'] = ','.join(symbols)
-        response = requests.get(f"{self.base_url}timeseries", params=params)
+        response = http_transport.get(f"{self.base_url}timeseries", params=params)
         return response.json()
 
     def get_fluctuation(self, start_date: str, end_date: str, base_currency: str = 'EUR', symbols: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -132,5 +135,5 @@ class ECBExchangeRatesAPI:
         }
         if symbols:
             params['symbols'] = ','.join(symbols)
-        response = requests.get(f"{self.base_url}fluctuation", params=params)
+        response = http_transport.get(f"{self.base_url}fluctuation", params=params)
         return response.json()
@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 import os
 
 class AlphaVantageClient:
@@ -13,7 +13,7 @@ class AlphaVantageClient:
             "symbol": symbol,
             "apikey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
         return response.json()
 
     def fetch_forex_rate(self, from_currency, to_currency):
@@ -23,7 +23,7 @@ class AlphaVantageClient:
             "to_currency": to_currency,
             "apikey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
         return response.json()
 
     def fetch_sma(self, symbol, interval="daily", time_period=10):
@@ -35,7 +35,7 @@ class AlphaVantageClient:
             "series_type": "close",
             "apikey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
         return response.json()
 
     def fetch_crypto_exchange_rate(self, from_currency, to_currency):
@@ -45,7 +45,7 @@ class AlphaVantageClient:
             "to_currency": to_currency,
             "apikey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
         return response.json()
 
     def fetch_intraday_stock(self, symbol, interval="5min"):
@@ -55,7 +55,7 @@ class AlphaVantageClient:
             "interval": interval,
             "apikey": self.api_key
         }
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
         return response.json()
 
 
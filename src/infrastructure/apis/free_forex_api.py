@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 from enum import Enum
 from typing import Dict, Any, List
 import os  # Add this import at the top of the file
@@ -48,7 +49,7 @@ class FreeForexAPI:
             'format': 1
         }
         
-        response = requests.get(self.BASE_URL, params=params)
+        response = http_transport.get(self.BASE_URL, params=params)
 
         if response.status_code == 200:
             data = response.json()
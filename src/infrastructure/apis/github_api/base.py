@@ -1,5 +1,7 @@
-import requests
-from typing import Optional, Dict, Any, List
+from infrastructure import http_transport
+from infrastructure.async_http_transport import get_async_http_transport
+from infrastructure.pagination import page_items, paginate
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 class GitHubAPIBase:
     def __init__(self, token: str) -> None:
@@ -9,28 +11,65 @@ class GitHubAPIBase:
             "Accept": "application/vnd.github.v3+json"
         }
 
-    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+             headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         url = f"{self.base_url}/{endpoint}"  # Generate URL
         if params:
             params = {k: v for k, v in params.items() if v is not None}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers={**self.headers, **(headers or {})}, params=params)
         response.raise_for_status()
         return response.json()
 
+    def _iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> Iterator[Any]:
+        """
+        Lazily iterates over the items of a paginated endpoint, following the next links of the Link
+        header. Search endpoints return their items under "items", list endpoints as the response itself.
+        """
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        headers = {**self.headers, **(headers or {})}
+
+        def fetch_page(page: Tuple[str, Optional[Dict[str, Any]]]) -> Tuple[List[Any], Any]:
+            url, page_params = page
+            response = http_transport.get(url, headers=headers, params=page_params)
+            response.raise_for_status()
+            next_url = response.links.get("next", {}).get("url")
+            # The next link carries the query parameters of the request.
+            return page_items(response.json(), "items"), (next_url, None) if next_url else None
+
+        return paginate(fetch_page, (f"{self.base_url}/{endpoint}", params))
+
     def _post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self.base_url}/{endpoint}"  # Generate URL
-        response = requests.post(url, headers=self.headers, json=data)
+        response = http_transport.post(url, headers=self.headers, json=data)
         response.raise_for_status()
         return response.json()
 
     def _put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         url = f"{self.base_url}/{endpoint}"  # Generate URL
-        response = requests.put(url, headers=self.headers, json=data)
+        response = http_transport.put(url, headers=self.headers, json=data)
         response.raise_for_status()
         return response.json() if response.content else None
 
     def _delete(self, endpoint: str) -> int:
         url = f"{self.base_url}/{endpoint}"  # Generate URL
-        response = requests.delete(url, headers=self.headers)
+        response = http_transport.delete(url, headers=self.headers)
         response.raise_for_status()
-        return response.status_code
\ No newline at end of file
+        return response.status_code
+
+
+class AsyncGitHubAPIMixin:
+    """
+    Makes the GET endpoints of a GitHubAPIBase client async: they keep their names and arguments and
+    return awaitables, sent through the async HTTP transport of the running event loop.
+    """
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        url = f"{self.base_url}/{endpoint}"  # Generate URL
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        response = await get_async_http_transport().get(url, headers={**self.headers, **(headers or {})}, params=params)
+        response.raise_for_status()
+        return response.json()
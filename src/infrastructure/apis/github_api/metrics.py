@@ -1,14 +1,18 @@
 from .base import GitHubAPIBase
+from infrastructure.response_cache import cached_endpoint
 
 class Metrics(GitHubAPIBase):
+    @cached_endpoint(ttl=60 * 60)
     def get_repo_stats(self, owner, repo):
         url = f"/repos/{owner}/{repo}/stats/contributors"
         return self._get(url)
 
+    @cached_endpoint(ttl=60 * 60)
     def get_code_frequency(self, owner, repo):
         url = f"/repos/{owner}/{repo}/stats/code_frequency"
         return self._get(url)
 
+    @cached_endpoint(ttl=60 * 60)
     def get_issue_activity(self, owner, repo):
         url = f"/repos/{owner}/{repo}/stats/issue_activity"
         return self._get(url)
@@ -1,4 +1,4 @@
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Iterator
 from enum import Enum
 
 from ..base import GitHubAPIBase
@@ -66,6 +66,39 @@ class PullRequestsAPI(GitHubAPIBase):
             
         return self._get(endpoint, headers=headers, params=params)
 
+    def iter_pull_requests(
+        self,
+        owner: str,
+        repo: str,
+        state: PullRequestState = PullRequestState.OPEN,
+        sort: Optional[PullRequestSort] = None,
+        direction: Optional[PullRequestSortDirection] = None,
+        per_page: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all pull requests of a repository, page by page.
+
+        Parameters:
+        - owner (str): The account owner of the repository. (Required)
+        - repo (str): The name of the repository without the .git extension. (Required)
+        - state (PullRequestState): The state of the pull requests to return (open, closed, or all). (Optional)
+        - sort (PullRequestSort): The sort order for pull requests (created, updated, or popularity). (Optional)
+        - direction (PullRequestSortDirection): The direction of sorting (asc or desc). (Optional)
+        - per_page (int): Number of results per page (default is 100, max is 100). (Optional)
+
+        Returns:
+        - An iterator over the pull requests.
+        """
+        endpoint = f"/repos/{owner}/{repo}/pulls"
+        headers = {"Accept": "application/vnd.github+json"}
+        params = {
+            "state": state.value,
+            "sort": sort.value if sort else None,
+            "direction": direction.value if direction else None,
+            "per_page": per_page
+        }
+        yield from self._iter_pages(endpoint, params=params, headers=headers)
+
     def create_pull_request(self, owner: str, repo: str, title: str, head: str, base: str, body: Optional[str] = None) -> Any:
         """
         Create a pull request.
@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from enum import Enum
 
-from .base import GitHubAPIBase
+from infrastructure.async_http_transport import gather_items
+
+from .base import AsyncGitHubAPIMixin, GitHubAPIBase
 
 
 # Define Enums for sorting options
@@ -268,3 +270,56 @@ class GithubSearch(GitHubAPIBase):
             **kwargs
         }
         return self._get(endpoint, params=params)
+
+    def iter_search(
+        self,
+        kind: str,
+        q: str,
+        per_page: int = 100,
+        **kwargs: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """
+        Lazily iterate over all results of a search, page by page. GitHub returns at most 1000 results per search.
+
+        Parameters:
+        - kind (str): What to search: `code`, `commits`, `issues`, `labels`, `repositories`, `topics` or `users` (required).
+        - q (str): The search terms, including optional qualifiers (required).
+        - per_page (int): Results per page (default is 100, max is 100) (optional).
+        - kwargs: The other parameters of the search, e.g. `sort` and `order` as strings (optional).
+
+        Returns:
+        - An iterator over the search results.
+        """
+        endpoint = f"/search/{kind}"
+        params = {
+            "q": q,
+            "per_page": per_page,
+            **kwargs
+        }
+        yield from self._iter_pages(endpoint, params=params)
+
+class AsyncGithubSearch(AsyncGitHubAPIMixin, GithubSearch):
+    """
+    Async variant of GithubSearch: every search has the same name and arguments and returns an awaitable.
+    """
+
+    async def search_repositories_for_queries(
+        self,
+        queries: List[str],
+        concurrency: Optional[int] = None,
+        **kwargs: Dict[str, Any]
+    ) -> List[Any]:
+        """
+        Search for repositories with several queries, with at most `concurrency` searches in flight.
+
+        Parameters:
+        - queries (List[str]): The search terms of every search, including optional qualifiers (required).
+        - concurrency (int): The maximum number of searches running at once (optional).
+        - kwargs: The other parameters of search_repositories, applied to every search (optional).
+
+        Returns:
+        - The JSON response of every search, in the order of the queries. A failed search is {"error": message}.
+        """
+        return await gather_items(
+            (self.search_repositories(q, **kwargs) for q in queries), concurrency
+        )
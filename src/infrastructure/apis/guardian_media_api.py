@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Dict, Optional, Any
-import requests
+from infrastructure import http_transport
 import os  # Import os module to access environment variables
 
 class OrderByEnum(Enum):
@@ -42,7 +42,7 @@ class GuardianNewsAPI:
             params = {}
         params['api-key'] = self.api_key
         params = {k: v for k, v in params.items() if v is not None}
-        response = requests.get(f"{self.BASE_URL}{endpoint}", params=params)
+        response = http_transport.get(f"{self.BASE_URL}{endpoint}", params=params)
         response.raise_for_status()
         return response.json()
 
@@ -1,4 +1,6 @@
 import requests
+from infrastructure import http_transport
+from infrastructure.async_http_transport import gather_items, get_async_http_transport, run_sync
 from typing import Any, Dict, List
 
 class HackerNewsAPI:
@@ -21,7 +23,7 @@ class HackerNewsAPI:
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(f"{self.BASE_URL}/{endpoint}.json")
+        response = http_transport.get(f"{self.BASE_URL}/{endpoint}.json")
 
         if response.status_code == 200:
             return response.json()
@@ -40,6 +42,20 @@ class HackerNewsAPI:
         """
         return self._make_request(f"item/{int(item_id)}")
 
+    def get_items(self, item_ids: List[int], concurrency: int = None) -> List[Dict[str, Any]]:
+        """
+        Fetch several items by ID concurrently, e.g. the stories of a story list or the comments of a story.
+
+        Args:
+            item_ids (List[int]): The IDs of the items to fetch.
+            concurrency (int): The maximum number of items fetched at once.
+
+        Returns:
+            List[Dict[str, Any]]: The details of the fetched items, in the order of their IDs. An item
+            that could not be fetched is {"error": message}.
+        """
+        return run_sync(AsyncHackerNewsAPI().get_items(item_ids, concurrency))
+
     def get_user(self, user_id: str) -> Dict[str, Any]:
         """
         Fetch a specific user by ID.
@@ -123,4 +139,29 @@ class HackerNewsAPI:
             Dict[str, Any]: A dictionary containing updated item IDs and updated profile usernames.
         """
         return self._make_request("updates")
-    
\ No newline at end of file
+
+
+class AsyncHackerNewsAPI(HackerNewsAPI):
+    """
+    Async variant of HackerNewsAPI: every endpoint has the same name and arguments and returns an
+    awaitable. Requests go through the async HTTP transport of the running event loop.
+    """
+
+    async def _make_request(self, endpoint: str) -> Dict[str, Any]:
+        response = await get_async_http_transport().get(f"{self.BASE_URL}/{endpoint}.json")
+        response.raise_for_status()
+        return response.json()
+
+    async def get_items(self, item_ids: List[int], concurrency: int = None) -> List[Dict[str, Any]]:
+        """
+        Fetch several items by ID, with at most `concurrency` requests in flight.
+
+        Args:
+            item_ids (List[int]): The IDs of the items to fetch.
+            concurrency (int): The maximum number of items fetched at once.
+
+        Returns:
+            List[Dict[str, Any]]: The details of the fetched items, in the order of their IDs. An item
+            that could not be fetched is {"error": message}.
+        """
+        return await gather_items((self.get_item(item_id) for item_id in item_ids), concurrency)
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Final, Optional
 import requests
+from infrastructure import http_transport
 
 class HarvardAPI:
     """
@@ -59,7 +60,7 @@ class HarvardAPI:
         """
         url = f"{self.BASE_URL}{endpoint}"
         try:
-            response = requests.get(url, params=params)
+            response = http_transport.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 from typing import Any, Dict, List, Union
 
 class HealthCareAPI:
@@ -23,7 +24,7 @@ class HealthCareAPI:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
         url = f"https://www.healthcare.gov/{post_title}.json"
-        response = requests.get(url)
+        response = http_transport.get(url)
 
         if response.status_code == 200:
             return response.json()
@@ -44,7 +45,7 @@ class HealthCareAPI:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
         url = f"{self.BASE_URL}{content_type}.json"
-        response = requests.get(url)
+        response = http_transport.get(url)
 
         if response.status_code == 200:
             return response.json()
@@ -62,7 +63,7 @@ class HealthCareAPI:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
         url = f"{self.BASE_URL}index.json"
-        response = requests.get(url)
+        response = http_transport.get(url)
 
         if response.status_code == 200:
             return response.json()
@@ -1,5 +1,6 @@
 import os
 import requests
+from infrastructure import http_transport
 from flask import current_app
 from dotenv import load_dotenv
 
@@ -69,7 +70,7 @@ class HereAPI:
         params['apiKey'] = self.api_key
 
         try:
-            response = requests.get(url, params=params)
+            response = http_transport.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
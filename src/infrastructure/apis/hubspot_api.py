@@ -1,5 +1,8 @@
 import os
 import requests
+from infrastructure import http_transport
+from infrastructure.pagination import paginate
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
 class HubSpotAPI:
@@ -30,7 +33,7 @@ class HubSpotAPI:
             dict: A dictionary containing the results of the request.
                   Includes either the contacts data or an error message.
         """
-        response = requests.get(self.contacts_url, headers=self.headers)
+        response = http_transport.get(self.contacts_url, headers=self.headers)
         if response.status_code == 200:
             contacts = response.json()
             return {
@@ -43,6 +46,34 @@ class HubSpotAPI:
                 "error": f"Failed to fetch contacts. Status code: {response.status_code}, Response: {response.text}"
             }
 
+    def iter_contacts(self, limit: int = 100, properties: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterates over all contacts in HubSpot CRM, following the paging cursors.
+
+        Args:
+            limit (int): The number of contacts fetched per page, at most 100.
+            properties (List[str]): The contact properties to return. HubSpot's defaults when omitted.
+
+        Returns:
+            Iterator[Dict[str, Any]]: An iterator over the contacts.
+
+        Raises:
+            RuntimeError: If a page could not be fetched.
+        """
+        def fetch_page(after: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            params = {"limit": limit, "after": after}
+            if properties:
+                params["properties"] = ",".join(properties)
+            response = http_transport.get(self.contacts_url, headers=self.headers, params=params)
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to fetch contacts. Status code: {response.status_code}, Response: {response.text}"
+                )
+            data = response.json()
+            return data["results"], data.get("paging", {}).get("next", {}).get("after")
+
+        yield from paginate(fetch_page)
+
     def create_contact(self, first_name: str, last_name: str, email: str) -> dict:
         """
         Creates a new contact in HubSpot CRM.
@@ -63,7 +94,7 @@ class HubSpotAPI:
                 "email": email
             }
         }
-        response = requests.post(self.contacts_url, headers=self.headers, json=data)
+        response = http_transport.post(self.contacts_url, headers=self.headers, json=data)
         if response.status_code == 201:
             contact = response.json()
             return {
@@ -90,7 +121,7 @@ class HubSpotAPI:
         """
         url = f"{self.contacts_url}/{contact_id}"
         data = {"properties": updated_data}
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = http_transport.patch(url, headers=self.headers, json=data)
         if response.status_code == 200:
             return {
                 "success": True,
@@ -113,7 +144,7 @@ class HubSpotAPI:
             dict: A dictionary indicating the result of the delete operation.
         """
         url = f"{self.contacts_url}/{contact_id}"
-        response = requests.delete(url, headers=self.headers)
+        response = http_transport.delete(url, headers=self.headers)
         if response.status_code == 204:
             return {
                 "success": True,
@@ -133,7 +164,7 @@ class HubSpotAPI:
             dict: A dictionary containing the results of the request,
                   includes either the companies data or an error message.
         """
-        response = requests.get(self.companies_url, headers=self.headers)
+        response = http_transport.get(self.companies_url, headers=self.headers)
         if response.status_code == 200:
             companies = response.json()
             return {
@@ -164,7 +195,7 @@ class HubSpotAPI:
                 "domain": domain
             }
         }
-        response = requests.post(self.companies_url, headers=self.headers, json=data)
+        response = http_transport.post(self.companies_url, headers=self.headers, json=data)
         if response.status_code == 201:
             company = response.json()
             return {
@@ -191,7 +222,7 @@ class HubSpotAPI:
         """
         url = f"{self.companies_url}/{company_id}"
         data = {"properties": updated_data}
-        response = requests.patch(url, headers=self.headers, json=data)
+        response = http_transport.patch(url, headers=self.headers, json=data)
         if response.status_code == 200:
             return {
                 "success": True,
@@ -214,7 +245,7 @@ class HubSpotAPI:
             dict: A dictionary indicating the result of the delete operation.
         """
         url = f"{self.companies_url}/{company_id}"
-        response = requests.delete(url, headers=self.headers)
+        response = http_transport.delete(url, headers=self.headers)
         if response.status_code == 204:
             return {
                 "success": True,
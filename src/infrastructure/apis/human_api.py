@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 from typing import Any, Dict, List, Union
 
 class HumanAPI:
@@ -32,7 +33,7 @@ class HumanAPI:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
         headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(f"{self.BASE_URL}{endpoint}", headers=headers)
+        response = http_transport.get(f"{self.BASE_URL}{endpoint}", headers=headers)
 
         if response.status_code == 200:
             return response.json()
@@ -1,5 +1,5 @@
 import os
-import requests
+from infrastructure import http_transport
 
 class MailChimpApi:
     def __init__(self, server_prefix: str):
@@ -20,7 +20,7 @@ class MailChimpApi:
         :return: JSON response with audience data.
         """
         url = f"{self.base_url}/lists"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -31,7 +31,7 @@ class MailChimpApi:
         :return: JSON response with list member data.
         """
         url = f"{self.base_url}/lists/{list_id}/members"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -50,7 +50,7 @@ class MailChimpApi:
             "status": status,
             "merge_fields": merge_fields or {},
         }
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = http_transport.post(url, headers=self.headers, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -73,7 +73,7 @@ class MailChimpApi:
                 "reply_to": reply_to,
             },
         }
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = http_transport.post(url, headers=self.headers, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -84,7 +84,7 @@ class MailChimpApi:
         :return: JSON response indicating success or failure.
         """
         url = f"{self.base_url}/campaigns/{campaign_id}/actions/send"
-        response = requests.post(url, headers=self.headers)
+        response = http_transport.post(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -94,7 +94,7 @@ class MailChimpApi:
         :return: JSON response with campaign data.
         """
         url = f"{self.base_url}/campaigns"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -104,7 +104,7 @@ class MailChimpApi:
         :return: JSON response with template data.
         """
         url = f"{self.base_url}/templates"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -120,7 +120,7 @@ class MailChimpApi:
             "name": name,
             "html": html,
         }
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = http_transport.post(url, headers=self.headers, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -130,7 +130,7 @@ class MailChimpApi:
         :return: JSON response with report data.
         """
         url = f"{self.base_url}/reports"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -140,7 +140,7 @@ class MailChimpApi:
         :return: JSON response with automation email data.
         """
         url = f"{self.base_url}/automations"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -151,7 +151,7 @@ class MailChimpApi:
         :return: JSON response indicating success or failure.
         """
         url = f"{self.base_url}/automations/{workflow_id}/actions/start"
-        response = requests.post(url, headers=self.headers)
+        response = http_transport.post(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
 
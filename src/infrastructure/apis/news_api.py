@@ -1,5 +1,5 @@
 import os
-import requests
+from infrastructure import http_transport
 # from dotenv import load_dotenv
 from typing import Optional, Dict, Any, List
 
@@ -55,7 +55,7 @@ class NewsAPIInitializer:
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
         print("pß", params)
-        response = requests.get(endpoint, headers=headers, params=params)
+        response = http_transport.get(endpoint, headers=headers, params=params)
         response.raise_for_status()
         print(response.json())
         return response.json()
@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 import logging
 import os
 
@@ -42,7 +43,7 @@ class NumVerifyClient:
 
     def _make_request(self, url, params=None):
         try:
-            response = requests.get(url, params=params)
+            response = http_transport.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -1,6 +1,8 @@
 from typing import Any, Dict, Literal, Optional
 
 import requests
+from infrastructure import http_transport
+from infrastructure.response_cache import cached_endpoint
 
 
 class NYTimes:
@@ -50,6 +52,7 @@ class NYTimes:
 
     # Books API
 
+    @cached_endpoint(ttl=24 * 60 * 60)
     def get_list_names(self) -> Dict:
         """
         Get all the NYT Best Sellers list names.
@@ -280,7 +283,7 @@ class NYTimes:
         """
         params["api-key"] = self.API_KEY
         try:
-            response = requests.get(url, params=params)
+            response = http_transport.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 
 class OpenCitationsAPI:
     BASE_URL = "https://opencitations.net/index/api/v1"
@@ -12,7 +12,7 @@ class OpenCitationsAPI:
         :return: JSON response with the citation count.
         """
         endpoint = f"{OpenCitationsAPI.BASE_URL}/citation-count/{doi}"
-        response = requests.get(endpoint)
+        response = http_transport.get(endpoint)
         return response.json()
 
     @staticmethod
@@ -24,7 +24,7 @@ class OpenCitationsAPI:
         :return: JSON response with the reference count.
         """
         endpoint = f"{OpenCitationsAPI.BASE_URL}/reference-count/{doi}"
-        response = requests.get(endpoint)
+        response = http_transport.get(endpoint)
         return response.json()
 
     @staticmethod
@@ -36,7 +36,7 @@ class OpenCitationsAPI:
         :return: JSON response with the references.
         """
         endpoint = f"{OpenCitationsAPI.BASE_URL}/references/{doi}"
-        response = requests.get(endpoint)
+        response = http_transport.get(endpoint)
         return response.json()
 
     @staticmethod
@@ -48,5 +48,5 @@ class OpenCitationsAPI:
         :return: JSON response with the citations.
         """
         endpoint = f"{OpenCitationsAPI.BASE_URL}/citations/{doi}"
-        response = requests.get(endpoint)
+        response = http_transport.get(endpoint)
         return response.json()
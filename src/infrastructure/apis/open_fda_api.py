@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 import os
 from dotenv import load_dotenv
 from typing import Any, Dict, List
@@ -41,7 +42,7 @@ class OpenFDAAPI:
         if self.api_key:
             headers['User-Agent'] = self.api_key
         
-        response = requests.get(f"{self.BASE_URL}{endpoint}", headers=headers, params=params)
+        response = http_transport.get(f"{self.BASE_URL}{endpoint}", headers=headers, params=params)
 
         if response.status_code == 200:
             return response.json()
@@ -1,6 +1,8 @@
-from typing import Any, Dict, Final, Mapping
+from typing import Any, Callable, Dict, Final, Iterator, List, Mapping
 from flask import current_app
-import requests
+from infrastructure import http_transport
+from infrastructure.async_http_transport import gather_items, get_async_http_transport
+from infrastructure.pagination import page_items, paginate_by_page_number
 
 
 class OpenAIReAPI:
@@ -420,6 +422,35 @@ class OpenAIReAPI:
             endpoint=f"projects/{id}",
         )
 
+    def iter_search_results(
+        self,
+        search_method: Callable[..., Dict[str, Any]],
+        page_size: int = 50,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over the results of every page of a search, e.g.
+        `iter_search_results(api.search_organization, search="CERN")`.
+
+        :param search_method: One of the paginated search_* methods of this client
+        :type search_method: Callable[..., Dict[str, Any]]
+
+        :param page_size: The number of results fetched per page
+        :type page_size: int
+
+        :param kwargs: The other arguments of the search method
+
+        :return: An iterator over the search results
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            data = search_method(page=page, page_size=page_size, **kwargs)
+            if "error" in data:
+                raise RuntimeError(f"Failed to fetch page {page} of the OpenAIRE search: {data['error']}")
+            return page_items(data, "results")
+
+        yield from paginate_by_page_number(fetch_page, page_size)
+
     def __make_get_request(
         self,
         endpoint: str,
@@ -438,7 +469,7 @@ class OpenAIReAPI:
         url = f"{self.BASE_URL}/{endpoint}"
 
         try:
-            response = requests.get(
+            response = http_transport.get(
                 url,
                 params=params,
                 headers=headers,
@@ -543,3 +574,51 @@ if __name__ == "__main__":
 
     # projects = open_aire_api.search_project("Open Scholarship")
     # print(projects)
+
+
+class AsyncOpenAIReAPI(OpenAIReAPI):
+    """
+    Async variant of OpenAIReAPI: every endpoint has the same name and arguments and returns an
+    awaitable. Requests go through the async HTTP transport of the running event loop.
+    """
+
+    async def _OpenAIReAPI__make_get_request(
+        self,
+        endpoint: str,
+        params: Mapping[str, str | int] = {},
+        headers: Mapping[str, str] = {"accept": "application/json"},
+    ) -> Dict:
+        url = f"{self.BASE_URL}/{endpoint}"
+
+        try:
+            response = await get_async_http_transport().get(
+                url,
+                params=params,
+                headers=headers,
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            current_app.logger.error(f"Error while making Openaire API call: {e}")
+            return {"error": str(e)}
+
+    async def get_research_products(
+        self,
+        ids: List[str],
+        concurrency: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch several research products by their OpenAIRE IDs, with at most `concurrency` requests in flight.
+
+        :param ids: The OpenAIRE IDs of the research products
+        :type ids: List[str]
+
+        :param concurrency: The maximum number of research products fetched at once
+        :type concurrency: int
+
+        :return: The research product of every ID, in the order of the IDs
+        :rtype: List[Dict[str, Any]]
+        """
+        return await gather_items(
+            (self.search_research_producrs_by_openaire_id(id) for id in ids), concurrency
+        )
@@ -1,5 +1,5 @@
 from typing import Dict, Optional
-import requests
+from infrastructure import http_transport
 
 class OpenWeatherMapAPI:
     """
@@ -129,7 +129,7 @@ class OpenWeatherMapAPI:
         :raises: HTTPError if the API request fails.
         """
         params['appid'] = self.api_key
-        response = requests.get(f"{self.BASE_URL}/{endpoint}", params=params)
+        response = http_transport.get(f"{self.BASE_URL}/{endpoint}", params=params)
         response.raise_for_status()
         return response.json()
 
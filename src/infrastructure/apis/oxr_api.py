@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 import os
 
 class OpenExchangeRatesClient:
@@ -22,7 +22,7 @@ class OpenExchangeRatesClient:
             "app_id": self.api_key,
             "base": base
         }
-        response = requests.get(f"{self.BASE_URL}latest.json", params=params)
+        response = http_transport.get(f"{self.BASE_URL}latest.json", params=params)
         return response.json()
 
     def fetch_historical_rates(self, date, base="USD"):
@@ -37,5 +37,5 @@ class OpenExchangeRatesClient:
             "app_id": self.api_key,
             "base": base
         }
-        response = requests.get(f"{self.BASE_URL}historical/{date}.json", params=params)
+        response = http_transport.get(f"{self.BASE_URL}historical/{date}.json", params=params)
         return response.json()
\ No newline at end of file
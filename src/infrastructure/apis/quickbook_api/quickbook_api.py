@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 import os
-import requests
+from infrastructure import http_transport
 from dotenv import load_dotenv
 from typing import Any, Dict, List, Optional, Union
 
@@ -132,7 +132,7 @@ class QuickBooksAPI:
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
-        response = requests.request(method, url, headers=headers, json=data)
+        response = http_transport.request(method, url, headers=headers, json=data)
         response.raise_for_status()
         return response.json()
 
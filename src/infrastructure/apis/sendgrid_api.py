@@ -1,4 +1,4 @@
-import requests
+from infrastructure import http_transport
 
 class SendGridAPI:
     BASE_URL = "https://api.sendgrid.com/v3"
@@ -23,7 +23,7 @@ class SendGridAPI:
             "from": {"email": from_email},
             "content": [{"type": "text/plain", "value": content}]
         }
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = http_transport.post(url, json=payload, headers=self.headers)
         return response.json()
 
   
@@ -32,32 +32,32 @@ class SendGridAPI:
         params = {"start_date": start_date}
         if end_date:
             params["end_date"] = end_date
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
         return response.json()
 
   
     def upsert_contacts(self, contacts):
         url = f"{self.BASE_URL}/marketing/contacts"
         payload = {"contacts": contacts}
-        response = requests.put(url, json=payload, headers=self.headers)
+        response = http_transport.put(url, json=payload, headers=self.headers)
         return response.json()
 
   
     def list_templates(self):
         url = f"{self.BASE_URL}/templates"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         return response.json()
 
   
     def create_template(self, name):
         url = f"{self.BASE_URL}/templates"
         payload = {"name": name}
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = http_transport.post(url, json=payload, headers=self.headers)
         return response.json()
 
     def list_suppression_groups(self):
         url = f"{self.BASE_URL}/asm/groups"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         return response.json()
 
    
@@ -67,22 +67,22 @@ class SendGridAPI:
             "enabled": True,
             "enable_text": enable_text
         }
-        response = requests.patch(url, json=payload, headers=self.headers)
+        response = http_transport.patch(url, json=payload, headers=self.headers)
         return response.json()
 
    
     def get_account_info(self):
         url = f"{self.BASE_URL}/user/account"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         return response.json()
 
   
     def get_email_activity(self, query_params=None):
         url = f"{self.BASE_URL}/messages"
-        response = requests.get(url, headers=self.headers, params=query_params or {})
+        response = http_transport.get(url, headers=self.headers, params=query_params or {})
         return response.json()
 
     def list_api_keys(self):
         url = f"{self.BASE_URL}/api_keys"
-        response = requests.get(url, headers=self.headers)
+        response = http_transport.get(url, headers=self.headers)
         return response.json()
@@ -1,10 +1,12 @@
 from datetime import datetime
 import os
-from typing import Optional, List, Tuple, Union, Dict, Any
+from typing import Optional, List, Tuple, Union, Dict, Any, Iterator
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 import logging
 import requests
+from infrastructure import http_transport
+from infrastructure.pagination import paginate
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -119,6 +121,56 @@ class SlackClient:
             logger.error(error_message)
             return {"error": error_message}
 
+    def iter_conversations(self, types: str = "public_channel,private_channel", limit: int = 200) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all conversations (channels) in the Slack workspace, following the response cursors.
+
+        :param types: Conversation types to include (e.g., 'public_channel,private_channel').
+        :param limit: Number of channels fetched per page.
+        :return: Iterator over the channels.
+        :raises RuntimeError: If a page could not be retrieved.
+        """
+        def fetch_page(cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            try:
+                response = self.client.conversations_list(types=types, limit=limit, cursor=cursor)
+            except SlackApiError as e:
+                error_message = f"Error listing conversations: {e.response['error']}"
+                logger.error(error_message)
+                raise RuntimeError(error_message) from e
+            return response['channels'], self._next_cursor(response)
+
+        yield from paginate(fetch_page)
+
+    def iter_conversation_history(self, channel_id: str, limit: int = 200, oldest: Optional[str] = None,
+                                  latest: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over the message history of a conversation (channel), newest first, following the response cursors.
+
+        :param channel_id: The ID of the channel.
+        :param limit: Number of messages fetched per page.
+        :param oldest: Only messages after this Unix timestamp.
+        :param latest: Only messages before this Unix timestamp.
+        :return: Iterator over the messages.
+        :raises RuntimeError: If a page could not be retrieved.
+        """
+        def fetch_page(cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            try:
+                response = self.client.conversations_history(
+                    channel=channel_id, limit=limit, cursor=cursor, oldest=oldest, latest=latest
+                )
+            except SlackApiError as e:
+                error_message = f"Error retrieving conversation history: {e.response['error']}"
+                logger.error(error_message)
+                raise RuntimeError(error_message) from e
+            return response['messages'], self._next_cursor(response)
+
+        yield from paginate(fetch_page)
+
+    @staticmethod
+    def _next_cursor(response: Any) -> Optional[str]:
+        # Slack returns an empty cursor on the last page.
+        return (response.get('response_metadata') or {}).get('next_cursor') or None
+
     def join_conversation(self, channel_id: str) -> Union[Dict[str, Any], Dict[str, str]]:
         """
         Join a conversation (channel).
@@ -278,7 +330,7 @@ class SlackClient:
         """
         try:
             with open(file_path, 'rb') as file_data:
-                response = requests.post(upload_url, files={"file": file_data})
+                response = http_transport.post(upload_url, files={"file": file_data})
                 response.raise_for_status()
             logger.info(f"Uploaded file to {upload_url}")
             return {"status": "success"}
@@ -4,6 +4,7 @@ import os
 # from slack_sdk.errors import SlackApiError
 import logging
 import requests
+from infrastructure import http_transport
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -285,7 +286,7 @@ class SlackClient:
         """
         try:
             with open(file_path, 'rb') as file_data:
-                response = requests.post(upload_url, files={"file": file_data})
+                response = http_transport.post(upload_url, files={"file": file_data})
                 response.raise_for_status()
             logger.info(f"Uploaded file to {upload_url}")
             return {"status": "success"}
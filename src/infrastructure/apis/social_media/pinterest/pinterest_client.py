@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 import logging
 import os
 
@@ -17,7 +18,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/me/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info("Retrieved user info")
             return response.json()
@@ -31,7 +32,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/me/boards/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info("Retrieved user boards")
             return response.json()
@@ -51,7 +52,7 @@ class PinterestClient:
             "image_url": image_url
         }
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_transport.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             logger.info(f"Created pin on board {board_id}")
             return response.json()
@@ -65,7 +66,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/boards/{board_id}/pins/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Retrieved pins from board {board_id}")
             return response.json()
@@ -79,7 +80,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/me/analytics/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info("Retrieved analytics")
             return response.json()
@@ -95,7 +96,7 @@ class PinterestClient:
         try:
             with open(file_path, 'rb') as file:
                 files = {'media': file}
-                response = requests.post(upload_url, headers=self.headers, files=files)
+                response = http_transport.post(upload_url, headers=self.headers, files=files)
                 response.raise_for_status()
                 media_id = response.json().get('media_id')
                 logger.info(f"Uploaded media file '{file_path}' with media ID {media_id}")
@@ -110,7 +111,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/media/{media_id}/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Retrieved media info for media ID {media_id}")
             return response.json()
@@ -124,7 +125,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/me/following/boards/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info("Retrieved following boards")
             return response.json()
@@ -138,7 +139,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/me/following/users/"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info("Retrieved following users")
             return response.json()
@@ -152,7 +153,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/boards/{board_id}/follow/"
         try:
-            response = requests.post(endpoint, headers=self.headers)
+            response = http_transport.post(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Followed board {board_id}")
             return {"status": "Board followed"}
@@ -166,7 +167,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/boards/{board_id}/unfollow/"
         try:
-            response = requests.post(endpoint, headers=self.headers)
+            response = http_transport.post(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Unfollowed board {board_id}")
             return {"status": "Board unfollowed"}
@@ -180,7 +181,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/users/{user_id}/follow/"
         try:
-            response = requests.post(endpoint, headers=self.headers)
+            response = http_transport.post(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Followed user {user_id}")
             return {"status": "User followed"}
@@ -194,7 +195,7 @@ class PinterestClient:
         """
         endpoint = f"{self.base_url}/users/{user_id}/unfollow/"
         try:
-            response = requests.post(endpoint, headers=self.headers)
+            response = http_transport.post(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Unfollowed user {user_id}")
             return {"status": "User unfollowed"}
@@ -209,7 +210,7 @@ class PinterestClient:
         endpoint = f"{self.base_url}/pins/search/"
         params = {"query": query}
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = http_transport.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Retrieved pins for query '{query}'")
             return response.json()
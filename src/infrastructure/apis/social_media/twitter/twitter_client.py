@@ -1,4 +1,5 @@
 import requests
+from infrastructure import http_transport
 import logging
 import os
 
@@ -22,7 +23,7 @@ class TwitterClient:
         params = {"query": query, "max_results": max_results}
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = http_transport.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Retrieved {len(response.json().get('data', []))} tweets for query '{query}'")
             return response.json()
@@ -39,7 +40,7 @@ class TwitterClient:
         endpoint = f"{self.base_url}/users/by/username/{username}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Retrieved details for user '{username}'")
             return response.json()
@@ -56,7 +57,7 @@ class TwitterClient:
         endpoint = f"{self.base_url}/tweets/{tweet_id}/liking_users"
         
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             logger.info(f"Retrieved liking users for tweet ID '{tweet_id}'")
             return response.json()
@@ -74,7 +75,7 @@ class TwitterClient:
         params = {"id": woeid}
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = http_transport.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Retrieved trending topics for location ID '{woeid}'")
             return response.json()
@@ -92,7 +93,7 @@ class TwitterClient:
         payload = {"text": text}
         
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_transport.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             logger.info(f"Posted tweet with content '{text}'")
             return response.json()
@@ -110,7 +111,7 @@ class TwitterClient:
         try:
             with open(file_path, 'rb') as file:
                 files = {'media': file}
-                response = requests.post(upload_url, headers=self.headers, files=files)
+                response = http_transport.post(upload_url, headers=self.headers, files=files)
                 response.raise_for_status()
                 media_id = response.json().get('media_id_string')
                 logger.info(f"Uploaded media file '{file_path}' with media ID {media_id}")
@@ -134,7 +135,7 @@ class TwitterClient:
             "mode": mode
         }
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_transport.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             list_info = response.json()
             logger.info(f"Created list '{name}' with mode '{mode}'")
@@ -153,7 +154,7 @@ class TwitterClient:
         endpoint = f"{self.base_url}/lists/{list_id}/members"
         payload = {"user_id": user_id}
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_transport.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             logger.info(f"Added user {user_id} to list {list_id}")
             return {"status": "User added to list"}
@@ -169,7 +170,7 @@ class TwitterClient:
         """
         endpoint = f"{self.base_url}/lists/{list_id}/members"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             members = response.json()
             logger.info(f"Retrieved members for list {list_id}")
@@ -187,7 +188,7 @@ class TwitterClient:
         try:
             with open(file_path, 'rb') as file:
                 files = {'media': file}
-                response = requests.post(upload_url, headers=self.headers, files=files)
+                response = http_transport.post(upload_url, headers=self.headers, files=files)
                 response.raise_for_status()
                 media_id = response.json().get('media_id_string')
                 logger.info(f"Uploaded media file '{file_path}' with media ID {media_id}")
@@ -209,7 +210,7 @@ class TwitterClient:
             "alt_text": {"text": alt_text}
         }
         try:
-            response = requests.post(metadata_url, headers=self.headers, json=payload)
+            response = http_transport.post(metadata_url, headers=self.headers, json=payload)
             response.raise_for_status()
             logger.info(f"Added metadata to media with ID {media_id}")
             return {"status": "Metadata added"}
@@ -232,7 +233,7 @@ class TwitterClient:
             "mode": mode
         }
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = http_transport.post(endpoint, headers=self.headers, json=payload)
             response.raise_for_status()
             list_info = response.json()
             logger.info(f"Created list '{name}' with mode '{mode}'")
@@ -248,7 +249,7 @@ class TwitterClient:
         """
         endpoint = "https://api.twitter.com/1.1/lists/list.json"
         try:
-            response = requests.get(endpoint, headers=self.headers)
+            response = http_transport.get(endpoint, headers=self.headers)
             response.raise_for_status()
             lists = response.json()
             logger.info("Retrieved user lists")
@@ -266,7 +267,7 @@ class TwitterClient:
         endpoint = f"https://api.twitter.com/1.1/lists/members.json"
         params = {"list_id": list_id}
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = http_transport.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             members = response.json()
             logger.info(f"Retrieved members for list {list_id}")
@@ -285,7 +286,7 @@ class TwitterClient:
         endpoint = f"https://api.twitter.com/1.1/lists/members/create.json"
         params = {"list_id": list_id, "user_id": user_id}
         try:
-            response = requests.post(endpoint, headers=self.headers, params=params)
+            response = http_transport.post(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Added user {user_id} to list {list_id}")
             return {"status": "User added to list"}
@@ -303,7 +304,7 @@ class TwitterClient:
         endpoint = f"https://api.twitter.com/1.1/lists/members/destroy.json"
         params = {"list_id": list_id, "user_id": user_id}
         try:
-            response = requests.post(endpoint, headers=self.headers, params=params)
+            response = http_transport.post(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Removed user {user_id} from list {list_id}")
             return {"status": "User removed from list"}
@@ -320,7 +321,7 @@ class TwitterClient:
         endpoint = f"https://api.twitter.com/1.1/lists/show.json"
         params = {"list_id": list_id}
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = http_transport.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
             list_info = response.json()
             logger.info(f"Retrieved details for list {list_id}")
@@ -1,7 +1,10 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 from typing import Any, Dict, List
-import requests
+from infrastructure import http_transport
+from infrastructure.async_http_transport import gather_items, get_async_http_transport
+import threading
 import time
 from functools import wraps
 from flask import current_app
@@ -331,7 +334,7 @@ class SpotifyAPI:
 
         url = "https://accounts.spotify.com/api/token"
 
-        response = requests.post(
+        response = http_transport.post(
             url,
             data={
                 "grant_type": "client_credentials",
@@ -352,8 +355,8 @@ class SpotifyAPI:
         def wrapper(self, *args, **kwargs):
             if self.access_token is None or time.time() > self.token_expires:
                 self.__refresh_access_token()
-                func_call_result = func(self, *args, **kwargs) # type: ignore
-                return func_call_result
+            func_call_result = func(self, *args, **kwargs) # type: ignore
+            return func_call_result
 
         return wrapper
 
@@ -373,7 +376,7 @@ class SpotifyAPI:
         url = f"{self.BASE_URL}/{endpoint}"
 
         try:
-            response = requests.get(
+            response = http_transport.get(
                 url,
                 params=params,
                 headers={"Authorization": f"{self.token_type} {self.access_token}"},
@@ -385,6 +388,83 @@ class SpotifyAPI:
             return {"error": str(e)}
 
 
+class AsyncSpotifyAPI(SpotifyAPI):
+    """Async variant of SpotifyAPI: every endpoint has the same name and arguments and returns an
+    awaitable. Requests go through the async HTTP transport of the running event loop.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._token_lock = threading.Lock()
+
+    def __refresh_expired_token(self) -> None:
+        # Concurrent requests share one refresh instead of each requesting a token.
+        with self._token_lock:
+            if self.access_token is None or time.time() > self.token_expires:
+                self._SpotifyAPI__refresh_access_token()
+
+    async def _SpotifyAPI__make_get_request(self, endpoint: str, params: Dict) -> Dict[str, Any]:
+        url = f"{self.BASE_URL}/{endpoint}"
+
+        try:
+            if self.access_token is None or time.time() > self.token_expires:
+                await asyncio.to_thread(self.__refresh_expired_token)
+            response = await get_async_http_transport().get(
+                url,
+                params=params,
+                headers={"Authorization": f"{self.token_type} {self.access_token}"},
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            current_app.logger.error(f"Error making Spotify API call: {e}")
+            return {"error": str(e)}
+
+    async def get_artists_top_tracks(
+        self, artist_ids: List[str], market: str = "US", concurrency: int = None
+    ) -> List[Dict[str, Any]]:
+        """Get the top tracks of several artists, with at most `concurrency` requests in flight.
+
+        :param artist_ids: The Spotify IDs of the artists.
+        :type artist_ids: List[str]
+
+        :param market: The market to get the top tracks from.
+        :type market: str
+
+        :param concurrency: The maximum number of artists fetched at once.
+        :type concurrency: int
+
+        :return: The response data of every artist, in the order of their IDs.
+        :rtype: List[Dict[str, Any]]
+        """
+        return await gather_items(
+            (self.get_artist_top_tracks(artist_id, market) for artist_id in artist_ids), concurrency
+        )
+
+    async def get_albums_tracks(
+        self, album_ids: List[str], market: str = "US", limit: int = 10, concurrency: int = None
+    ) -> List[Dict[str, Any]]:
+        """Get the tracks of several albums, with at most `concurrency` requests in flight.
+
+        :param album_ids: The Spotify IDs of the albums.
+        :type album_ids: List[str]
+
+        :param market: The market to get the albums from.
+        :type market: str
+
+        :param limit: The number of tracks to return per album.
+        :type limit: int
+
+        :param concurrency: The maximum number of albums fetched at once.
+        :type concurrency: int
+
+        :return: The response data of every album, in the order of their IDs.
+        :rtype: List[Dict[str, Any]]
+        """
+        return await gather_items(
+            (self.get_album_tracks(album_id, market, limit) for album_id in album_ids), concurrency
+        )
+
 # Example Usage of the Spotify API
 if __name__ == "__main__":
     # put client id and client secret here, or set them as environment variables
@@ -30,9 +30,10 @@ Parameters for API methods:
     """
 
 from flask import request, jsonify, Blueprint
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 
-import requests
+from infrastructure import http_transport
+from infrastructure.pagination import page_items, paginate_by_page_number
 
 # from backend.src.interfaces.infrastructure_interfaces.api_interfaces.statista_api_interface import IStatistaAPI
 
@@ -73,7 +74,7 @@ class StatistaAPI:
 
         # Send the GET request
         url = f'{self.base_url}/statistics'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             # Successful request
@@ -85,13 +86,23 @@ class StatistaAPI:
             print(response.text)
             return None
         
+    def iter_statistics(self, query: Optional[str] = None, limit: int = 20, platform: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, premium: Optional[int] = None, industry: Optional[int] = None, geolocation: Optional[int] = None, sort: int = SortOptions.RELEVANCE) -> Iterator[Dict[str, Any]]:
+        # Lazily iterates over the statistics of every page, with `limit` statistics per page
+        def fetch_page(page: int):
+            data = self.get_statistics(query=query, limit=limit, platform=platform, date_from=date_from, date_to=date_to, premium=premium, industry=industry, geolocation=geolocation, sort=sort, page=page)
+            if data is None:
+                raise RuntimeError(f"Failed to fetch page {page} of the statistics")
+            return page_items(data)
+
+        yield from paginate_by_page_number(fetch_page, limit)
+
     def get_statistics_by_id(self, stat_id: int) -> Optional[Dict[str, Any]]:
         params = {
             'id': stat_id
         }
 
         url = f'{self.base_url}/statistics/{id}'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -119,7 +130,7 @@ class StatistaAPI:
         params = {k: v for k, v in params.items() if v is not None}
 
         url = f'{self.base_url}/infographics'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -135,7 +146,7 @@ class StatistaAPI:
         }
 
         url = f'{self.base_url}/infographics/{id}'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -163,7 +174,7 @@ class StatistaAPI:
         params = {k: v for k, v in params.items() if v is not None}
 
         url = f'{self.base_url}/studies'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -179,7 +190,7 @@ class StatistaAPI:
         }
 
         url = f'{self.base_url}/studies/{id}'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -205,7 +216,7 @@ class StatistaAPI:
         params = {k: v for k, v in params.items() if v is not None}
         
         url = f'{self.base_url}/marketinsights'
-        response = requests.get(url, headers=self.headers, params=params)
+        response = http_transport.get(url, headers=self.headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
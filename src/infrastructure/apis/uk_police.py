@@ -1,5 +1,7 @@
 import requests
+from infrastructure import http_transport
 import logging
+from infrastructure.response_cache import cached_endpoint
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,7 +17,7 @@ class UKPoliceClient:
         """
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_transport.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             logger.info(f"Successfully fetched data from {endpoint}")
             return response.json()
@@ -135,6 +137,7 @@ class UKPoliceClient:
             params['date'] = date
         return self._get("stops-no-location", params)
 
+    @cached_endpoint(ttl=24 * 60 * 60)
     def get_forces(self):
         """
         Retrieve a list of all police forces available via the API.
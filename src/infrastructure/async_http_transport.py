@@ -0,0 +1,167 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Coroutine, Iterable, List
+
+import httpx
+
+from infrastructure.http_transport import RateLimitExceeded
+from infrastructure.rate_limiter import RateLimiter, get_rate_limiter, jittered_backoff, parse_retry_after
+
+
+class AsyncHttpTransport:
+    """
+    asyncio counterpart of HttpTransport, used by the async variants of the API clients to fan out
+    many requests to the same host over a few pooled connections. It applies the same default
+    timeout, retries and per host and credential rate limits. HTTP/2 is used when the h2 package is
+    installed, so concurrent requests to a host are multiplexed over a single connection.
+
+    The underlying httpx.AsyncClient is bound to the event loop it is created on; use
+    get_async_http_transport, which keeps one transport per loop.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+    IDEMPOTENT_METHODS = frozenset(["HEAD", "GET", "PUT", "DELETE", "OPTIONS"])
+
+    def __init__(self, timeout: float = None, max_retries: int = None, max_connections: int = None,
+                 http2: bool = None):
+        self.timeout = timeout if timeout is not None else float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self.rate_limit_wait = float(os.getenv("HTTP_RATE_LIMIT_WAIT_SECONDS", "60"))
+        if http2 is None:
+            http2 = (os.getenv("HTTP_ASYNC_HTTP2", "true").lower() not in ("0", "false", "no")
+                     and importlib.util.find_spec("h2") is not None)
+        max_connections = max_connections or int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            # The transport retries requests that failed to connect; responses are retried in request.
+            transport=httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                retries=self.max_retries,
+            ),
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request, with the same arguments as httpx.AsyncClient.request. Waits for a slot of the
+        host's rate limit, retries 429 responses after their Retry-After or a jittered backoff, and
+        retries idempotent requests on 502, 503 and 504 responses.
+        """
+        limiter = get_rate_limiter()
+        key = RateLimiter.key_for(url, kwargs.get("params"), kwargs.get("headers"))
+        for attempt in range(self.max_retries + 1):
+            if limiter is not None:
+                await self._acquire(limiter, key)
+            response = await self.client.request(method, url, **kwargs)
+            delay = limiter.observe(key, response) if limiter is not None else parse_retry_after(
+                response.headers.get("Retry-After"))
+            retryable = response.status_code == 429 or (
+                response.status_code in self.RETRY_STATUSES and method.upper() in self.IDEMPOTENT_METHODS)
+            if not retryable or attempt == self.max_retries:
+                return response
+
+            if delay is None:
+                delay = jittered_backoff(attempt)
+                if limiter is not None and response.status_code == 429:
+                    limiter.bucket(key).pause(delay)
+            print(f"Received {response.status_code} from {key[0]}, retrying in {delay:.1f}s")
+            if limiter is None or response.status_code != 429:
+                await asyncio.sleep(delay)
+        return response
+
+    async def _acquire(self, limiter: RateLimiter, key) -> None:
+        # Polls the shared token bucket instead of blocking in it, so waiting requests do not hold
+        # threads and the event loop keeps serving the requests of other hosts.
+        deadline = time.monotonic() + self.rate_limit_wait
+        while not limiter.acquire(key, 0):
+            if time.monotonic() >= deadline:
+                raise RateLimitExceeded(
+                    f"No request slot for {key[0]} within {self.rate_limit_wait} seconds, its rate limit is exhausted")
+            await asyncio.sleep(0.05)
+
+    async def get(self, url: str, params=None, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, params=params, **kwargs)
+
+    async def post(self, url: str, data=None, json=None, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, data=data, json=json, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpTransport]" = weakref.WeakKeyDictionary()
+_transports_lock = threading.Lock()
+
+
+def get_async_http_transport() -> AsyncHttpTransport:
+    """
+    Returns the async HTTP transport of the running event loop, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    with _transports_lock:
+        transport = _transports.get(loop)
+        if transport is None:
+            transport = AsyncHttpTransport()
+            _transports[loop] = transport
+        return transport
+
+
+async def close_async_http_transport() -> None:
+    """Closes the async HTTP transport of the running event loop, if it has one."""
+    with _transports_lock:
+        transport = _transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.aclose()
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[Any]], concurrency: int = None,
+                         return_exceptions: bool = False) -> List[Any]:
+    """
+    Awaits the given awaitables with at most `concurrency` of them running at once, defaulting to
+    HTTP_ASYNC_MAX_CONCURRENCY.
+
+    :return: Their results, in the order of the awaitables.
+    """
+    semaphore = asyncio.Semaphore(concurrency or int(os.getenv("HTTP_ASYNC_MAX_CONCURRENCY", "20")))
+
+    async def bounded(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(bounded(awaitable) for awaitable in awaitables),
+                                return_exceptions=return_exceptions)
+
+
+async def gather_items(awaitables: Iterable[Awaitable[Any]], concurrency: int = None) -> List[Any]:
+    """
+    gather_bounded for the bulk helpers of the API clients: an awaitable that fails returns
+    {"error": message} in its place instead of failing the whole batch.
+    """
+    results = await gather_bounded(awaitables, concurrency, return_exceptions=True)
+    return [{"error": str(result)} if isinstance(result, Exception) else result for result in results]
+
+
+def run_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Runs a coroutine of the async API clients from synchronous code and returns its result. The
+    coroutine gets its own event loop, in a separate thread when the caller already runs one, and
+    the connections it opened are closed once it is done.
+    """
+    async def run() -> Any:
+        try:
+            return await coroutine
+        finally:
+            await close_async_http_transport()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run()).result()
@@ -0,0 +1,13 @@
+import os
+
+
+def data_path(filename: str) -> str:
+    """
+    Returns the default path of a local data file, such as the SQLite stores of the caches and the job
+    queue, in the directory set by DATA_DIR (~/.ai_orchestration by default). Keeping them out of the
+    working directory keeps them out of the source tree; the directory is created readable by the
+    current user only, since some stores hold API responses.
+    """
+    directory = os.path.expanduser(os.getenv("DATA_DIR") or os.path.join("~", ".ai_orchestration"))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return os.path.join(directory, filename)
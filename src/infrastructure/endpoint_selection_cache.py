@@ -0,0 +1,142 @@
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from infrastructure.data_dir import data_path
+
+
+def api_method_set_version(api_instance: Any) -> str:
+    """
+    Fingerprints the public methods of an API client and their signatures. Adding, removing or
+    changing an endpoint changes the version, which invalidates the selections cached for that API.
+    """
+    methods = []
+    for method_name, method in inspect.getmembers(type(api_instance), predicate=callable):
+        if method_name.startswith("_"):
+            continue
+        try:
+            signature = str(inspect.signature(method))
+        except (TypeError, ValueError):
+            signature = ""
+        methods.append(f"{method_name}{signature}")
+    return hashlib.sha256("\n".join(sorted(methods)).encode("utf-8")).hexdigest()[:16]
+
+
+class EndpointSelectionCache:
+    """
+    Persistent cache of the endpoint selected for a step of a module, keyed by the step text and the
+    API name. Recurring workstreams run the same steps against the same APIs on every schedule, so
+    a hit skips the function map reflection and the LLM call of API_Utils.select_endpoint.
+    Only confident selections are stored, and entries recorded for another version of the API's
+    method set are ignored.
+    """
+
+    def __init__(self, path: str, min_confidence: float = 0.85):
+        self.path = path
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0}
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS endpoint_selections ("
+                "step TEXT NOT NULL, api_name TEXT NOT NULL, api_version TEXT NOT NULL, "
+                "endpoint_name TEXT NOT NULL, parameters TEXT NOT NULL, confidence REAL NOT NULL, "
+                "score_reason TEXT, created_at REAL NOT NULL, PRIMARY KEY (step, api_name))"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def _normalize_step(step: str) -> str:
+        return " ".join(step.split()).lower()
+
+    def get(self, step: str, api_name: str, api_version: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: The cached selection, a dict with endpoint_name, parameters, confidence and score_reason,
+                 or None when there is none for this version of the API.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT api_version, endpoint_name, parameters, confidence, score_reason "
+                "FROM endpoint_selections WHERE step = ? AND api_name = ?",
+                (self._normalize_step(step), api_name),
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            if row[0] != api_version:
+                self._stats["stale"] += 1
+                return None
+            self._stats["hits"] += 1
+        return {
+            "endpoint_name": row[1],
+            "parameters": json.loads(row[2]),
+            "confidence": row[3],
+            "score_reason": row[4],
+        }
+
+    def set(self, step: str, api_name: str, api_version: str, endpoint_name: str,
+            parameters: List[str], confidence: float, score_reason: str = None) -> bool:
+        """
+        Stores a selection if its confidence reaches min_confidence.
+
+        :return: Whether the selection was stored.
+        """
+        if confidence is None or confidence < self.min_confidence:
+            return False
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO endpoint_selections "
+                "(step, api_name, api_version, endpoint_name, parameters, confidence, score_reason, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._normalize_step(step), api_name, api_version, endpoint_name,
+                 json.dumps(parameters), confidence, score_reason, time.time()),
+            )
+            self._connection.commit()
+            self._stats["stores"] += 1
+        return True
+
+    def invalidate(self, step: str, api_name: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM endpoint_selections WHERE step = ? AND api_name = ?",
+                (self._normalize_step(step), api_name),
+            )
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_default_cache: Optional[EndpointSelectionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_endpoint_selection_cache() -> Optional[EndpointSelectionCache]:
+    """
+    Returns the process-wide endpoint selection cache stored at ENDPOINT_CACHE_SQLITE_PATH
+    (endpoint_selection_cache.sqlite3 in the data directory by default, see data_path), or None
+    when ENDPOINT_CACHE_ENABLED is set to false.
+    """
+    global _default_cache
+    if os.getenv("ENDPOINT_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is not None:
+        return _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EndpointSelectionCache(
+                os.getenv("ENDPOINT_CACHE_SQLITE_PATH") or data_path("endpoint_selection_cache.sqlite3"),
+                min_confidence=float(os.getenv("ENDPOINT_CACHE_MIN_CONFIDENCE", "0.85")),
+            )
+        return _default_cache
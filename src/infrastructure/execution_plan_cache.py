@@ -0,0 +1,168 @@
+import hashlib
+import inspect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from infrastructure.data_dir import data_path
+
+
+# Names of parameters whose value depends on the run when the arguments were not flagged as they were
+# generated: time windows, which move with every run, and the content a step writes, which is generated
+# from what the run fetched. Names are matched whole, after converting camelCase to snake_case.
+RUN_DEPENDENT_PARAMETER_NAMES = frozenset([
+    "date", "time", "timestamp", "since", "until", "before", "after", "start", "end",
+    "start_date", "end_date", "from_date", "to_date", "date_from", "date_to", "start_time", "end_time",
+    "period", "window", "days", "oldest", "latest",
+    "text", "message", "body", "content", "subject", "title", "caption", "comment", "description",
+    "post", "tweet", "summary", "note",
+])
+_DATE_VALUE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def is_run_dependent_argument(name: str, value: Any) -> bool:
+    """
+    Guesses from its name and value whether an argument depends on the run: a known time window or
+    written content parameter, or a date.
+    """
+    snake_name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).lower()
+    return snake_name in RUN_DEPENDENT_PARAMETER_NAMES or (
+        isinstance(value, str) and bool(_DATE_VALUE_PATTERN.match(value)))
+
+
+def split_plan_arguments(function: Callable[..., Any], arguments: Dict[str, Any],
+                         run_dependent: List[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Splits the arguments a step was called with into those a replay can reuse and those it must
+    generate again. Arguments equal to the parameter's default are reused. Of the others, the ones
+    flagged as run dependent when they were generated are generated again; without flags, the ones
+    is_run_dependent_argument picks are.
+
+    :param function: The endpoint the arguments were passed to.
+    :param arguments: The arguments, by parameter name.
+    :param run_dependent: The names of the arguments flagged as depending on the run, or None.
+    :return: The reusable arguments and the names of the parameters to generate again.
+    """
+    try:
+        defaults = {name: parameter.default for name, parameter in inspect.signature(function).parameters.items()
+                    if parameter.default is not inspect.Parameter.empty}
+    except (TypeError, ValueError):
+        defaults = {}
+
+    static, regenerate = {}, []
+    for name, value in arguments.items():
+        if name in defaults and defaults[name] == value:
+            static[name] = value
+        elif (name in run_dependent) if run_dependent is not None else is_run_dependent_argument(name, value):
+            regenerate.append(name)
+        else:
+            static[name] = value
+    return static, regenerate
+
+
+class ExecutionPlanCache:
+    """
+    Persistent store of the compiled execution plans of modules. A plan is what planning a module
+    produced: its steps, the endpoint chosen for every step and the arguments resolved for it. Scheduled
+    workstreams run the same modules on every run, so a stored plan is replayed with plain API calls
+    instead of generating steps and selecting endpoints again. Only the arguments that do not depend
+    on the run are reused; the ones flagged as run dependent when they were generated, such as time
+    windows and written content, are generated again on every replay, see split_plan_arguments.
+
+    Plans are keyed by a hash of the agent, the module text and its API set, so changing any of them
+    makes the next run plan again. A plan also records the method set version of every API it calls,
+    see api_method_set_version, and is ignored once one of those APIs changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS execution_plans ("
+                "plan_hash TEXT PRIMARY KEY, plan TEXT NOT NULL, created_at REAL NOT NULL, "
+                "replays INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def plan_hash(agent_id: str, module: str, apis: List[str]) -> str:
+        key = {"agent_id": agent_id, "module": " ".join((module or "").split()), "apis": sorted(apis or [])}
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    def get(self, plan_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: The stored plan, a dict with plan_hash, steps, dependencies, calls and api_versions, or None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT plan FROM execution_plans WHERE plan_hash = ?", (plan_hash,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, plan_hash: str, steps: Dict[str, str], calls: Dict[str, Dict[str, Any]],
+            api_versions: Dict[str, str], dependencies: Dict[str, List[str]] = None) -> Dict[str, Any]:
+        """
+        Stores the plan of a module.
+
+        :param steps: The steps of the module, step names to API names.
+        :param calls: For every step, the call that completed it: a dict with api_name, endpoint_name,
+                      arguments, regenerate and confidence. arguments holds the reusable arguments and
+                      regenerate the names of the parameters generated again on replay, see
+                      split_plan_arguments.
+        :param api_versions: The method set version of every API the plan calls.
+        :param dependencies: The steps every step depends on, see StepExecutionEngine. None runs them in order.
+        :return: The stored plan.
+        """
+        plan = {"plan_hash": plan_hash, "steps": steps, "dependencies": dependencies, "calls": calls,
+                "api_versions": api_versions}
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO execution_plans (plan_hash, plan, created_at) VALUES (?, ?, ?)",
+                (plan_hash, json.dumps(plan, default=str), time.time()),
+            )
+            self._connection.commit()
+        return plan
+
+    def record_replay(self, plan_hash: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE execution_plans SET replays = replays + 1 WHERE plan_hash = ?", (plan_hash,)
+            )
+            self._connection.commit()
+
+    def invalidate(self, plan_hash: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM execution_plans WHERE plan_hash = ?", (plan_hash,))
+            self._connection.commit()
+
+
+_default_cache: Optional[ExecutionPlanCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_execution_plan_cache() -> Optional[ExecutionPlanCache]:
+    """
+    Returns the process-wide execution plan cache stored at EXECUTION_PLAN_SQLITE_PATH
+    (execution_plans.sqlite3 in the data directory by default, see data_path), or None when
+    EXECUTION_PLAN_CACHE_ENABLED is set to false.
+    """
+    global _default_cache
+    if os.getenv("EXECUTION_PLAN_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is not None:
+        return _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExecutionPlanCache(
+                os.getenv("EXECUTION_PLAN_SQLITE_PATH") or data_path("execution_plans.sqlite3"))
+        return _default_cache
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from infrastructure.rate_limiter import RateLimiter, get_rate_limiter, jittered_backoff, parse_retry_after
+from infrastructure.response_cache import active_cache_policy, get_response_cache
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when a request cannot be sent before its host's rate limit frees up a slot."""
+
+
+class HttpTransport:
+    """
+    HTTP transport shared by the API clients. One requests.Session keeps a pool of keep-alive
+    connections per host, so the many calls a module execution makes to the same few hosts reuse
+    their TCP and TLS connections instead of opening new ones. Every request gets a default timeout,
+    and idempotent requests are retried on connection errors and on 502, 503 and 504 responses
+    with exponential backoff, honouring Retry-After.
+
+    Requests are rate limited per host and credential by the process-wide RateLimiter. A 429
+    response pauses the host's requests for its Retry-After, or a jittered exponential backoff
+    without one, and the request is retried once a slot frees up.
+
+    Cookies are not kept between requests, since the session is shared by clients and tenants.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, timeout: float = None, max_retries: int = None, backoff_factor: float = None,
+                 pool_connections: int = None, pool_maxsize: int = None):
+        self.timeout = timeout if timeout is not None else float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self.rate_limit_wait = float(os.getenv("HTTP_RATE_LIMIT_WAIT_SECONDS", "60"))
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=backoff_factor if backoff_factor is not None else float(os.getenv("HTTP_RETRY_BACKOFF", "0.5")),
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["HEAD", "GET", "PUT", "DELETE", "OPTIONS"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or int(os.getenv("HTTP_POOL_CONNECTIONS", "32")),
+            pool_maxsize=pool_maxsize or int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request, with the same arguments as requests.request. The default timeout applies
+        when no timeout is given. GET requests made by an endpoint declared with cached_endpoint are
+        served from the response cache.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        policy = active_cache_policy()
+        if policy is not None and method.upper() == "GET":
+            cache = get_response_cache()
+            if cache is not None:
+                return cache.fetch(lambda url, **kwargs: self._send(method, url, **kwargs), url, policy, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        limiter = get_rate_limiter()
+        key = RateLimiter.key_for(url, kwargs.get("params"), kwargs.get("headers"))
+        for attempt in range(self.max_retries + 1):
+            if limiter is not None and not limiter.acquire(key, self.rate_limit_wait):
+                raise RateLimitExceeded(
+                    f"No request slot for {key[0]} within {self.rate_limit_wait} seconds, its rate limit is exhausted")
+            response = self.session.request(method, url, **kwargs)
+            delay = limiter.observe(key, response) if limiter is not None else parse_retry_after(
+                response.headers.get("Retry-After"))
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+
+            if delay is None:
+                delay = jittered_backoff(attempt)
+                if limiter is not None:
+                    limiter.bucket(key).pause(delay)
+            print(f"Received 429 from {key[0]}, retrying in {delay:.1f}s")
+            if limiter is None:
+                time.sleep(delay)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    """
+    Returns the process-wide HTTP transport, configured from HTTP_TIMEOUT_SECONDS, HTTP_MAX_RETRIES,
+    HTTP_RETRY_BACKOFF, HTTP_POOL_CONNECTIONS and HTTP_POOL_MAXSIZE.
+    """
+    global _default_transport
+    if _default_transport is not None:
+        return _default_transport
+
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
+
+
+# Drop-in replacements for the module-level functions of requests, sending through the shared transport.
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return get_http_transport().request(method, url, **kwargs)
+
+
+def get(url: str, params=None, **kwargs) -> requests.Response:
+    return get_http_transport().request("GET", url, params=params, **kwargs)
+
+
+def post(url: str, data=None, json=None, **kwargs) -> requests.Response:
+    return get_http_transport().request("POST", url, data=data, json=json, **kwargs)
+
+
+def put(url: str, data=None, **kwargs) -> requests.Response:
+    return get_http_transport().request("PUT", url, data=data, **kwargs)
+
+
+def patch(url: str, data=None, **kwargs) -> requests.Response:
+    return get_http_transport().request("PATCH", url, data=data, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return get_http_transport().request("DELETE", url, **kwargs)
@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from infrastructure.data_dir import data_path
+
+
+class SQLiteJobStore:
+    """
+    Local store for background jobs. Keeps the status, partial results and final result of every
+    job in a SQLite file, so job state is shared by the workers of an instance and needs no cloud service.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # Several worker processes may share the file, so writers wait for each other instead of failing.
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "progress TEXT NOT NULL DEFAULT '{}', result TEXT, error TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, "
+                "created_at REAL NOT NULL, event TEXT NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS job_events_job_id ON job_events (job_id, seq)")
+            self._connection.commit()
+
+    def create(self, job_id: str, kind: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO jobs (id, kind, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, kind, now, now),
+            )
+            self._connection.commit()
+
+    def set_status(self, job_id: str, status: str, result: Any = None, error: str = None) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+            self._connection.commit()
+
+    def update_progress(self, job_id: str, key: str, value: Any) -> None:
+        """
+        Records a partial result of a running job under the given key.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            progress = json.loads(row[0])
+            progress[key] = value
+            self._connection.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress, default=str), time.time(), job_id),
+            )
+            self._connection.commit()
+
+    def add_event(self, job_id: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO job_events (job_id, created_at, event) VALUES (?, ?, ?)",
+                (job_id, time.time(), json.dumps(event, default=str)),
+            )
+            self._connection.commit()
+
+    def get_events(self, job_id: str, after_seq: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Returns the events of a job recorded after the given sequence number, oldest first.
+
+        :return: A list of (sequence number, event) tuples.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq),
+            ).fetchall()
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, kind, status, created_at, updated_at, progress, result, error FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "created_at": row[3],
+            "updated_at": row[4],
+            "progress": json.loads(row[5]),
+            "result": json.loads(row[6]) if row[6] is not None else None,
+            "error": row[7],
+        }
+
+    def fail_stale(self, error: str, stale_after: float) -> int:
+        """
+        Marks the queued or running jobs that made no progress for stale_after seconds as failed,
+        which is what jobs left behind by a stopped process look like.
+
+        :return: The number of jobs marked as failed.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+                "WHERE status IN ('queued', 'running') AND updated_at < ?",
+                (error, now, now - stale_after),
+            )
+            self._connection.commit()
+            return cursor.rowcount
+
+
+class JobProgress:
+    """
+    Handed to a running job to publish what it has done so far. update() replaces a partial result
+    returned by the job status, emit() appends an event to the job's event stream.
+    """
+
+    def __init__(self, store: SQLiteJobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def update(self, key: str, value: Any) -> None:
+        self.store.update_progress(self.job_id, key, value)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        self.store.add_event(self.job_id, event)
+
+
+class JobQueue:
+    """
+    Runs long jobs on a bounded worker pool outside of the request that submitted them.
+    A job function receives a JobProgress as its first argument to publish partial results and
+    events while it runs. Its return value is stored as the result of the job. Every job's event
+    stream starts with a "started" event and ends with a "completed" or "failed" event.
+    """
+
+    def __init__(self, store: SQLiteJobStore, max_workers: int = None):
+        self.store = store
+        self.max_workers = max_workers or int(os.getenv("AGENT_JOB_WORKERS", "4"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+
+    FINAL_STATUSES = ("completed", "failed")
+
+    def submit(self, kind: str, func: Callable[..., Any], *args) -> str:
+        """
+        Queues func(progress, *args) and returns the ID of the new job.
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, kind)
+        self._executor.submit(self._run, job_id, func, *args)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def get_events(self, job_id: str, after_seq: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        return self.store.get_events(job_id, after_seq)
+
+    def _run(self, job_id: str, func: Callable[..., Any], *args) -> None:
+        progress = JobProgress(self.store, job_id)
+        started_at = time.perf_counter()
+        self.store.set_status(job_id, "running")
+        progress.emit({"type": "started"})
+        try:
+            result = func(progress, *args)
+            # The final event is recorded before the status, so a reader that sees a final status
+            # is guaranteed to find the final event too.
+            progress.emit({"type": "completed", "duration": time.perf_counter() - started_at})
+            self.store.set_status(job_id, "completed", result=result)
+        except Exception as e:
+            print(f"Job {job_id} failed: {str(e)}")
+            progress.emit({"type": "failed", "error": str(e), "duration": time.perf_counter() - started_at})
+            self.store.set_status(job_id, "failed", error=str(e))
+
+
+_default_queue: Optional[JobQueue] = None
+_default_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Returns the process-wide job queue, backed by the SQLite file at AGENT_JOB_SQLITE_PATH
+    (agent_jobs.sqlite3 in the data directory by default, see data_path).
+    Jobs that made no progress for AGENT_JOB_STALE_SECONDS, typically because the process running
+    them stopped, are marked as failed.
+    """
+    global _default_queue
+    if _default_queue is not None:
+        return _default_queue
+
+    with _default_queue_lock:
+        if _default_queue is None:
+            store = SQLiteJobStore(os.getenv("AGENT_JOB_SQLITE_PATH") or data_path("agent_jobs.sqlite3"))
+            store.fail_stale("Interrupted before completion", float(os.getenv("AGENT_JOB_STALE_SECONDS", "3600")))
+            _default_queue = JobQueue(store)
+        return _default_queue
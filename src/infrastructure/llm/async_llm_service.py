@@ -0,0 +1,366 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import google.generativeai as genai
+import openai
+
+from infrastructure.api_signature_index import get_api_signature_index
+from infrastructure.llm.llm_client_registry import openai_connection_limits
+from infrastructure.llm.llm_response_cache import (LLMResponseCache, get_llm_response_cache, is_valid_json_response,
+                                                   llm_cache_refreshing)
+from infrastructure.llm.open_ai_llm import (branch_scores_prompt, endpoint_score_prompt, parameter_details_prompt,
+                                            parameters_prompt, parse_branch_scores, parse_endpoint_score,
+                                            parse_parameter_details, scored_parameters_prompt)
+from infrastructure.llm.open_ai_schemas import api_tree_schema, branch_scores_schema
+from infrastructure.parameter_schema_cache import get_parameter_schema_cache
+
+
+class AsyncOpenAiLLMService:
+    """
+    asyncio counterpart of OpenAiLLMService. Every request goes through a semaphore so at most
+    max_concurrency completions are in flight, which lets callers fan out independent prompts
+    without spawning threads or tripping the upstream rate limits.
+
+    The underlying AsyncOpenAI client is bound to the event loop it is first used on, so create
+    one service per loop (e.g. inside the coroutine passed to asyncio.run). As in OpenAiLLMService,
+    only the prompts passing use_cache=True go through the response cache. The response and
+    parameter schema caches are read and written on worker threads, so their SQLite tiers do not
+    block the loop.
+    """
+
+    def __init__(self, model_name: str, api_key=None, max_concurrency: int = None,
+                 client: openai.AsyncOpenAI = None, cache: LLMResponseCache = None):
+        self.model_name = model_name
+        self.client = client or openai.AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            timeout=float(os.getenv("OPENAI_TIMEOUT", "120")),
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+            http_client=openai.DefaultAsyncHttpxClient(limits=openai_connection_limits()),
+        )
+        self.cache = cache if cache is not None else get_llm_response_cache()
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._function_schemas: Dict[Tuple[str, tuple], dict] = {}
+
+    async def generate_content_with_Structured_schema(self,
+                                                      system_instruction: str,
+                                                      query: str,
+                                                      response_schema,
+                                                      use_cache: bool = False):
+        messages = [{
+            "role": "system",
+            "content": system_instruction
+        }, {
+            "role": "user",
+            "content": query
+        }]
+
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = self.cache.make_key(self.model_name, messages, response_schema)
+            cached = await asyncio.to_thread(self.cache.get, cache_key) if not llm_cache_refreshing() else None
+            if cached is not None:
+                return response_schema.model_validate_json(cached)
+
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            completion = await self.client.beta.chat.completions.parse(
+                model=self.model_name,
+                messages=messages,
+                response_format=response_schema)
+
+        parsed = completion.choices[0].message.parsed
+        if cache_key is not None and parsed is not None:
+            await asyncio.to_thread(self.cache.set, cache_key, parsed.model_dump_json(),
+                                    tokens=self._total_tokens(completion),
+                                    latency=time.perf_counter() - started_at)
+        return parsed
+
+    async def generate_content_with_json_format(self,
+                                                system_instruction: str,
+                                                query: str, response_schema: dict,
+                                                use_cache: bool = False):
+        messages = [{
+            "role": "system",
+            "content": system_instruction
+        }, {
+            "role": "user",
+            "content": query
+        }]
+        model = "gpt-4o-2024-08-06"
+
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = self.cache.make_key(model, messages, response_schema)
+            cached = await asyncio.to_thread(self.cache.get, cache_key) if not llm_cache_refreshing() else None
+            if cached is not None:
+                return cached
+
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            completion = await self.client.chat.completions.create(
+                model=model, messages=messages, response_format=response_schema)
+
+        content = completion.choices[0].message.content
+        # Only answers that parse and match the schema are cached, so a truncated or off-schema
+        # answer is not handed back to the retries of the caller that rejects it.
+        if cache_key is not None and content and is_valid_json_response(content, response_schema):
+            await asyncio.to_thread(self.cache.set, cache_key, content,
+                                    tokens=self._total_tokens(completion),
+                                    latency=time.perf_counter() - started_at)
+        return content
+
+    async def generate_content_with_tools(self, query, tools):
+        try:
+            messages = [{
+                "role": "system",
+                "content": ""
+            }, {
+                "role": "user",
+                "content": query
+            }]
+
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
+                    model="gpt-4o-2024-08-06", messages=messages, tools=tools)
+
+            return completion.choices[0].message.tool_calls[0].function
+
+        except Exception as e:
+            return None
+
+    async def decide_next_branch(self, query: str, options: Dict[str, Any]) -> Tuple[str, float, str]:
+        """
+        Uses the LLM to decide the next branch or endpoint to follow based on the query.
+
+        :param query: The user's query describing the functionality.
+        :param options: A dictionary of options (e.g., available industries or API methods).
+        :return: The selected option, its confidence score and the reason for the score.
+        """
+        prompt = (
+             f"Based on the query: '{query}', select the most appropriate option from the list below. "
+             f"Consider each option carefully and choose the one that aligns best with the query's context: {list(options.keys())}")
+        system_instruction = (
+           "Choose the most appropriate next branch based on the given user input. Ensure the selection is from the "
+           "provided list of options only. If the chosen branch is not available in the current industry path, "
+           "regenerate and select an alternative step from the list. Never Return an empty reply."
+           "Make sure to return the chosen endpoint with the reason for it being chosen and the reasonoing behind why it is assigned the given confidence score")
+
+        try:
+            response = await self.generate_content_with_json_format(
+                system_instruction=system_instruction,
+                query=prompt,
+                response_schema=api_tree_schema,
+                use_cache=True
+            )
+            response_data = json.loads(response)
+            return response_data["chosen_option"], response_data["confidence_score"], response_data["score_reason"]
+
+        except json.JSONDecodeError as e:
+            print("Failed to parse JSON response inside the next branch decision:", e)
+            raise RuntimeError("Invalid JSON response received from LLM.")
+        except KeyError as e:
+            print("Missing key in response:", e)
+            raise RuntimeError("Expected keys not found in the response inside the next branch decision.")
+
+    async def score_branches(self, query: str, options: Dict[str, Any]) -> Dict[str, Tuple[float, str]]:
+        """
+        Uses the LLM to score every option against the query in a single call.
+
+        :param query: The user's query describing the functionality.
+        :param options: A dictionary of options (e.g., the children of an industry tree node).
+        :return: A dictionary mapping every option to its confidence score and the reason for it.
+        """
+        system_instruction, prompt = branch_scores_prompt(query, options)
+        response = await self.generate_content_with_json_format(
+            system_instruction=system_instruction,
+            query=prompt,
+            response_schema=branch_scores_schema,
+            use_cache=True
+        )
+        return parse_branch_scores(response, options)
+
+    async def decide_endpoint_score(self, query: str, endpoint_name: str) -> bool:
+        """
+        Uses the LLM to determine whether the endpoint is relevant to the query.
+
+        :param query: The user's query.
+        :param endpoint_name: The name of the endpoint to evaluate.
+        :return: Whether the confidence score of the endpoint reaches 0.85.
+        """
+        system_instruction, prompt, response_schema = endpoint_score_prompt(query, endpoint_name)
+        response = await self.generate_content_with_json_format(
+            system_instruction=system_instruction,
+            query=prompt,
+            response_schema=response_schema,
+            use_cache=True
+        )
+        return parse_endpoint_score(response)
+
+    async def generate_parameter_details(self, parameter_name: str, function_name: str) -> dict:
+        """
+        Generates the name, type, description and required status of a parameter of a function.
+        """
+        system_instruction, query, response_schema = parameter_details_prompt(parameter_name, function_name)
+        parameter_details = await self.generate_content_with_json_format(system_instruction, query, response_schema,
+                                                                         use_cache=True)
+        return parse_parameter_details(parameter_details)
+
+    async def generate_function_schema(self, function_name: str, parameter_names: list, function: Any = None) -> dict:
+        """
+        Generates a JSON schema for a given function, like OpenAiLLMService.generate_function_schema.
+        The untyped parameters missing from the parameter schema cache are described by the LLM
+        concurrently.
+
+        :param function_name: The name of the function.
+        :param parameter_names: A list of parameter names (strings).
+        :param function: The endpoint itself, used to read its signature.
+        :return: A JSON schema as a dictionary describing the function and its parameters.
+        """
+        signature_index = get_api_signature_index()
+        endpoint_key = signature_index.endpoint_key(function) if function is not None else function_name
+        schema_key = (endpoint_key, tuple(str(param_name) for param_name in parameter_names))
+        if schema_key in self._function_schemas:
+            return json.loads(json.dumps(self._function_schemas[schema_key]))
+
+        static_schemas = signature_index.parameter_schemas(function, parameter_names) if function is not None else {}
+        schema_cache = get_parameter_schema_cache()
+
+        async def describe(param_name) -> dict:
+            param_schema = static_schemas.get(param_name)
+            if param_schema is None:
+                param_schema = await asyncio.to_thread(schema_cache.get, endpoint_key, str(param_name))
+            if param_schema is None:
+                print(f"Describing untyped parameter '{param_name}' of '{function_name}' with the LLM")
+                param_details = await self.generate_parameter_details(str(param_name), function_name)
+                param_schema = {
+                    "type": param_details["type"],
+                    "description": param_details["description"]
+                }
+                await asyncio.to_thread(schema_cache.set, endpoint_key, str(param_name), param_schema)
+            return param_schema
+
+        param_schemas = await asyncio.gather(*(describe(param_name) for param_name in parameter_names))
+        response_schema = {
+            "type": "object",
+            "properties": dict(zip(parameter_names, param_schemas))
+        }
+        if function is not None:
+            response_schema["required"] = [
+                param_name for param_name in signature_index.required_parameters(function) if param_name in parameter_names
+            ]
+
+        self._function_schemas[schema_key] = response_schema
+        return json.loads(json.dumps(response_schema))
+
+    async def generate_scored_parameters_for_function(self, function_schema: dict, user_persona: str) -> dict:
+        """
+        Generates the arguments of a function along with a confidence score and a rationale for each of them.
+
+        :param function_schema: The JSON schema of the function with details about each parameter.
+        :param user_persona: A description of the user persona to guide parameter generation.
+        :return: A dictionary with parameter names as keys and dicts with value, confidence and rationale as values.
+        """
+        system_instruction, query, response_schema = scored_parameters_prompt(function_schema, user_persona)
+        generated_arguments = await self.generate_content_with_json_format(system_instruction, query, response_schema)
+        if isinstance(generated_arguments, str):
+            generated_arguments = json.loads(generated_arguments)
+        return generated_arguments
+
+    async def generate_parameters_for_function(self, function_schema: dict, user_persona: str):
+        """
+        Generates arguments for each parameter in the provided function schema based on the user persona description.
+
+        :param function_schema: The JSON schema of the function with details about each parameter.
+        :param user_persona: A description of the user persona to guide parameter generation.
+        :return: The generated arguments, as returned by the LLM.
+        """
+        system_instruction, query, response_schema = parameters_prompt(function_schema, user_persona)
+        return await self.generate_content_with_json_format(system_instruction, query, response_schema)
+
+    @staticmethod
+    def _total_tokens(completion) -> int:
+        usage = getattr(completion, "usage", None)
+        return getattr(usage, "total_tokens", 0) or 0
+
+
+class AsyncLLMService:
+    """
+    asyncio counterpart of the Gemini backed LLMService, with the same semaphore based limit
+    on the number of requests in flight.
+    """
+
+    def __init__(self, model_name: str, max_concurrency: int = None):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def generate_content(self, system_instruction: str, query: str, response_type: str, response_schema = dict) -> str:
+        model_config = genai.GenerationConfig(response_mime_type=response_type, response_schema=response_schema)
+        model = genai.GenerativeModel(model_name=self.model_name, generation_config=model_config, system_instruction=system_instruction)
+
+        async with self._semaphore:
+            response = await model.generate_content_async(query)
+        return response.candidates[0].content.parts[0].text
+
+    async def generate_content_with_tools(self, query: str, tools):
+        model = genai.GenerativeModel(model_name=self.model_name, tools=tools)
+
+        async with self._semaphore:
+            response = await model.generate_content_async(query)
+        return response
+
+    def chat_bot(self, system_instruction: str, tools: list, history: list):
+        """
+        Starts a chat session, as LLMService.chat_bot does. Send its messages with
+        chat.send_message_async to keep them off the event loop's thread.
+        """
+        model = genai.GenerativeModel(model_name=self.model_name,
+                                      system_instruction=system_instruction,
+                                      tools=tools)
+        return model.start_chat(history=history)
+
+    async def decide_next_branch(self, query: str, current_node: dict) -> Tuple[str, float]:
+        """
+        Decides the next branch to take based on the provided query and the options in the current node.
+
+        :param query: The input query describing the functionality.
+        :param current_node: The current node in the tree, which contains the branches.
+        :return: The name of the next branch and the confidence score for the choice.
+        """
+        formatted_options = "\n".join([f"- {option}" for option in current_node.keys()])
+        system_instruction = (
+            "You are tasked with choosing the most relevant branch for the given query. "
+            "Select one of the provided options and give a confidence score (0 to 1)."
+        )
+        query_with_options = (
+            f"Query: {query}\n"
+            f"Options:\n{formatted_options}\n"
+            "Respond with the best choice and a confidence score."
+        )
+
+        response = await self.generate_content(system_instruction, query_with_options, response_type="text/plain")
+
+        response_parts = response.split(", Confidence: ")
+        chosen_branch = response_parts[0].replace("Choice: ", "").strip()
+        confidence_score = float(response_parts[1].strip())
+        return chosen_branch, confidence_score
+
+
+async def gather_structured(llm_service: AsyncOpenAiLLMService, requests: List[Dict[str, Any]],
+                            return_exceptions: bool = False) -> List[Any]:
+    """
+    Runs several structured-schema prompts concurrently, bounded by the service's concurrency limit.
+
+    :param llm_service: The async service the prompts are sent through.
+    :param requests: A list of dicts with the keyword arguments of generate_content_with_Structured_schema
+                     (system_instruction, query, response_schema and optionally use_cache).
+    :param return_exceptions: When True, failed prompts return their exception instead of cancelling the batch.
+    :return: The parsed responses, in the same order as the requests.
+    """
+    return await asyncio.gather(
+        *(llm_service.generate_content_with_Structured_schema(**request) for request in requests),
+        return_exceptions=return_exceptions)
@@ -0,0 +1,75 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+
+
+DEFAULT_OPENAI_MODEL = "gpt-4o-2024-08-06"
+
+_lock = threading.RLock()
+_openai_clients: Dict[str, openai.OpenAI] = {}
+_openai_services: Dict[Tuple[str, str], "OpenAiLLMService"] = {}
+
+
+def openai_connection_limits() -> httpx.Limits:
+    """
+    Connection pool limits shared by every OpenAI client in the process.
+    Tunable through the environment so deployments can size the pool to their worker count.
+    """
+    return httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def get_openai_client(api_key: Optional[str] = None) -> openai.OpenAI:
+    """
+    Returns the process-wide OpenAI client for the given api key, creating it on first use.
+    The client keeps its TLS connections alive in a tuned pool and is safe to share across threads.
+
+    :param api_key: The OpenAI api key. Defaults to the OPENAI_API_KEY environment variable.
+    :return: A shared openai.OpenAI client.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    client = _openai_clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = openai.OpenAI(
+                api_key=api_key,
+                timeout=float(os.getenv("OPENAI_TIMEOUT", "120")),
+                max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+                http_client=openai.DefaultHttpxClient(limits=openai_connection_limits()),
+            )
+            _openai_clients[api_key] = client
+        return client
+
+
+def get_openai_llm_service(model_name: str = DEFAULT_OPENAI_MODEL, api_key: Optional[str] = None) -> "OpenAiLLMService":
+    """
+    Returns the shared OpenAiLLMService for the given model and api key.
+
+    :param model_name: The OpenAI model the service generates with.
+    :param api_key: The OpenAI api key. Defaults to the OPENAI_API_KEY environment variable.
+    :return: A shared OpenAiLLMService backed by the pooled client.
+    """
+    from infrastructure.llm.open_ai_llm import OpenAiLLMService
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    key = (model_name, api_key)
+    service = _openai_services.get(key)
+    if service is not None:
+        return service
+
+    with _lock:
+        service = _openai_services.get(key)
+        if service is None:
+            service = OpenAiLLMService(model_name=model_name, api_key=api_key)
+            _openai_services[key] = service
+        return service
@@ -1,6 +1,7 @@
 import google.generativeai as genai
 
 from infrastructure.llm.llm_service import LLMService
+from infrastructure.api_signature_index import get_api_signature_index
 from infrastructure.repositories.self_reflection_repository import SelfReflectionRepository
 from infrastructure.embedding_service import UserEmbeddingService
 
@@ -18,17 +19,14 @@ class LLM_function_calling_service:
     
     def get_function_map(self, class_instance):
         """
-        Retrieves all callable methods from the class instance, excluding special methods 
-        (those starting with '__').
+        Retrieves all public methods of the class instance. The method names come from the API
+        signature index, so the class is only reflected once per process.
         
         :param class_instance: An instance of the class whose methods are being mapped.
         :return: A dictionary mapping method names to callable methods.
         """
         try:
-            methods = {method_name: getattr(class_instance, method_name) 
-                       for method_name in dir(class_instance) 
-                       if callable(getattr(class_instance, method_name)) and not method_name.startswith("__") and not method_name.startswith("_")}
-            return methods
+            return get_api_signature_index().function_map(class_instance)
         except Exception as e:
             raise RuntimeError(f"Error retrieving method map: {str(e)}")
 
@@ -0,0 +1,283 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+
+class SQLiteResponseStore:
+    """
+    Optional on-disk tier for the LLM response cache. Entries survive process restarts
+    and are shared by every worker process that points at the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "tokens INTEGER NOT NULL DEFAULT 0, latency REAL NOT NULL DEFAULT 0)"
+            )
+            self._connection.commit()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at, tokens, latency FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            return row
+
+    def set(self, key: str, value: str, expires_at: float, tokens: int = 0, latency: float = 0.0) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, expires_at, tokens, latency) VALUES (?, ?, ?, ?, ?)",
+                (key, value, expires_at, tokens, latency),
+            )
+            self._connection.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_responses")
+            self._connection.commit()
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache for LLM responses. Keys are a hash of the model, the messages and
+    the response schema, so identical prompts reuse the previous answer instead of paying for
+    another completion. Lookups go through an in-memory LRU with TTL first and then through the
+    optional SQLite tier. Every entry remembers the tokens and latency of the completion that
+    produced it, so the counters also report how much spend and time the hits saved.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, disk_store: SQLiteResponseStore = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_store = disk_store
+        self._entries: "OrderedDict[str, tuple[str, float, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "tokens_saved": 0,
+            "latency_saved_seconds": 0.0,
+        }
+
+    @staticmethod
+    def make_key(model: str, messages: list, response_schema: Any) -> str:
+        """
+        Builds the cache key for a completion request.
+
+        :param model: The model name the completion is requested from.
+        :param messages: The chat messages sent to the model.
+        :param response_schema: A json schema dict or a pydantic model class.
+        :return: A sha256 hex digest identifying the request.
+        """
+        if hasattr(response_schema, "model_json_schema"):
+            schema = response_schema.model_json_schema()
+        else:
+            schema = response_schema
+        payload = json.dumps({"model": model, "messages": messages, "schema": schema}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, tokens, latency = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self._record_hit("memory_hits", tokens, latency)
+                    return value
+                del self._entries[key]
+
+        if self.disk_store is not None:
+            row = self.disk_store.get(key)
+            if row is not None:
+                value, expires_at, tokens, latency = row
+                with self._lock:
+                    self._remember(key, value, expires_at, tokens, latency)
+                    self._record_hit("disk_hits", tokens, latency)
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str, tokens: int = 0, latency: float = 0.0) -> None:
+        """
+        Stores a response.
+
+        :param key: The key built by make_key.
+        :param value: The serialized response.
+        :param tokens: Total tokens the completion consumed, credited to the savings on every hit.
+        :param latency: Seconds the completion took, credited to the savings on every hit.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at, tokens, latency)
+            self._stats["stores"] += 1
+        if self.disk_store is not None:
+            self.disk_store.set(key, value, expires_at, tokens, latency)
+
+    def _record_hit(self, tier: str, tokens: int, latency: float) -> None:
+        self._stats["hits"] += 1
+        self._stats[tier] += 1
+        self._stats["tokens_saved"] += tokens
+        self._stats["latency_saved_seconds"] += latency
+
+    def _remember(self, key: str, value: str, expires_at: float, tokens: int, latency: float) -> None:
+        self._entries[key] = (value, expires_at, tokens, latency)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Drops a response, e.g. one a caller rejected, so the next lookup asks the model again."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_store is not None:
+            self.disk_store.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk_store is not None:
+            self.disk_store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit/miss counters of the cache along with its current size and hit rate.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_JSON_SCHEMA_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _matches_type(value: Any, name: str) -> bool:
+    # bool is a subclass of int, but JSON keeps booleans and numbers apart.
+    if isinstance(value, bool) and name in ("integer", "number"):
+        return False
+    return isinstance(value, _JSON_SCHEMA_TYPES.get(name, (object,)))
+
+
+def matches_json_schema(value: Any, schema: Dict[str, Any]) -> bool:
+    """
+    Checks a decoded JSON value against the parts of a JSON schema the response schemas use:
+    type, enum, properties, required and items.
+    """
+    if not isinstance(schema, dict):
+        return True
+    types = schema.get("type")
+    if types is not None and not any(_matches_type(value, name) for name in (types if isinstance(types, list) else [types])):
+        return False
+    if "enum" in schema and value not in schema["enum"]:
+        return False
+    if isinstance(value, dict):
+        if any(name not in value for name in schema.get("required", [])):
+            return False
+        properties = schema.get("properties", {})
+        return all(matches_json_schema(item, properties[name]) for name, item in value.items() if name in properties)
+    if isinstance(value, list) and isinstance(schema.get("items"), dict):
+        return all(matches_json_schema(item, schema["items"]) for item in value)
+    return True
+
+
+def is_valid_json_response(content: str, response_schema: Any) -> bool:
+    """
+    :param content: The raw content of a completion requested with a JSON response format.
+    :param response_schema: The response_format of the request, e.g. {"type": "json_schema", "json_schema": {...}}.
+    :return: Whether the content is JSON matching the schema, so it is safe to cache.
+    """
+    try:
+        value = json.loads(content)
+    except (TypeError, ValueError):
+        return False
+    schema = response_schema.get("json_schema", {}).get("schema") if isinstance(response_schema, dict) else None
+    return schema is None or matches_json_schema(value, schema)
+
+
+_refreshing: contextvars.ContextVar = contextvars.ContextVar("llm_cache_refreshing", default=False)
+
+
+@contextlib.contextmanager
+def refresh_llm_cache(enabled: bool = True) -> Iterator[None]:
+    """
+    Within this context, LLM calls skip the cached responses and replace them with fresh ones. Retries
+    run in it, so a retry never gets back the response that made the previous attempt fail.
+    """
+    token = _refreshing.set(enabled or _refreshing.get())
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+def llm_cache_refreshing() -> bool:
+    return _refreshing.get()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Returns the process-wide LLM response cache configured from the environment, or None when
+    LLM_CACHE_ENABLED is set to false. LLM_CACHE_SQLITE_PATH enables the on-disk tier.
+    """
+    global _default_cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is not None:
+        return _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            sqlite_path = os.getenv("LLM_CACHE_SQLITE_PATH")
+            _default_cache = LLMResponseCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+                disk_store=SQLiteResponseStore(sqlite_path) if sqlite_path else None,
+            )
+        return _default_cache
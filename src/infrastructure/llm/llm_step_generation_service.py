@@ -1,17 +1,18 @@
 import json
 import os
 from infrastructure.llm.llm_service import LLMService
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
 from typing import List, Dict
 
-llm = OpenAiLLMService("gpt-4o-2024-08-06", api_key=os.getenv('OPENAI_API_KEY'))
+llm = get_openai_llm_service("gpt-4o-2024-08-06")
 class LLM_step_generation_service:
-    def Generate_steps(self, strategy: str, apis: List[str]) -> Dict[str, str]:
+    def Generate_steps(self, strategy: str, apis: List[str], dependencies: Dict[str, List[str]] = None) -> Dict[str, str]:
         """
         Generates high-level steps for a given strategy, with each step as a key and the associated API as its value.
 
         :param strategy: The central strategy or goal of the module.
         :param apis: A list of available APIs that can be used in the steps.
+        :param dependencies: When given, filled with the earlier steps whose output every step uses.
         :return: A dictionary where each key is a step (function description) and each value is the associated API.
         """
         prompt = f""" Task: {strategy}
@@ -23,6 +24,8 @@ class LLM_step_generation_service:
         2. Exclude extra information such as explanations, numbering, or unrelated details.
         3. The output format should strictly match the following example:
            {{ "step_description": "chosen_api" }}
+        4. Separately, list for every step the earlier steps whose output it uses, e.g. a step fetching the comments
+           of a story found by an earlier step depends on that step. Leave the list empty for independent steps.
 
         Available APIs: {apis}
 
@@ -47,9 +50,17 @@ class LLM_step_generation_service:
                             "additionalProperties": {
                                 "type": "string"
                             }
+                        },
+                        "dependencies": {
+                            "type": "object",
+                            "description": "For every step, the earlier steps whose output it uses.",
+                            "additionalProperties": {
+                                "type": "array",
+                                "items": {"type": "string"}
+                            }
                         }
                     },
-                    "required": ["steps"],
+                    "required": ["steps", "dependencies"],
                     "additionalProperties": False
                 }
             }
@@ -67,6 +78,13 @@ class LLM_step_generation_service:
                 res = json.loads(response)
                 steps_dict = res["steps"]
                 print(steps_dict)
+                if dependencies is not None:
+                    declared = res.get("dependencies") or {}
+                    step_names = list(steps_dict)
+                    for index, step_name in enumerate(step_names):
+                        # Only earlier steps count, so the declared graph cannot have cycles.
+                        dependencies[step_name] = [name for name in declared.get(step_name) or []
+                                                   if name in step_names[:index]]
                 return steps_dict
             
         except json.JSONDecodeError as e:
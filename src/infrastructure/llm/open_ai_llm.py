@@ -1,20 +1,34 @@
 import json
 import os
+import time
 from typing import Any, Dict, Tuple
 import openai
-from infrastructure.llm.open_ai_schemas import api_tree_schema
+from infrastructure.api_signature_index import get_api_signature_index
+from infrastructure.llm.llm_client_registry import get_openai_client
+from infrastructure.llm.llm_response_cache import (LLMResponseCache, get_llm_response_cache, is_valid_json_response,
+                                                   llm_cache_refreshing)
+from infrastructure.llm.open_ai_schemas import api_tree_schema, branch_scores_schema
+from infrastructure.parameter_schema_cache import get_parameter_schema_cache
 
 
 class OpenAiLLMService:
 
-    def __init__(self, model_name: str, api_key):
+    def __init__(self, model_name: str, api_key, client: openai.OpenAI = None, cache: LLMResponseCache = None):
         self.model_name = model_name
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = client or get_openai_client(api_key)
+        self.cache = cache if cache is not None else get_llm_response_cache()
+        self._function_schemas: Dict[Tuple[str, tuple], dict] = {}
 
     def generate_content_with_Structured_schema(self,
                                      system_instruction: str,
                                      query: str,
-                                      response_schema):
+                                      response_schema,
+                                      use_cache: bool = False):
+        """
+        :param use_cache: Whether the answer may come from and go to the response cache. Only pass True
+                          for deterministic prompts, such as routing and schema prompts: generated
+                          content would otherwise be replayed verbatim until the cache entry expires.
+        """
         messages = [{
             "role": "system",
             "content": system_instruction
@@ -23,16 +37,34 @@ class OpenAiLLMService:
             "content": query
         }]
 
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = self.cache.make_key(self.model_name, messages, response_schema)
+            cached = self.cache.get(cache_key) if not llm_cache_refreshing() else None
+            if cached is not None:
+                return response_schema.model_validate_json(cached)
+
+        started_at = time.perf_counter()
         completion = self.client.beta.chat.completions.parse(
             model=self.model_name,
             messages=messages,
             response_format=response_schema)
 
-        return completion.choices[0].message.parsed
+        parsed = completion.choices[0].message.parsed
+        if cache_key is not None and parsed is not None:
+            self.cache.set(cache_key, parsed.model_dump_json(),
+                           tokens=self._total_tokens(completion),
+                           latency=time.perf_counter() - started_at)
+        return parsed
 
     def generate_content_with_json_format(self,
                          system_instruction: str,
-                         query: str, response_schema: dict):
+                         query: str, response_schema: dict,
+                         use_cache: bool = False):
+        """
+        :param use_cache: Whether the answer may come from and go to the response cache, see
+                          generate_content_with_Structured_schema.
+        """
         messages = [{
             "role": "system",
             "content": system_instruction
@@ -40,10 +72,40 @@ class OpenAiLLMService:
             "role": "user",
             "content": query
         }]
-        completion = self.client.chat.completions.create(
-            model="gpt-4o-2024-08-06", messages=messages, response_format=response_schema)
+        model = "gpt-4o-2024-08-06"
 
-        return completion.choices[0].message.content
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = self.cache.make_key(model, messages, response_schema)
+            cached = self.cache.get(cache_key) if not llm_cache_refreshing() else None
+            if cached is not None:
+                return cached
+
+        started_at = time.perf_counter()
+        completion = self.client.chat.completions.create(
+            model=model, messages=messages, response_format=response_schema)
+
+        content = completion.choices[0].message.content
+        # Only answers that parse and match the schema are cached, so a truncated or off-schema
+        # answer is not handed back to the retries of the caller that rejects it.
+        if cache_key is not None and content and is_valid_json_response(content, response_schema):
+            self.cache.set(cache_key, content,
+                           tokens=self._total_tokens(completion),
+                           latency=time.perf_counter() - started_at)
+        return content
+
+    @staticmethod
+    def _total_tokens(completion) -> int:
+        usage = getattr(completion, "usage", None)
+        return getattr(usage, "total_tokens", 0) or 0
+
+    def cache_stats(self) -> dict:
+        """
+        Returns the hit/miss counters of the response cache used by this service.
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
     
     
     def generate_content_with_tools(self, query, tools):
@@ -90,7 +152,8 @@ class OpenAiLLMService:
             response = self.generate_content_with_json_format(
                 system_instruction=system_instruction,
                 query=prompt,
-                response_schema=response_schema
+                response_schema=response_schema,
+                use_cache=True
             )
             response_data = json.loads(response)
             return response_data["chosen_option"], response_data["confidence_score"], response_data["score_reason"]
@@ -102,6 +165,25 @@ class OpenAiLLMService:
             print("Missing key in response:", e)
             raise RuntimeError("Expected keys not found in the response inside the next branch decision.")
 
+    def score_branches(self, query: str, options: Dict[str, Any]) -> Dict[str, Tuple[float, str]]:
+        """
+        Uses the LLM to score every option against the query in a single call, so each option is
+        judged with its siblings in view.
+
+        :param query: The user's query describing the functionality.
+        :param options: A dictionary of options (e.g., the children of an industry tree node).
+        :return: A dictionary mapping every option to its confidence score and the reason for it.
+                 Options the LLM left out score 0.
+        """
+        system_instruction, prompt = branch_scores_prompt(query, options)
+        response = self.generate_content_with_json_format(
+            system_instruction=system_instruction,
+            query=prompt,
+            response_schema=branch_scores_schema,
+            use_cache=True
+        )
+        return parse_branch_scores(response, options)
+
     def decide_endpoint_score(self, query: str, endpoint_name: str) -> bool:
         """
         Uses the LLM to determine the confidence score that the branch_name is relevant to the query.
@@ -110,56 +192,15 @@ class OpenAiLLMService:
         :param branch_name: The name of the branch to evaluate.
         :return: A confidence score between 0 and 1.
         """
-        prompt = (
-            f"Evaluate the relevance of the query: '{query}' to the endpoint: '{endpoint_name}'. "
-            f"Assign a confidence score between 0 and 1, where 1 indicates high relevance and 0 indicates no relevance."
-        )
-
-        response_schema = {
-           "type": "json_schema",
-           "json_schema": {
-               "name" : "confidence_score",
-               "schema": {
-               "type": "object",
-               "properties": {
-                   "confidence_score": {
-                       "type": "number",
-                       "description": "The confidence score for the input."
-                   }
-               },
-               "required": ["confidence_score"],
-               "additionalProperties": False
-           }
-        }
-       }
-        system_instruction = (
-            "Assess the relevance of the provided step to the user's query and return a confidence score between 0 and 1. "
-            "The response must be in JSON format and include only the 'confidence_score' key."
-        )
-        
+        system_instruction, prompt, response_schema = endpoint_score_prompt(query, endpoint_name)
         print(f"Evaluating step '{query}' for relevance with endpoint {endpoint_name}.")
-        try:
-            response = self.generate_content_with_json_format(
-                system_instruction=system_instruction,
-                query=prompt,
-                response_schema=response_schema
-            )
-            response_data = json.loads(response)
-            score = float(response_data["confidence_score"])
-            score = max(0.0, min(1.0, score))
-            if score >= 0.85:
-                return True
-            else:
-                return False
-        except json.JSONDecodeError as e:
-            print("Failed to parse JSON response:", e)
-            raise RuntimeError("Invalid JSON response received from LLM inside the branch scoring.")
-        except KeyError as e:
-            print("Missing key in response:", e)
-            raise RuntimeError("Expected keys not found in the response inside the branch scoring.")
-        except ValueError:
-            print("Invalid confidence score value.")
-            raise RuntimeError("Confidence score is not a valid number inside the branch scoring.")
+        response = self.generate_content_with_json_format(
+            system_instruction=system_instruction,
+            query=prompt,
+            response_schema=response_schema,
+            use_cache=True
+        )
+        return parse_endpoint_score(response)
         
     def generate_parameter_details(self, parameter_name: str, function_name: str) -> dict:
         """
@@ -170,71 +211,76 @@ class OpenAiLLMService:
         :param function_description: A description of the function's purpose and operations.
         :return: A dictionary with parameter details: name, type, description, and required status.
         """
-        system_instruction = "You are an assistant generating details for a function parameter."
-        query = (
-            f"This is the inteded function '{function_name}'. "
-            f"Please provide details for the parameter '{parameter_name}', including its type type limited to string, integer, boolean, a brief description, "
-            "and whether it is required, based on its relevance to the function."
-        )
-
-        response_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": f"{parameter_name}_details_schema",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string", "description": "The name of the parameter."},
-                        "type": {"type": "string", "description": "Data type of the parameter, e.g., string, integer, boolean."},
-                        "description": {"type": "string", "description": "Description of what this parameter represents."},
-                        "required": {"type": "boolean", "description": "Indicates if the parameter is required."}
-                    },
-                    "required": ["name", "type", "description", "required"],
-                    "additionalProperties": False
-                }
-            }
-        }
-
-        parameter_details = self.generate_content_with_json_format(system_instruction, query, response_schema)
-        
-        if isinstance(parameter_details, str):
-            parameter_details = json.loads(parameter_details)
-
-        if not isinstance(parameter_details, dict):
-            raise ValueError(f"Expected dictionary but got {type(parameter_details).__name__}: {parameter_details}")
-
-        return parameter_details
+        system_instruction, query, response_schema = parameter_details_prompt(parameter_name, function_name)
+        parameter_details = self.generate_content_with_json_format(system_instruction, query, response_schema,
+                                                                   use_cache=True)
+        return parse_parameter_details(parameter_details)
 
 
 
-    def generate_function_schema(self, function_name: str, parameter_names: list):
+    def generate_function_schema(self, function_name: str, parameter_names: list, function: Any = None):
         """
         Generates a JSON schema for a given function, including descriptions and types for each parameter.
+        Parameters are described from the type hints, defaults and docstring of the function when it is
+        given. Only the untyped parameters are described by the LLM, once: their details are persisted in
+        the parameter schema cache. Schemas are kept per endpoint for the life of the process.
 
         :param function_name: The name of the function.
         :param parameter_names: A list of parameter names (strings).
+        :param function: The endpoint itself, used to read its signature.
         :return: A JSON schema as a dictionary describing the function and its parameters.
         """
-        system_instruction = "You are generating a JSON schema for a function."
-        query = f"Create a JSON schema for the function '{function_name}' with the following parameters."
+        signature_index = get_api_signature_index()
+        endpoint_key = signature_index.endpoint_key(function) if function is not None else function_name
+        schema_key = (endpoint_key, tuple(str(param_name) for param_name in parameter_names))
+        if schema_key in self._function_schemas:
+            return json.loads(json.dumps(self._function_schemas[schema_key]))
+
+        static_schemas = signature_index.parameter_schemas(function, parameter_names) if function is not None else {}
+        schema_cache = get_parameter_schema_cache()
 
         response_schema = {
             "type": "object",
             "properties": {}
         }
-        print(parameter_names)
-        
         for param_name in parameter_names:
-            print(param_name)
-            print(type(param_name))
-            param_details = self.generate_parameter_details(str(param_name), function_name)
-            print("finish param description")
-            response_schema["properties"][param_name] = {
-                "type": param_details["type"],
-                "description": param_details["description"]
-            }
+            param_schema = static_schemas.get(param_name)
+            if param_schema is None:
+                param_schema = schema_cache.get(endpoint_key, str(param_name))
+            if param_schema is None:
+                print(f"Describing untyped parameter '{param_name}' of '{function_name}' with the LLM")
+                param_details = self.generate_parameter_details(str(param_name), function_name)
+                param_schema = {
+                    "type": param_details["type"],
+                    "description": param_details["description"]
+                }
+                schema_cache.set(endpoint_key, str(param_name), param_schema)
+            response_schema["properties"][param_name] = param_schema
+
+        if function is not None:
+            response_schema["required"] = [
+                param_name for param_name in signature_index.required_parameters(function) if param_name in parameter_names
+            ]
+
+        self._function_schemas[schema_key] = response_schema
+        return json.loads(json.dumps(response_schema))
 
-        return response_schema
+    def generate_scored_parameters_for_function(self, function_schema: dict, user_persona: str) -> dict:
+        """
+        Generates the arguments of a function along with a confidence score, a rationale and whether it
+        depends on the run for each of them, in a single structured call instead of one generation call
+        and one scoring call per parameter.
+
+        :param function_schema: The JSON schema of the function with details about each parameter.
+        :param user_persona: A description of the user persona to guide parameter generation.
+        :return: A dictionary with parameter names as keys and dicts with value, confidence, rationale and
+                 run_dependent as values.
+        """
+        system_instruction, query, response_schema = scored_parameters_prompt(function_schema, user_persona)
+        generated_arguments = self.generate_content_with_json_format(system_instruction, query, response_schema)
+        if isinstance(generated_arguments, str):
+            generated_arguments = json.loads(generated_arguments)
+        return generated_arguments
 
     def validate_parameter_details(parameter_details: dict, parameter_name: str):
         """
@@ -259,46 +305,233 @@ class OpenAiLLMService:
         :param user_persona: A description of the user persona to guide parameter generation.
         :return: A dictionary with parameter names as keys and generated argument values.
         """
-        system_instruction = (
-        "You are an intelligent assistant. Given a user persona and the function parameters schema, "
-        "generate appropriate values for each parameter. Use contextual hints in the persona to infer "
-        "values accurately, even if they are not explicitly stated."
-           )
-        
-        query = (
-            
-            f"Based on the following user persona:\n'{user_persona}', "
-            
-            "please generate suitable values for each parameter in the function schema."
-            
-            "Provide values that match the type and purpose described for each parameter, using any relevant "
-            
-            "details from the persona to fill in or infer each parameter’s value."
-         )  
+        system_instruction, query, response_schema = parameters_prompt(function_schema, user_persona)
+        generated_arguments = self.generate_content_with_json_format(system_instruction, query, response_schema)
+
+        return generated_arguments
 
-        parameters = function_schema.get("properties", {})
-        required_params = function_schema.get("required", [])
 
-        response_schema = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": f"{function_schema.get('name', 'default_function')}_arguments_schema",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        param_name: {
-                            "type": param_details.get("type", "string"),
-                            "description": param_details.get("description", "")
-                        }
-                        for param_name, param_details in parameters.items()
-                    },
-                    "required": required_params,
-                    "additionalProperties": False
-                }
+# Prompts and parsers shared by OpenAiLLMService and AsyncOpenAiLLMService.
+
+def branch_scores_prompt(query: str, options: Dict[str, Any]) -> Tuple[str, str]:
+    """:return: The system instruction and the prompt of score_branches; its schema is branch_scores_schema."""
+    prompt = (
+         f"Based on the query: '{query}', score how relevant each of the following options is to the query, "
+         f"comparing them with each other: {list(options.keys())}")
+    system_instruction = (
+       "Score every option of the provided list with a confidence between 0 and 1 that following it helps "
+       "perform the given user input. Return exactly one entry per option, using the option names as given, "
+       "with the reasoning behind the score.")
+    return system_instruction, prompt
+
+
+def parse_branch_scores(response: str, options: Dict[str, Any]) -> Dict[str, Tuple[float, str]]:
+    try:
+        response_data = json.loads(response)
+        scores = {option: (0.0, "Not scored") for option in options}
+        for score in response_data["scores"]:
+            if score["option"] in options:
+                scores[score["option"]] = (score["confidence_score"], score["score_reason"])
+        return scores
+
+    except json.JSONDecodeError as e:
+        print("Failed to parse JSON response inside the branch scoring:", e)
+        raise RuntimeError("Invalid JSON response received from LLM.")
+    except KeyError as e:
+        print("Missing key in response:", e)
+        raise RuntimeError("Expected keys not found in the response inside the branch scoring.")
+
+
+def endpoint_score_prompt(query: str, endpoint_name: str) -> Tuple[str, str, dict]:
+    """:return: The system instruction, the prompt and the response schema of decide_endpoint_score."""
+    prompt = (
+        f"Evaluate the relevance of the query: '{query}' to the endpoint: '{endpoint_name}'. "
+        f"Assign a confidence score between 0 and 1, where 1 indicates high relevance and 0 indicates no relevance."
+    )
+
+    response_schema = {
+       "type": "json_schema",
+       "json_schema": {
+           "name" : "confidence_score",
+           "schema": {
+           "type": "object",
+           "properties": {
+               "confidence_score": {
+                   "type": "number",
+                   "description": "The confidence score for the input."
+               }
+           },
+           "required": ["confidence_score"],
+           "additionalProperties": False
+       }
+    }
+   }
+    system_instruction = (
+        "Assess the relevance of the provided step to the user's query and return a confidence score between 0 and 1. "
+        "The response must be in JSON format and include only the 'confidence_score' key."
+    )
+    return system_instruction, prompt, response_schema
+
+
+def parse_endpoint_score(response: str) -> bool:
+    """:return: Whether the confidence score of a decide_endpoint_score response reaches 0.85."""
+    try:
+        response_data = json.loads(response)
+        score = float(response_data["confidence_score"])
+        score = max(0.0, min(1.0, score))
+        if score >= 0.85:
+            return True
+        else:
+            return False
+    except json.JSONDecodeError as e:
+        print("Failed to parse JSON response:", e)
+        raise RuntimeError("Invalid JSON response received from LLM inside the branch scoring.")
+    except KeyError as e:
+        print("Missing key in response:", e)
+        raise RuntimeError("Expected keys not found in the response inside the branch scoring.")
+    except ValueError:
+        print("Invalid confidence score value.")
+        raise RuntimeError("Confidence score is not a valid number inside the branch scoring.")
+
+
+def parameter_details_prompt(parameter_name: str, function_name: str) -> Tuple[str, str, dict]:
+    """:return: The system instruction, the prompt and the response schema of generate_parameter_details."""
+    system_instruction = "You are an assistant generating details for a function parameter."
+    query = (
+        f"This is the inteded function '{function_name}'. "
+        f"Please provide details for the parameter '{parameter_name}', including its type type limited to string, integer, boolean, a brief description, "
+        "and whether it is required, based on its relevance to the function."
+    )
+
+    response_schema = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": f"{parameter_name}_details_schema",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "The name of the parameter."},
+                    "type": {"type": "string", "description": "Data type of the parameter, e.g., string, integer, boolean."},
+                    "description": {"type": "string", "description": "Description of what this parameter represents."},
+                    "required": {"type": "boolean", "description": "Indicates if the parameter is required."}
+                },
+                "required": ["name", "type", "description", "required"],
+                "additionalProperties": False
             }
         }
+    }
+    return system_instruction, query, response_schema
 
-        generated_arguments = self.generate_content_with_json_format(system_instruction, query, response_schema)
 
-        return generated_arguments
+def parse_parameter_details(parameter_details: Any) -> dict:
+    if isinstance(parameter_details, str):
+        parameter_details = json.loads(parameter_details)
+
+    if not isinstance(parameter_details, dict):
+        raise ValueError(f"Expected dictionary but got {type(parameter_details).__name__}: {parameter_details}")
+
+    return parameter_details
+
+
+def scored_parameters_prompt(function_schema: dict, user_persona: str) -> Tuple[str, str, dict]:
+    """:return: The system instruction, the prompt and the response schema of generate_scored_parameters_for_function."""
+    system_instruction = (
+        "You are an intelligent assistant. Given a user persona and the function parameters schema, "
+        "generate appropriate values for each parameter. Use contextual hints in the persona to infer "
+        "values accurately, even if they are not explicitly stated. For every value, also rate between 0 and 1 "
+        "how confident you are that it is relevant to the persona and of the right type, and explain the rating "
+        "in a message that could be sent to the user when the confidence is low. Also flag whether each value "
+        "depends on when the function is called or on data that changes between calls, such as dates, time "
+        "windows, the latest items or content written from what was just fetched, as opposed to a lasting "
+        "preference of the user."
+    )
+    query = (
+        f"Based on the following user persona:\n'{user_persona}', "
+        "please generate suitable values for each parameter in the function schema, "
+        "with the confidence and rationale of each value."
+    )
+
+    parameters = function_schema.get("properties", {})
+    response_schema = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": f"{function_schema.get('name', 'default_function')}_scored_arguments_schema",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    param_name: {
+                        "type": "object",
+                        "properties": {
+                            "value": dict(
+                                {key: value for key, value in param_details.items() if key != "default"},
+                                type=param_details.get("type", "string"),
+                                description=param_details.get("description", "")
+                            ),
+                            "confidence": {
+                                "type": "number",
+                                "description": "The confidence score for the value, between 0 and 1."
+                            },
+                            "rationale": {
+                                "type": "string",
+                                "description": "A message explaining the confidence score or suggesting next steps."
+                            },
+                            "run_dependent": {
+                                "type": "boolean",
+                                "description": "Whether the value must be generated again on every call."
+                            }
+                        },
+                        "required": ["value", "confidence", "rationale", "run_dependent"],
+                        "additionalProperties": False
+                    }
+                    for param_name, param_details in parameters.items()
+                },
+                "required": list(parameters),
+                "additionalProperties": False
+            }
+        }
+    }
+    return system_instruction, query, response_schema
 
+
+def parameters_prompt(function_schema: dict, user_persona: str) -> Tuple[str, str, dict]:
+    """:return: The system instruction, the prompt and the response schema of generate_parameters_for_function."""
+    system_instruction = (
+    "You are an intelligent assistant. Given a user persona and the function parameters schema, "
+    "generate appropriate values for each parameter. Use contextual hints in the persona to infer "
+    "values accurately, even if they are not explicitly stated."
+       )
+    
+    query = (
+        
+        f"Based on the following user persona:\n'{user_persona}', "
+        
+        "please generate suitable values for each parameter in the function schema."
+        
+        "Provide values that match the type and purpose described for each parameter, using any relevant "
+        
+        "details from the persona to fill in or infer each parameter’s value."
+     )  
+
+    parameters = function_schema.get("properties", {})
+    required_params = function_schema.get("required", [])
+
+    response_schema = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": f"{function_schema.get('name', 'default_function')}_arguments_schema",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    param_name: dict(
+                        {key: value for key, value in param_details.items() if key != "default"},
+                        type=param_details.get("type", "string"),
+                        description=param_details.get("description", "")
+                    )
+                    for param_name, param_details in parameters.items()
+                },
+                "required": required_params,
+                "additionalProperties": False
+            }
+        }
+    }
+    return system_instruction, query, response_schema
@@ -30,6 +30,10 @@ class KpiSchema(BaseModel):
   expected_value: str
 
 
+class KpisSchema(BaseModel):
+  kpis: list[KpiSchema]
+
+
 class ReportSchema(BaseModel):
   user_persona: str
   specific_needs: list[str]
@@ -236,6 +240,43 @@ api_tree_schema = {
         }
        }
 
+branch_scores_schema = {
+           "type": "json_schema",
+           "json_schema": {
+               "name" : "branch_scores_schema",
+               "schema": {
+               "type": "object",
+               "properties": {
+                   "scores": {
+                       "type": "array",
+                       "description": "One entry for every option, scored independently.",
+                       "items": {
+                           "type": "object",
+                           "properties": {
+                               "option": {
+                                   "type": "string",
+                                   "description": "The option being scored, exactly as given."
+                               },
+                               "confidence_score": {
+                                   "type": "number",
+                                   "description": "The confidence, between 0 and 1, that the option is relevant to the query."
+                               },
+                               "score_reason": {
+                                   "type": "string",
+                                   "description": "The reason the score was given."
+                               }
+                           },
+                           "required": ["option", "confidence_score", "score_reason"],
+                           "additionalProperties": False
+                       }
+                   }
+               },
+               "required": ["scores"],
+               "additionalProperties": False
+           }
+        }
+       }
+
 step_schema = {
            "type": "json_schema",
            "json_schema": {
@@ -1,6 +1,6 @@
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
+from infrastructure.api_signature_index import get_api_signature_index
 import json
-import os
 class OpenAIFunctionCallingService:
     """
     A service class for mapping and invoking class methods based on LLM (Language Learning Model)
@@ -10,20 +10,31 @@ class OpenAIFunctionCallingService:
     
     def get_function_map(self, class_instance):
         """
-        Retrieves all callable methods from the class instance, excluding special methods 
-        (those starting with '__').
+        Retrieves all public methods of the class instance. The method names come from the API
+        signature index, so the class is only reflected once per process.
         
         :param class_instance: An instance of the class whose methods are being mapped.
         :return: A dictionary mapping method names to callable methods.
         """
         try:
-            methods = {method_name: getattr(class_instance, method_name) 
-                       for method_name in dir(class_instance) 
-                       if callable(getattr(class_instance, method_name)) and not method_name.startswith("__") and not method_name.startswith("_")}
-            return methods
+            return get_api_signature_index().function_map(class_instance)
         except Exception as e:
             raise RuntimeError(f"Error retrieving method map: {str(e)}")
 
+    def get_functions_schema(self, class_instance, handwritten_schema=None):
+        """
+        Retrieves the tool schemas of the methods of the class instance, reconciling the hand-written
+        schemas of endpoints_schema with the methods that actually exist.
+
+        :param class_instance: An instance of the class whose methods are described.
+        :param handwritten_schema: The hand-written schemas of the class in endpoints_schema, if any.
+        :return: A list of function tool schemas.
+        """
+        try:
+            return get_api_signature_index().tool_schemas(class_instance, handwritten_schema)
+        except Exception as e:
+            raise RuntimeError(f"Error retrieving functions schema: {str(e)}")
+
     
     def call_function(self, function_call, functions):
         """
@@ -68,8 +79,7 @@ class OpenAIFunctionCallingService:
         :param functions_map: The dictionary mapping function names to their callable endpoints.
         :return: The result of the executed function if applicable.
         """
-        api_key = os.getenv('OPENAI_API_KEY')
-        llm_service = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=api_key)
+        llm_service = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
         response = llm_service.generate_content_with_tools(query, functions_schema)
         if response:
             
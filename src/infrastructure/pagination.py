@@ -0,0 +1,91 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool fetching the next pages of paginated results, with
+    PAGINATION_PREFETCH_WORKERS threads.
+    """
+    global _prefetch_executor
+    if _prefetch_executor is not None:
+        return _prefetch_executor
+
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("PAGINATION_PREFETCH_WORKERS", "8")),
+                thread_name_prefix="pagination-prefetch",
+            )
+        return _prefetch_executor
+
+
+def paginate(fetch_page: Callable[[Any], Tuple[List[Any], Any]], start: Any = None,
+             prefetch: bool = True) -> Iterator[Any]:
+    """
+    Lazily iterates over the items of a paginated result. Only the page being consumed and the next
+    one are held in memory, so scanning a large result set keeps memory flat, and callers can stop
+    early by breaking out of the loop; no page after the next one is fetched.
+
+    While the items of a page are consumed, the next page is fetched on the prefetch pool, so the
+    caller does not wait for a round trip on every page.
+
+    :param fetch_page: Called with the cursor of a page: the start value for the first page, then
+                       what the previous call returned. Returns the items of the page and the cursor
+                       of the next page, or None after the last page.
+    :param start: The cursor of the first page.
+    :param prefetch: Whether the next page is fetched while the current one is consumed.
+    """
+    pending: Optional[Future] = None
+    try:
+        items, cursor = fetch_page(start)
+        while True:
+            if cursor is not None and prefetch:
+                # The page is fetched in the caller's context, e.g. with its response cache policy.
+                pending = get_prefetch_executor().submit(contextvars.copy_context().run, fetch_page, cursor)
+            yield from items
+
+            if cursor is None:
+                return
+            if pending is not None:
+                items, cursor = pending.result()
+                pending = None
+            else:
+                items, cursor = fetch_page(cursor)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def paginate_by_page_number(fetch_page: Callable[[int], List[Any]], page_size: int, first_page: int = 1,
+                            prefetch: bool = True) -> Iterator[Any]:
+    """
+    paginate for APIs numbering their pages: fetch_page is called with a page number and returns the
+    items of that page. A page with fewer than page_size items is the last one.
+    """
+    def fetch(page: int) -> Tuple[List[Any], Optional[int]]:
+        items = fetch_page(page)
+        return items, page + 1 if len(items) >= page_size else None
+
+    return paginate(fetch, first_page, prefetch)
+
+
+def page_items(data: Any, key: str = None) -> List[Any]:
+    """
+    :return: The items of a page of results: the page itself when it is a list, its `key` entry, or
+             else its first list entry. Empty when the page has no items.
+    """
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    if key is not None:
+        return data.get(key) or []
+    return next((value for value in data.values() if isinstance(value, list)), [])
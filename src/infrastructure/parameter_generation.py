@@ -8,12 +8,12 @@ from flask import session
 from infrastructure.embedding_service import UserEmbeddingService
 from infrastructure.repositories.self_reflection_repository import SelfReflectionRepository
 from infrastructure.api_trees import API_Utils
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.execution_plan_cache import is_run_dependent_argument
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
 
 
-api_key= os.getenv("OPENAI_API_KEY")
 self_reflection_repository = SelfReflectionRepository()
-llm = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=api_key)
+llm = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
 
 class Parameter_Generation:
 
@@ -48,11 +48,18 @@ class Parameter_Generation:
         data = user_info.retrieve_user_info(query=query, user_id=self_reflection_id )    
         return data
                
-    def generate_arguments(self, parameters: list , function: str) -> tuple[bool,dict]:
+    def generate_arguments(self, parameters: list , function: str, run_dependent: list = None) -> tuple[bool,dict]:
+        """
+        :param run_dependent: When given, filled with the names of the generated arguments that depend on
+                              the run. The single call mode has the LLM that generates them judge it; the
+                              other mode guesses it from the names, see is_run_dependent_argument.
+        """
         user_info, user_id = self.extract_user_persona()
         query = f'Identify any relevant information that correspondece to the user preference, which is {user_info} to call the function {function}'
         user_data = self.get_user_info(query,user_id)
-        function_schema= llm.generate_function_schema(function_name=function, parameter_names=parameters)
+        function_schema= llm.generate_function_schema(function_name=getattr(function, '__name__', str(function)), parameter_names=parameters, function=function)
+        if os.getenv("ARGUMENT_GENERATION_MODE", "single").lower() == "single":
+            return self.generate_scored_arguments(parameters, function_schema, user_data, run_dependent=run_dependent)
         arguments = llm.generate_parameters_for_function(function_schema=function_schema, user_persona=user_data)
         final_arguments = {}
         user_prompts = {}
@@ -73,6 +80,8 @@ class Parameter_Generation:
                 print(is_valid, message)
                 if is_valid:
                     final_arguments[parameter_name] = value
+                    if run_dependent is not None and is_run_dependent_argument(parameter_name, value):
+                        run_dependent.append(parameter_name)
                 else:
                     print(f"Low confidence for parameter '{parameter_name}'. Prompting user for additional input.")
                     user_prompt_message = (
@@ -94,6 +103,108 @@ class Parameter_Generation:
             return True, final_arguments
         else:
             return False, user_prompts
+
+    def generate_scored_arguments(self, parameters: list, function_schema: dict, user_data, threshold: float = 0.7,
+                                  run_dependent: list = None) -> tuple[bool, dict]:
+        """
+        Generates the arguments of a function and their confidence scores in a single LLM call, then
+        validates the type of every value locally instead of asking the LLM to score each parameter.
+
+        :param parameters: The names of the parameters to generate.
+        :param function_schema: The JSON schema of the function, see generate_function_schema.
+        :param user_data: The user information relevant to the function.
+        :param threshold: Minimum acceptable confidence score.
+        :param run_dependent: When given, filled with the names of the arguments the LLM flagged as
+                              depending on the run.
+        :return: (True, arguments) when every argument is valid and confident enough, otherwise
+                 (False, prompts) with a message for each parameter that needs user input, explaining
+                 why with the rationale of the LLM.
+        """
+        try:
+            arguments = llm.generate_scored_parameters_for_function(function_schema=function_schema, user_persona=user_data)
+        except Exception as e:
+            print(f"Error generating scored arguments: {e}")
+            arguments = {}
+
+        properties = function_schema.get("properties", {})
+        final_arguments = {}
+        user_prompts = {}
+        for parameter_name in parameters:
+            generated = arguments.get(parameter_name)
+            if not isinstance(generated, dict) or "value" not in generated:
+                print(f"Parameter '{parameter_name}' was not generated. Prompting user for additional input.")
+                user_prompts[parameter_name] = (
+                    f"The parameter '{parameter_name}' is missing from the generated results. "
+                    "Please provide the necessary details to continue."
+                )
+                continue
+
+            is_valid, value = self.validate_argument_type(generated["value"], properties.get(parameter_name, {}))
+            try:
+                confidence = max(0.0, min(1.0, float(generated.get("confidence", 0.0))))
+            except (TypeError, ValueError):
+                confidence = 0.0
+            if is_valid and confidence >= threshold:
+                final_arguments[parameter_name] = value
+                if run_dependent is not None and generated.get("run_dependent") is True:
+                    run_dependent.append(parameter_name)
+                continue
+
+            print(f"Low confidence for parameter '{parameter_name}'. Prompting user for additional input.")
+            if not is_valid:
+                reason = f"The generated value {generated['value']!r} does not match its expected type."
+            else:
+                reason = str(generated.get("rationale") or "").strip() or f"The confidence in the generated value is only {confidence:.2f}."
+            user_prompts[parameter_name] = (
+                f"The parameter '{parameter_name}' requires additional input to proceed. {reason} "
+                "Please provide the necessary details to continue."
+            )
+
+        if user_prompts:
+            return False, user_prompts
+        return True, final_arguments
+
+    @staticmethod
+    def validate_argument_type(value: Any, parameter_schema: dict) -> Tuple[bool, Any]:
+        """
+        Checks a generated value against the JSON schema type of its parameter. Numbers and booleans
+        generated as strings are converted.
+
+        :return: A tuple of whether the value is valid and the (possibly converted) value.
+        """
+        types = parameter_schema.get("type")
+        if not types:
+            return True, value
+        types = types if isinstance(types, list) else [types]
+        if value is None:
+            return "null" in types, value
+        if "enum" in parameter_schema and value not in parameter_schema["enum"]:
+            return False, value
+
+        for expected in types:
+            if expected == "string" and isinstance(value, str):
+                return True, value
+            if expected == "boolean":
+                if isinstance(value, bool):
+                    return True, value
+                if isinstance(value, str) and value.lower() in ("true", "false"):
+                    return True, value.lower() == "true"
+            if expected in ("integer", "number") and not isinstance(value, bool):
+                if isinstance(value, int) or (expected == "number" and isinstance(value, float)):
+                    return True, value
+                if isinstance(value, float) and value.is_integer():
+                    return True, int(value)
+                if isinstance(value, str):
+                    try:
+                        return True, int(value) if expected == "integer" else float(value)
+                    except ValueError:
+                        pass
+            if expected == "array" and isinstance(value, list):
+                return True, value
+            if expected == "object" and isinstance(value, dict):
+                return True, value
+        return False, value
+
     def check_confidence_score(
         self, 
         parameter_name: str, 
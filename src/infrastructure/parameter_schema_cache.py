@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from infrastructure.data_dir import data_path
+
+
+class ParameterSchemaCache:
+    """
+    Persistent store of the parameter details the LLM generated for untyped endpoint parameters.
+    Typed parameters are described from their signature, so only the parameters without a type
+    hint ever reach the LLM, and each of them only once: later invocations of the endpoint, in
+    this process or the next, read the stored details instead.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS parameter_schemas ("
+                "endpoint TEXT NOT NULL, parameter TEXT NOT NULL, schema TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (endpoint, parameter))"
+            )
+            self._connection.commit()
+
+    def get(self, endpoint: str, parameter: str) -> Optional[Dict[str, Any]]:
+        """
+        :param endpoint: Identifier of the endpoint, see ApiSignatureIndex.endpoint_key.
+        :return: The stored schema of the parameter, or None when there is none.
+        """
+        key = (endpoint, parameter)
+        with self._lock:
+            if key in self._memory:
+                return dict(self._memory[key])
+            row = self._connection.execute(
+                "SELECT schema FROM parameter_schemas WHERE endpoint = ? AND parameter = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._memory[key] = json.loads(row[0])
+            return dict(self._memory[key])
+
+    def set(self, endpoint: str, parameter: str, schema: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parameter_schemas (endpoint, parameter, schema, created_at) VALUES (?, ?, ?, ?)",
+                (endpoint, parameter, json.dumps(schema), time.time()),
+            )
+            self._connection.commit()
+            self._memory[(endpoint, parameter)] = dict(schema)
+
+
+_default_cache: Optional[ParameterSchemaCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parameter_schema_cache() -> ParameterSchemaCache:
+    """
+    Returns the process-wide parameter schema cache stored at PARAMETER_SCHEMA_SQLITE_PATH
+    (parameter_schemas.sqlite3 in the data directory by default, see data_path).
+    """
+    global _default_cache
+    if _default_cache is not None:
+        return _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParameterSchemaCache(
+                os.getenv("PARAMETER_SCHEMA_SQLITE_PATH") or data_path("parameter_schemas.sqlite3"))
+        return _default_cache
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Documented limits of the upstream APIs, as (requests, per seconds). RATE_LIMITS overrides them.
+DEFAULT_HOST_LIMITS: Dict[str, Tuple[float, float]] = {
+    "www.alphavantage.co": (5, 60),
+    "api.github.com": (5000, 3600),
+    "newsapi.org": (100, 24 * 3600),
+    "gnews.io": (100, 24 * 3600),
+}
+
+# Request parameters and headers that carry credentials. Requests made with different credentials
+# are limited separately, since upstream quotas are per key.
+CREDENTIAL_NAMES = ("authorization", "x-api-key", "apikey", "api_key", "api-key", "access_key", "key", "token", "access_token")
+
+
+def jittered_backoff(attempt: int, base: float = None, cap: float = None) -> float:
+    """
+    Returns a delay for the given retry attempt, starting at 0, drawn uniformly between zero and an
+    exponentially growing bound ("full jitter"), so concurrent callers do not retry in lockstep.
+    """
+    base = base if base is not None else float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+    cap = cap if cap is not None else float(os.getenv("HTTP_MAX_BACKOFF_SECONDS", "30"))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    :param value: A Retry-After header, in seconds or as an HTTP date.
+    :return: The seconds to wait, or None when the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per `per` seconds, with bursts of up to `capacity`, or any
+    number of requests when rate is None. A bucket can also be paused until a given time, e.g. when
+    the host asked to retry later.
+    """
+
+    def __init__(self, rate: Optional[float], per: float, capacity: float = None):
+        self.fill_rate = rate / per if rate is not None else None
+        self.capacity = capacity if capacity is not None else max(1.0, rate or 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Takes a token, waiting for one to be available.
+
+        :param timeout: Maximum seconds to wait. Waits as long as needed when None.
+        :return: Whether a token was taken.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self.fill_rate is None:
+                    if now >= self._paused_until:
+                        return True
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.fill_rate)
+                    self._updated_at = now
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = max(self._paused_until - now, (1 - self._tokens) / self.fill_rate, 0.01)
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self._condition.wait(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for the given number of seconds."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """
+    Rate limits the requests of the process per upstream host and credential, with one token bucket
+    each, shared by every thread. Limits come from DEFAULT_HOST_LIMITS, RATE_LIMITS and, for other
+    hosts, RATE_LIMIT_DEFAULT; without one, other hosts are not limited, so fan-outs to hosts without a
+    documented quota are not slowed down. Rate limit responses and headers pause the bucket they apply to,
+    whether the host is limited or not:
+    Retry-After on 429 and 503 responses, and X-RateLimit-Remaining reaching zero until
+    X-RateLimit-Reset.
+    """
+
+    def __init__(self, host_limits: Dict[str, Tuple[float, float]] = None, default_limit: Tuple[float, float] = None):
+        self.host_limits = dict(DEFAULT_HOST_LIMITS)
+        self.host_limits.update(host_limits if host_limits is not None else self._parse_limits(os.getenv("RATE_LIMITS", "")))
+        default = os.getenv("RATE_LIMIT_DEFAULT", "")
+        self.default_limit = default_limit or (self._parse_limit(default) if default else (None, 1.0))
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_limit(value: str) -> Tuple[float, float]:
+        rate, _, per = value.partition("/")
+        return float(rate), float(per or 1)
+
+    @classmethod
+    def _parse_limits(cls, value: str) -> Dict[str, Tuple[float, float]]:
+        """Parses "host=requests/seconds,host=requests/seconds"."""
+        limits = {}
+        for item in value.split(","):
+            host, _, limit = item.strip().partition("=")
+            if host and limit:
+                limits[host] = cls._parse_limit(limit)
+        return limits
+
+    @staticmethod
+    def key_for(url: str, params: Any = None, headers: Any = None) -> Tuple[str, str]:
+        """
+        :return: The (host, credential hash) a request is limited under.
+        """
+        credentials = []
+        for values in (headers, params):
+            if isinstance(values, dict):
+                credentials.extend(f"{name}={value}" for name, value in values.items()
+                                   if str(name).lower() in CREDENTIAL_NAMES)
+        credential = hashlib.sha256("&".join(sorted(credentials)).encode("utf-8")).hexdigest()[:16] if credentials else ""
+        return urlsplit(url).hostname or "", credential
+
+    def bucket(self, key: Tuple[str, str]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, per = self.host_limits.get(key[0], self.default_limit)
+                bucket = TokenBucket(rate, per)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, key: Tuple[str, str], timeout: float = None) -> bool:
+        return self.bucket(key).acquire(timeout)
+
+    def observe(self, key: Tuple[str, str], response: Any) -> Optional[float]:
+        """
+        Pauses the bucket of a request according to the rate limit information of its response.
+
+        :return: The seconds the host asked to wait, or None when it did not.
+        """
+        headers = response.headers
+        delay = None
+        if response.status_code in (429, 503):
+            delay = parse_retry_after(headers.get("Retry-After"))
+        if delay is None and headers.get("X-RateLimit-Remaining") == "0":
+            reset = headers.get("X-RateLimit-Reset")
+            try:
+                # Usually an epoch timestamp; some hosts send the seconds left instead.
+                reset = float(reset)
+                delay = max(0.0, reset - time.time()) if reset > 1e9 else reset
+            except (TypeError, ValueError):
+                delay = None
+        if delay:
+            print(f"Rate limited by {key[0]}, pausing its requests for {delay:.1f}s")
+            self.bucket(key).pause(delay)
+        return delay
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Returns the process-wide rate limiter, or None when RATE_LIMITING_ENABLED is set to false.
+    """
+    global _default_limiter
+    if os.getenv("RATE_LIMITING_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_limiter is not None:
+        return _default_limiter
+
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
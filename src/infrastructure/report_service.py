@@ -4,15 +4,13 @@ from datetime import datetime
 from typing import List, Dict
 from infrastructure.pub_service import PubSubService
 from domain.models.report import Report
-from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
 
 
 class ReportGeneration:
     def __init__(self):
         self.pubsub_service = PubSubService(project_id="refined-analogy-435508-n3")
-        self.llm = OpenAiLLMService(
-            model_name="gpt-4o-2024-08-06", api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.llm = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
 
     def get_executions(self) -> List[Dict]:
         """
@@ -0,0 +1,64 @@
+from datetime import datetime
+from google.cloud import firestore
+
+from domain.models.agent_creation_job import AgentCreationJob
+
+
+class AgentCreationJobRepository:
+    def __init__(self):
+        self.database = firestore.Client(database='agent-square')
+        self._collection_name = "agent_creation_jobs"
+        self._checkpoints_collection_name = "checkpoints"
+
+    def create_job(self, job_data: AgentCreationJob) -> None:
+        try:
+            self.database.collection(self._collection_name).document(job_data.id).set(job_data.to_dict())
+        except Exception as e:
+            raise e
+
+    def get_job(self, job_id: str) -> AgentCreationJob:
+        """
+        Retrieves a job along with its checkpoints, or None if it does not exist.
+        """
+        try:
+            job_ref = self.database.collection(self._collection_name).document(job_id)
+            job = job_ref.get()
+            if not job.exists:
+                return None
+            checkpoints = {
+                checkpoint.id: checkpoint.to_dict()["value"]
+                for checkpoint in job_ref.collection(self._checkpoints_collection_name).stream()
+            }
+            return AgentCreationJob.from_dict(job.to_dict(), checkpoints)
+        except Exception as e:
+            raise e
+
+    def update_job_status(self, job_id: str, status: str, error: str = None) -> None:
+        try:
+            self.database.collection(self._collection_name).document(job_id).update({
+                "status": status,
+                "error": error,
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+        except Exception as e:
+            raise e
+
+    def save_checkpoint(self, job_id: str, key: str, value) -> None:
+        """
+        Stores the result of a completed node. Each checkpoint is its own document so concurrent
+        nodes never overwrite each other and a job document never grows past the size limit.
+        """
+        try:
+            self.database.collection(self._collection_name).document(job_id) \
+                .collection(self._checkpoints_collection_name).document(key).set({"value": value})
+        except Exception as e:
+            raise e
+
+    def delete_job(self, job_id: str) -> None:
+        try:
+            job_ref = self.database.collection(self._collection_name).document(job_id)
+            for checkpoint in job_ref.collection(self._checkpoints_collection_name).stream():
+                checkpoint.reference.delete()
+            job_ref.delete()
+        except Exception as e:
+            raise e
@@ -4,7 +4,7 @@ from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 from domain.models.executions import ModuleExecution
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 import uuid
 from datetime import datetime
 
@@ -22,6 +22,20 @@ class ModuleExecutionRepository:
         except Exception as e:
             raise e
 
+    def create_executions(self, executions: List[ModuleExecution]) -> None:
+        """
+        Adds several execution records in a single batched write. Records are stored by agent ID, so
+        when several executions belong to the same agent the last one is kept, as with create_execution.
+        """
+        try:
+            latest = {execution.agent_id: execution for execution in executions}
+            batch = self.database.batch()
+            for agent_id, execution in latest.items():
+                batch.set(self.database.collection(self._collection_name).document(agent_id), execution.to_dict())
+            batch.commit()
+        except Exception as e:
+            raise e
+
     def get_execution(self, agent_id: str) -> ModuleExecution:
         """
         Retrieves a single execution record by execution_id.
@@ -0,0 +1,224 @@
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from infrastructure.data_dir import data_path
+
+
+class CachePolicy:
+    """
+    How the GET responses of an endpoint are cached.
+
+    :param ttl: Seconds a cached response is served without contacting the host.
+    :param ignore_params: Query parameters left out of the cache key, e.g. cache busters.
+    :param revalidate: Whether an expired response is revalidated with If-None-Match or
+                       If-Modified-Since when the host sent an ETag or a Last-Modified date.
+    """
+
+    def __init__(self, ttl: float, ignore_params: Iterable[str] = (), revalidate: bool = True):
+        self.ttl = ttl
+        self.ignore_params = frozenset(ignore_params)
+        self.revalidate = revalidate
+
+
+_active_policy: contextvars.ContextVar = contextvars.ContextVar("response_cache_policy", default=None)
+
+
+def active_cache_policy() -> Optional[CachePolicy]:
+    """
+    :return: The cache policy of the endpoint running in the current context, if any.
+    """
+    return _active_policy.get()
+
+
+def cached_endpoint(ttl: float, ignore_params: Iterable[str] = (), revalidate: bool = True):
+    """
+    Declares the GET responses an API client method fetches through the shared HTTP transport as
+    cacheable with the given policy, see CachePolicy. The method itself still runs on every call, so
+    its parsing and error handling are unchanged; only the HTTP round trips are served from the cache.
+    """
+    policy = CachePolicy(ttl, ignore_params, revalidate)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _active_policy.set(policy)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _active_policy.reset(token)
+
+        wrapper.cache_policy = policy
+        return wrapper
+
+    return decorator
+
+
+class ResponseCache:
+    """
+    Two tier cache of HTTP responses: a size-bounded in-memory LRU in front of a SQLite file shared by
+    the workers of an instance. Entries are keyed by the URL, the query parameters and a hash of the
+    request headers, so responses fetched with different credentials are never shared. Only successful
+    responses are cached. Expired entries are kept so they can be revalidated with the host.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+        self._connection = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            with self._lock:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS http_responses ("
+                    "key TEXT PRIMARY KEY, entry TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._connection.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Any, headers: Any, policy: CachePolicy) -> str:
+        if isinstance(params, dict):
+            params = {name: value for name, value in params.items()
+                      if name not in policy.ignore_params and value is not None}
+        key = {
+            "url": url,
+            "params": params,
+            "headers": dict(headers or {}),
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self._connection is None:
+                return None
+            row = self._connection.execute("SELECT entry FROM http_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = json.loads(row[0])
+            self._remember(key, entry)
+            return entry
+
+    def _set_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, entry)
+            self._stats["stores"] += 1
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO http_responses (key, entry, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(entry), time.time()),
+                )
+                self._connection.commit()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def fetch(self, send: Callable[..., requests.Response], url: str, policy: CachePolicy, **kwargs) -> requests.Response:
+        """
+        Returns the response of a GET request from the cache, revalidating or refetching it through
+        send(url, **kwargs) when it expired.
+        """
+        key = self.make_key(url, kwargs.get("params"), kwargs.get("headers"), policy)
+        entry = self._get_entry(key)
+        if entry is not None and time.time() - entry["stored_at"] < policy.ttl:
+            with self._lock:
+                self._stats["hits"] += 1
+            return self._to_response(entry)
+
+        if entry is not None and policy.revalidate and (entry.get("etag") or entry.get("last_modified")):
+            headers = dict(kwargs.get("headers") or {})
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            response = send(url, **dict(kwargs, headers=headers))
+            if response.status_code == 304:
+                entry = dict(entry, stored_at=time.time())
+                self._set_entry(key, entry)
+                with self._lock:
+                    self._stats["revalidated"] += 1
+                return self._to_response(entry)
+        else:
+            response = send(url, **kwargs)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        if response.status_code == 200:
+            self._set_entry(key, self._to_entry(response))
+        return response
+
+    @staticmethod
+    def _to_entry(response: requests.Response) -> Dict[str, Any]:
+        return {
+            "status_code": response.status_code,
+            "url": response.url,
+            "headers": dict(response.headers),
+            "content": response.content.decode("latin-1"),
+            "encoding": response.encoding,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"].encode("latin-1")
+        response.encoding = entry["encoding"]
+        response.reason = "OK"
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide HTTP response cache, or None when RESPONSE_CACHE_ENABLED is set to false.
+    The in-memory tier holds RESPONSE_CACHE_MAX_ENTRIES responses; the disk tier is stored at
+    RESPONSE_CACHE_SQLITE_PATH (http_response_cache.sqlite3 in the data directory when it is not set,
+    see data_path), and is disabled when that is set to an empty value.
+    """
+    global _default_cache
+    if os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is not None:
+        return _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            sqlite_path = os.getenv("RESPONSE_CACHE_SQLITE_PATH")
+            _default_cache = ResponseCache(
+                data_path("http_response_cache.sqlite3") if sqlite_path is None else sqlite_path,
+                max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+            )
+        return _default_cache
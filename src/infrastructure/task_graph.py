@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List
+
+
+class TaskGraph:
+    """
+    Runs a dependency graph of tasks on a bounded thread pool. A task schedules its dependents from
+    its completion callback, so a child starts as soon as its own parent is done instead of waiting
+    for every node of the parent's level. Workers never block on other tasks, which keeps the pool
+    free of deadlocks however deep the graph is.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._errors: List[BaseException] = []
+
+    def submit(self, func: Callable[..., Any], *args, on_done: Callable[[Any], None] = None) -> None:
+        """
+        Schedules func(*args). When it succeeds, on_done is called with its result and may submit
+        further tasks. The first failure stops new tasks from being scheduled.
+        """
+        with self._condition:
+            if self._errors:
+                return
+            self._pending += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(lambda done: self._complete(done, on_done))
+
+    def _complete(self, future: Future, on_done: Callable[[Any], None]) -> None:
+        try:
+            result = future.result()
+            if on_done is not None:
+                on_done(result)
+        except BaseException as e:
+            with self._condition:
+                self._errors.append(e)
+        finally:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+
+    def wait(self) -> None:
+        """Blocks until every scheduled task is done, then re-raises the first failure if any."""
+        try:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending == 0)
+        finally:
+            self._executor.shutdown(wait=True)
+        if self._errors:
+            raise self._errors[0]
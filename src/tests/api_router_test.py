@@ -0,0 +1,113 @@
+import math
+
+import pytest
+
+pytest.importorskip("chromadb")
+api_router = pytest.importorskip("infrastructure.api_router")
+
+TREE = {
+    "Finance": {"Stocks": "StockApi", "Crypto": "CryptoApi"},
+    "Weather": {"Forecast": "WeatherApi"},
+}
+
+# Cosine similarity of each API's document with the query.
+SIMILARITIES = {"Stocks": 0.9, "Crypto": 0.63, "Forecast": 0.5}
+
+
+class FakeEmbeddingFunction:
+    def __init__(self):
+        self.embedded = []
+
+    def __call__(self, texts):
+        self.embedded.extend(texts)
+        vectors = []
+        for text in texts:
+            similarity = next((value for name, value in SIMILARITIES.items() if name in text), 1.0)
+            vectors.append([similarity, math.sqrt(1 - similarity * similarity)])
+        return vectors
+
+
+def make_router(**kwargs):
+    kwargs.setdefault("ambiguity_margin", 0.05)
+    kwargs.setdefault("embeddings_cache_path", "")
+    return api_router.EmbeddingApiRouter(
+        TREE,
+        embedding_function=FakeEmbeddingFunction(),
+        similarity_floor=0.45,
+        similarity_ceiling=0.8,
+        include_endpoints=False,
+        **kwargs)
+
+
+def refuse_llm(query, candidates):
+    raise AssertionError("The LLM must not be asked")
+
+
+def test_similarities_are_calibrated_between_floor_and_ceiling():
+    router = make_router()
+
+    assert router.confidence(0.2) == 0.0
+    assert router.confidence(0.45) == 0.0
+    assert router.confidence(0.625) == pytest.approx(0.5)
+    assert router.confidence(0.8) == 1.0
+    assert router.confidence(0.95) == 1.0
+
+
+def test_apis_are_scored_best_first():
+    router = make_router()
+
+    assert [api_name for api_name, _ in router.score("query")] == ["StockApi", "CryptoApi", "WeatherApi"]
+
+
+def test_apis_reaching_the_threshold_are_selected_without_the_llm():
+    router = make_router()
+    router._choose_with_llm = refuse_llm
+
+    assert router.route("query", threshold=0.6) == [("StockApi", 1.0)]
+
+
+def test_top_apis_are_returned_when_none_reaches_the_threshold():
+    router = make_router(max_apis=2)
+    router._choose_with_llm = refuse_llm
+
+    assert [api_name for api_name, _ in router.route("query", threshold=1.1)] == ["StockApi", "CryptoApi"]
+
+
+def test_llm_decides_only_about_borderline_apis():
+    router = make_router()
+    asked = []
+
+    def choose(query, candidates):
+        asked.append(candidates)
+        return ["CryptoApi"]
+
+    router._choose_with_llm = choose
+    routed = router.route("query", threshold=0.55)
+
+    assert asked == [["CryptoApi"]]
+    assert [api_name for api_name, _ in routed] == ["StockApi", "CryptoApi"]
+
+
+def test_borderline_apis_rejected_by_the_llm_are_dropped():
+    router = make_router()
+    router._choose_with_llm = lambda query, candidates: []
+
+    assert [api_name for api_name, _ in router.route("query", threshold=0.55)] == ["StockApi"]
+
+
+def test_borderline_apis_fall_back_to_their_confidence_when_the_llm_fails():
+    router = make_router()
+    router._choose_with_llm = lambda query, candidates: None
+
+    assert [api_name for api_name, _ in router.route("query", threshold=0.5)] == ["StockApi", "CryptoApi"]
+    assert [api_name for api_name, _ in router.route("query", threshold=0.55)] == ["StockApi"]
+
+
+def test_document_embeddings_are_reused_from_disk(tmp_path):
+    path = str(tmp_path / "embeddings.json")
+    make_router(embeddings_cache_path=path).score("query")
+
+    router = make_router(embeddings_cache_path=path)
+    router.score("query")
+
+    assert router.embedding_function.embedded == ["query"]
@@ -0,0 +1,80 @@
+from infrastructure.endpoint_selection_cache import EndpointSelectionCache, api_method_set_version
+
+
+class WeatherApi:
+    def get_forecast(self, city: str, days: int = 3):
+        pass
+
+    def _request(self, path):
+        pass
+
+
+class WeatherApiWithAlerts(WeatherApi):
+    def get_alerts(self, city: str):
+        pass
+
+
+class WeatherApiWithNewSignature:
+    def get_forecast(self, city: str, days: int = 3, units: str = "metric"):
+        pass
+
+
+def test_version_changes_with_the_public_method_set():
+    version = api_method_set_version(WeatherApi())
+
+    assert version == api_method_set_version(WeatherApi())
+    assert version != api_method_set_version(WeatherApiWithAlerts())
+    assert version != api_method_set_version(WeatherApiWithNewSignature())
+
+
+def test_version_ignores_private_methods():
+    class WeatherApiWithHelper(WeatherApi):
+        def _parse(self, response):
+            pass
+
+    assert api_method_set_version(WeatherApiWithHelper()) == api_method_set_version(WeatherApi())
+
+
+def test_selection_is_returned_for_the_same_step_and_version(tmp_path):
+    cache = EndpointSelectionCache(str(tmp_path / "endpoints.sqlite3"))
+    version = api_method_set_version(WeatherApi())
+
+    assert cache.set("Get the  Forecast for Paris", "WeatherApi", version, "get_forecast", ["city"], 0.9, "match")
+
+    selection = cache.get("get the forecast for paris", "WeatherApi", version)
+    assert selection == {
+        "endpoint_name": "get_forecast",
+        "parameters": ["city"],
+        "confidence": 0.9,
+        "score_reason": "match",
+    }
+    assert cache.get("Get the forecast for Paris", "OtherApi", version) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "stale": 0, "stores": 1}
+
+
+def test_selection_of_another_method_set_version_is_stale(tmp_path):
+    path = str(tmp_path / "endpoints.sqlite3")
+    EndpointSelectionCache(path).set("Get the forecast", "WeatherApi", api_method_set_version(WeatherApi()),
+                                     "get_forecast", ["city"], 0.95)
+
+    cache = EndpointSelectionCache(path)
+    assert cache.get("Get the forecast", "WeatherApi", api_method_set_version(WeatherApiWithAlerts())) is None
+    assert cache.stats()["stale"] == 1
+    assert cache.get("Get the forecast", "WeatherApi", api_method_set_version(WeatherApi())) is not None
+
+
+def test_unconfident_selections_are_not_stored(tmp_path):
+    cache = EndpointSelectionCache(str(tmp_path / "endpoints.sqlite3"), min_confidence=0.85)
+
+    assert not cache.set("Get the forecast", "WeatherApi", "v1", "get_forecast", ["city"], 0.8)
+    assert not cache.set("Get the forecast", "WeatherApi", "v1", "get_forecast", ["city"], None)
+    assert cache.get("Get the forecast", "WeatherApi", "v1") is None
+
+
+def test_invalidated_selection_is_a_miss(tmp_path):
+    cache = EndpointSelectionCache(str(tmp_path / "endpoints.sqlite3"))
+    cache.set("Get the forecast", "WeatherApi", "v1", "get_forecast", ["city"], 0.9)
+
+    cache.invalidate("Get the forecast", "WeatherApi")
+
+    assert cache.get("Get the forecast", "WeatherApi", "v1") is None
@@ -0,0 +1,86 @@
+import sqlite3
+
+from infrastructure.execution_plan_cache import ExecutionPlanCache, is_run_dependent_argument, split_plan_arguments
+
+
+def list_posts(post_id, to_currency, startDate, q, limit=10):
+    pass
+
+
+def test_run_dependent_names_are_matched_whole():
+    assert is_run_dependent_argument("startDate", "x")
+    assert is_run_dependent_argument("end_time", "x")
+    assert is_run_dependent_argument("message", "x")
+    assert not is_run_dependent_argument("post_id", "x")
+    assert not is_run_dependent_argument("to_currency", "EUR")
+    assert not is_run_dependent_argument("update_mode", "x")
+
+
+def test_dates_are_run_dependent_whatever_their_name():
+    assert is_run_dependent_argument("q", "2024-05-01")
+    assert is_run_dependent_argument("q", "2024-05-01T10:00:00Z")
+    assert not is_run_dependent_argument("q", "weather in Paris")
+    assert not is_run_dependent_argument("q", 20240501)
+
+
+def test_arguments_are_split_by_name_without_flags():
+    arguments = {"post_id": "42", "to_currency": "EUR", "startDate": "yesterday", "q": "news", "limit": 10}
+
+    static, regenerate = split_plan_arguments(list_posts, arguments)
+
+    assert regenerate == ["startDate"]
+    assert static == {"post_id": "42", "to_currency": "EUR", "q": "news", "limit": 10}
+
+
+def test_flagged_arguments_are_the_only_ones_generated_again():
+    arguments = {"post_id": "42", "startDate": "yesterday", "q": "news", "limit": 10}
+
+    static, regenerate = split_plan_arguments(list_posts, arguments, run_dependent=["q", "limit"])
+
+    # limit equals its default, so a replay reuses it even though it was flagged.
+    assert regenerate == ["q"]
+    assert static == {"post_id": "42", "startDate": "yesterday", "limit": 10}
+
+
+def test_arguments_of_uninspectable_functions_are_split_by_name():
+    static, regenerate = split_plan_arguments(print, {"sep": " ", "text": "hello"})
+
+    assert static == {"sep": " "}
+    assert regenerate == ["text"]
+
+
+def test_plan_hash_depends_on_the_agent_module_and_api_set():
+    plan_hash = ExecutionPlanCache.plan_hash("agent", "Post  the weather", ["WeatherApi", "TwitterApi"])
+
+    assert plan_hash == ExecutionPlanCache.plan_hash("agent", "Post the weather", ["TwitterApi", "WeatherApi"])
+    assert plan_hash != ExecutionPlanCache.plan_hash("other", "Post the weather", ["TwitterApi", "WeatherApi"])
+    assert plan_hash != ExecutionPlanCache.plan_hash("agent", "Post the news", ["TwitterApi", "WeatherApi"])
+    assert plan_hash != ExecutionPlanCache.plan_hash("agent", "Post the weather", ["WeatherApi"])
+
+
+def test_stored_plan_is_read_back(tmp_path):
+    path = str(tmp_path / "plans.sqlite3")
+    steps = {"Step 1": "WeatherApi", "Step 2": "TwitterApi"}
+    calls = {"Step 1": {"api_name": "WeatherApi", "endpoint_name": "get_forecast", "arguments": {"city": "Paris"},
+                        "regenerate": [], "confidence": 0.9}}
+    plan = ExecutionPlanCache(path).set("hash", steps, calls, {"WeatherApi": "v1"}, {"Step 2": ["Step 1"]})
+
+    stored = ExecutionPlanCache(path).get("hash")
+
+    assert stored == plan
+    assert stored["dependencies"] == {"Step 2": ["Step 1"]}
+    assert stored["calls"]["Step 1"]["arguments"] == {"city": "Paris"}
+
+
+def test_replays_are_counted_and_invalidated_plans_are_gone(tmp_path):
+    path = str(tmp_path / "plans.sqlite3")
+    cache = ExecutionPlanCache(path)
+    cache.set("hash", {"Step 1": "WeatherApi"}, {}, {})
+
+    cache.record_replay("hash")
+    cache.record_replay("hash")
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT replays FROM execution_plans WHERE plan_hash = 'hash'").fetchone() == (2,)
+
+    cache.invalidate("hash")
+    assert cache.get("hash") is None
@@ -0,0 +1,99 @@
+import time
+
+from infrastructure.job_queue import JobQueue, SQLiteJobStore
+
+
+def wait_for_final_status(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in JobQueue.FINAL_STATUSES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_completed_job_keeps_its_result_progress_and_events(tmp_path):
+    queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1)
+
+    def job(progress, name):
+        progress.update("step", 1)
+        progress.emit({"type": "progress", "name": name})
+        return {"name": name}
+
+    job_id = queue.submit("test", job, "agent")
+    result = wait_for_final_status(queue, job_id)
+
+    assert result["kind"] == "test"
+    assert result["status"] == "completed"
+    assert result["result"] == {"name": "agent"}
+    assert result["progress"] == {"step": 1}
+    assert result["error"] is None
+    events = [event for _, event in queue.get_events(job_id)]
+    assert [event["type"] for event in events] == ["started", "progress", "completed"]
+    assert events[1]["name"] == "agent"
+
+
+def test_failed_job_records_its_error_as_the_last_event(tmp_path):
+    queue = JobQueue(SQLiteJobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1)
+
+    def job(progress):
+        raise ValueError("no APIs found")
+
+    job_id = queue.submit("test", job)
+    result = wait_for_final_status(queue, job_id)
+
+    assert result["status"] == "failed"
+    assert result["error"] == "no APIs found"
+    seq, last_event = queue.get_events(job_id)[-1]
+    assert last_event["type"] == "failed"
+    assert last_event["error"] == "no APIs found"
+    assert queue.get_events(job_id, after_seq=seq) == []
+
+
+def test_events_are_read_after_a_sequence_number(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    store.create("job", "test")
+    for index in range(3):
+        store.add_event("job", {"index": index})
+    store.add_event("other", {"index": 99})
+
+    events = store.get_events("job")
+    assert [event["index"] for _, event in events] == [0, 1, 2]
+    assert [event["index"] for _, event in store.get_events("job", after_seq=events[0][0])] == [1, 2]
+
+
+def test_unknown_job_is_none(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+    assert store.get("missing") is None
+    store.update_progress("missing", "step", 1)
+    assert store.get("missing") is None
+
+
+def test_stale_jobs_left_by_a_stopped_process_are_failed(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path)
+    store.create("queued", "test")
+    store.create("running", "test")
+    store.set_status("running", "running")
+    store.create("done", "test")
+    store.set_status("done", "completed", result=1)
+    time.sleep(0.02)
+
+    restarted = SQLiteJobStore(path)
+    assert restarted.fail_stale("Interrupted before completion", stale_after=0.01) == 2
+
+    for job_id in ("queued", "running"):
+        job = restarted.get(job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "Interrupted before completion"
+    assert restarted.get("done")["status"] == "completed"
+
+
+def test_recent_jobs_are_not_stale(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    store.create("queued", "test")
+
+    assert store.fail_stale("Interrupted before completion", stale_after=3600) == 0
+    assert store.get("queued")["status"] == "queued"
@@ -0,0 +1,105 @@
+import json
+
+from infrastructure.llm.llm_response_cache import (LLMResponseCache, SQLiteResponseStore, is_valid_json_response,
+                                                   llm_cache_refreshing, refresh_llm_cache)
+
+
+SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "choice",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "chosen_option": {"type": "string"},
+                "confidence_score": {"type": "number"},
+            },
+            "required": ["chosen_option", "confidence_score"],
+        },
+    },
+}
+
+
+def test_key_depends_on_model_messages_and_schema():
+    messages = [{"role": "user", "content": "hello"}]
+    key = LLMResponseCache.make_key("gpt-4o", messages, SCHEMA)
+
+    assert key == LLMResponseCache.make_key("gpt-4o", [dict(message) for message in messages], SCHEMA)
+    assert key != LLMResponseCache.make_key("gpt-4", messages, SCHEMA)
+    assert key != LLMResponseCache.make_key("gpt-4o", [{"role": "user", "content": "hi"}], SCHEMA)
+    assert key != LLMResponseCache.make_key("gpt-4o", messages, {"type": "json_object"})
+
+
+def test_hits_are_counted_with_their_savings():
+    cache = LLMResponseCache()
+    assert cache.get("key") is None
+
+    cache.set("key", "value", tokens=120, latency=1.5)
+    assert cache.get("key") == "value"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["tokens_saved"] == 120
+    assert stats["latency_saved_seconds"] == 1.5
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entries_are_misses():
+    cache = LLMResponseCache(ttl_seconds=-1)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_disk_tier_outlives_the_memory_tier(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    LLMResponseCache(disk_store=SQLiteResponseStore(path)).set("key", "value", tokens=10)
+
+    cache = LLMResponseCache(disk_store=SQLiteResponseStore(path))
+    assert cache.get("key") == "value"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("key") == "value"
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_invalidate_drops_both_tiers(tmp_path):
+    store = SQLiteResponseStore(str(tmp_path / "llm.sqlite3"))
+    cache = LLMResponseCache(disk_store=store)
+    cache.set("key", "value")
+
+    cache.invalidate("key")
+
+    assert cache.get("key") is None
+    assert store.get("key") is None
+
+
+def test_only_answers_matching_the_schema_are_valid():
+    assert is_valid_json_response(json.dumps({"chosen_option": "a", "confidence_score": 0.9}), SCHEMA)
+    assert not is_valid_json_response(json.dumps({"chosen_option": "a"}), SCHEMA)
+    assert not is_valid_json_response(json.dumps({"chosen_option": "a", "confidence_score": "high"}), SCHEMA)
+    assert not is_valid_json_response(json.dumps({"chosen_option": "a", "confidence_score": True}), SCHEMA)
+    assert not is_valid_json_response('{"chosen_option": "a", "confid', SCHEMA)
+
+
+def test_refresh_applies_to_its_block_only():
+    assert not llm_cache_refreshing()
+    with refresh_llm_cache():
+        assert llm_cache_refreshing()
+        with refresh_llm_cache(False):
+            # A nested block does not turn off the refresh of an enclosing retry.
+            assert llm_cache_refreshing()
+    assert not llm_cache_refreshing()
@@ -0,0 +1,104 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from infrastructure import pagination
+from infrastructure.pagination import page_items, paginate, paginate_by_page_number
+
+
+class Pages:
+    """Serves pages 1 to `count` of two items each, the last page's cursor being None."""
+
+    def __init__(self, count):
+        self.count = count
+        self.fetched = []
+
+    def __call__(self, page):
+        self.fetched.append(page)
+        return [f"{page}a", f"{page}b"], page + 1 if page < self.count else None
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_every_item_is_yielded_in_order(prefetch):
+    pages = Pages(3)
+
+    assert list(paginate(pages, 1, prefetch=prefetch)) == ["1a", "1b", "2a", "2b", "3a", "3b"]
+    assert pages.fetched == [1, 2, 3]
+
+
+def test_nothing_is_fetched_before_iteration():
+    pages = Pages(3)
+    iterator = paginate(pages, 1)
+
+    assert pages.fetched == []
+    assert next(iterator) == "1a"
+
+
+def test_early_break_fetches_no_page_after_the_next_one():
+    pages = Pages(100)
+
+    for item in paginate(pages, 1):
+        if item == "2a":
+            break
+
+    assert sorted(pages.fetched) in ([1, 2], [1, 2, 3])
+
+
+def test_early_break_cancels_a_queued_prefetch(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(pagination, "_prefetch_executor", executor)
+    release = threading.Event()
+    # Keep the only prefetch worker busy so the next page stays queued.
+    executor.submit(release.wait, 5)
+    pages = Pages(100)
+
+    iterator = paginate(pages, 1)
+    assert next(iterator) == "1a"
+    iterator.close()
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert pages.fetched == [1]
+
+
+def test_pages_are_prefetched_in_the_callers_context():
+    policy = contextvars.ContextVar("policy", default=None)
+    seen = []
+
+    def fetch_page(page):
+        seen.append(policy.get())
+        return [page], page + 1 if page < 3 else None
+
+    policy.set("cached")
+    assert list(paginate(fetch_page, 1)) == [1, 2, 3]
+    assert seen == ["cached", "cached", "cached"]
+
+
+def test_page_numbers_stop_at_the_first_short_page():
+    data = list(range(7))
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return data[(page - 1) * 3:page * 3]
+
+    assert list(paginate_by_page_number(fetch_page, page_size=3)) == data
+    assert fetched == [1, 2, 3]
+
+
+def test_full_last_page_is_followed_by_an_empty_one():
+    def fetch_page(page):
+        return [page, page] if page < 3 else []
+
+    assert list(paginate_by_page_number(fetch_page, page_size=2, first_page=1, prefetch=False)) == [1, 1, 2, 2]
+
+
+def test_page_items_finds_the_list_of_a_page():
+    assert page_items([1, 2]) == [1, 2]
+    assert page_items({"total": 2, "results": [1, 2]}) == [1, 2]
+    assert page_items({"data": [1], "results": [2]}, key="results") == [2]
+    assert page_items({"results": None}, key="results") == []
+    assert page_items({"total": 0}) == []
+    assert page_items(None) == []
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("fastapi")
+parameter_generation = pytest.importorskip("infrastructure.parameter_generation")
+
+validate = parameter_generation.Parameter_Generation.validate_argument_type
+
+
+def test_untyped_parameters_accept_anything():
+    assert validate({"any": "value"}, {}) == (True, {"any": "value"})
+
+
+def test_strings_arrays_and_objects_are_checked_by_type():
+    assert validate("Paris", {"type": "string"}) == (True, "Paris")
+    assert validate(["a"], {"type": "array"}) == (True, ["a"])
+    assert validate({"a": 1}, {"type": "object"}) == (True, {"a": 1})
+    assert validate(3, {"type": "string"}) == (False, 3)
+    assert validate("a", {"type": "array"}) == (False, "a")
+
+
+def test_numbers_generated_as_strings_are_converted():
+    assert validate("42", {"type": "integer"}) == (True, 42)
+    assert validate("4.5", {"type": "number"}) == (True, 4.5)
+    assert validate(3.0, {"type": "integer"}) == (True, 3)
+    assert validate(3.5, {"type": "integer"}) == (False, 3.5)
+    assert validate("many", {"type": "integer"}) == (False, "many")
+
+
+def test_booleans_are_not_numbers():
+    assert validate(True, {"type": "integer"}) == (False, True)
+    assert validate("True", {"type": "boolean"}) == (True, True)
+    assert validate("false", {"type": "boolean"}) == (True, False)
+    assert validate("yes", {"type": "boolean"}) == (False, "yes")
+
+
+def test_null_is_only_valid_for_nullable_parameters():
+    assert validate(None, {"type": ["string", "null"]}) == (True, None)
+    assert validate(None, {"type": "string"}) == (False, None)
+
+
+def test_values_outside_the_enum_are_invalid():
+    schema = {"type": "string", "enum": ["metric", "imperial"]}
+
+    assert validate("metric", schema) == (True, "metric")
+    assert validate("kelvin", schema) == (False, "kelvin")
@@ -0,0 +1,105 @@
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.rate_limiter import RateLimiter, TokenBucket, jittered_backoff, parse_retry_after
+
+
+def test_retry_after_in_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+
+
+def test_retry_after_as_an_http_date():
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_missing_or_invalid_retry_after_is_none():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+
+
+def test_backoff_stays_within_its_capped_bound():
+    for attempt in range(10):
+        assert 0 <= jittered_backoff(attempt, base=0.5, cap=4) <= min(4, 0.5 * 2 ** attempt)
+
+
+def test_bucket_allows_bursts_up_to_its_capacity():
+    bucket = TokenBucket(2, 3600)
+
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+
+def test_bucket_refills_at_its_rate():
+    bucket = TokenBucket(1, 0.05)
+    assert bucket.acquire(timeout=0)
+
+    started_at = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - started_at >= 0.03
+
+
+def test_unlimited_bucket_only_waits_while_paused():
+    bucket = TokenBucket(None, 1)
+    assert all(bucket.acquire(timeout=0) for _ in range(100))
+
+    bucket.pause(0.05)
+    assert not bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=1)
+
+
+def test_credentials_are_limited_separately():
+    limiter = RateLimiter(host_limits={}, default_limit=(1, 3600))
+    url = "https://api.example.com/v1/items"
+
+    assert limiter.key_for(url) == ("api.example.com", "")
+    first = limiter.key_for(url, params={"apikey": "a", "q": "x"})
+    assert first == limiter.key_for(url, params={"apikey": "a", "q": "y"})
+    assert first != limiter.key_for(url, headers={"Authorization": "b"})
+
+    assert limiter.acquire(first, timeout=0)
+    assert not limiter.acquire(first, timeout=0)
+    assert limiter.acquire(limiter.key_for(url, params={"apikey": "other"}), timeout=0)
+
+
+def test_host_limits_override_the_default():
+    limiter = RateLimiter(host_limits={"slow.example.com": (1, 3600)}, default_limit=(None, 1))
+
+    slow = limiter.key_for("https://slow.example.com")
+    assert limiter.acquire(slow, timeout=0)
+    assert not limiter.acquire(slow, timeout=0)
+    fast = limiter.key_for("https://fast.example.com")
+    assert all(limiter.acquire(fast, timeout=0) for _ in range(10))
+
+
+def test_limits_are_parsed_from_their_setting():
+    assert RateLimiter._parse_limits("a.com=5/60, b.com=10") == {"a.com": (5.0, 60.0), "b.com": (10.0, 1.0)}
+
+
+def test_retry_after_pauses_the_bucket_of_the_request():
+    limiter = RateLimiter(host_limits={}, default_limit=(None, 1))
+    key = limiter.key_for("https://api.example.com")
+
+    delay = limiter.observe(key, SimpleNamespace(status_code=429, headers={"Retry-After": "30"}))
+
+    assert delay == 30.0
+    assert not limiter.acquire(key, timeout=0)
+    assert limiter.acquire(limiter.key_for("https://other.example.com"), timeout=0)
+
+
+def test_exhausted_quota_pauses_until_its_reset():
+    limiter = RateLimiter(host_limits={}, default_limit=(None, 1))
+    key = limiter.key_for("https://api.example.com")
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 60)}
+
+    assert limiter.observe(key, SimpleNamespace(status_code=200, headers=headers)) == pytest.approx(60, abs=2)
+    assert limiter.observe(key, SimpleNamespace(status_code=200, headers={"X-RateLimit-Remaining": "0",
+                                                                          "X-RateLimit-Reset": "5"})) == 5.0
+    assert limiter.observe(key, SimpleNamespace(status_code=200, headers={"X-RateLimit-Remaining": "3"})) is None
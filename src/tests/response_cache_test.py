@@ -0,0 +1,119 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+response_cache = pytest.importorskip("infrastructure.response_cache")
+
+CachePolicy = response_cache.CachePolicy
+ResponseCache = response_cache.ResponseCache
+
+
+def make_response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://api.example.com/items"
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+class FakeHost:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.responses.pop(0)
+
+
+def test_fresh_response_is_served_without_contacting_the_host():
+    cache = ResponseCache()
+    host = FakeHost(make_response(200, b'{"items": []}'))
+    policy = CachePolicy(ttl=60)
+
+    first = cache.fetch(host, "https://api.example.com/items", policy, params={"page": 1})
+    second = cache.fetch(host, "https://api.example.com/items", policy, params={"page": 1})
+
+    assert len(host.requests) == 1
+    assert second.status_code == 200
+    assert second.json() == first.json() == {"items": []}
+    assert cache.stats() == {"hits": 1, "misses": 1, "revalidated": 0, "stores": 1}
+
+
+def test_ignored_params_and_credentials_are_part_of_the_key_as_configured():
+    cache = ResponseCache()
+    host = FakeHost(*[make_response(200, b"{}") for _ in range(2)])
+    policy = CachePolicy(ttl=60, ignore_params=["_"])
+
+    cache.fetch(host, "https://api.example.com/items", policy, params={"_": 1}, headers={"Authorization": "a"})
+    cache.fetch(host, "https://api.example.com/items", policy, params={"_": 2}, headers={"Authorization": "a"})
+    cache.fetch(host, "https://api.example.com/items", policy, params={"_": 1}, headers={"Authorization": "b"})
+
+    assert len(host.requests) == 2
+
+
+def test_expired_response_is_revalidated_with_its_etag():
+    cache = ResponseCache()
+    host = FakeHost(make_response(200, b'{"v": 1}', {"ETag": '"v1"'}), make_response(304))
+    policy = CachePolicy(ttl=-1)
+
+    cache.fetch(host, "https://api.example.com/items", policy)
+    revalidated = cache.fetch(host, "https://api.example.com/items", policy)
+
+    assert host.requests[1][1]["headers"]["If-None-Match"] == '"v1"'
+    assert revalidated.status_code == 200
+    assert revalidated.json() == {"v": 1}
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_changed_response_replaces_the_expired_one():
+    cache = ResponseCache()
+    host = FakeHost(make_response(200, b'{"v": 1}', {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+                    make_response(200, b'{"v": 2}'),
+                    make_response(304))
+    policy = CachePolicy(ttl=-1)
+
+    cache.fetch(host, "https://api.example.com/items", policy)
+    changed = cache.fetch(host, "https://api.example.com/items", policy)
+
+    assert host.requests[1][1]["headers"]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert changed.json() == {"v": 2}
+    # The new response has no validator, so it is fetched again once expired.
+    cache.fetch(host, "https://api.example.com/items", policy)
+    assert "headers" not in host.requests[2][1]
+
+
+def test_failed_responses_are_not_cached():
+    cache = ResponseCache()
+    host = FakeHost(make_response(500), make_response(200, b"{}"))
+    policy = CachePolicy(ttl=60)
+
+    assert cache.fetch(host, "https://api.example.com/items", policy).status_code == 500
+    assert cache.fetch(host, "https://api.example.com/items", policy).status_code == 200
+    assert len(host.requests) == 2
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    policy = CachePolicy(ttl=60)
+    ResponseCache(path).fetch(FakeHost(make_response(200, b'{"v": 1}')), "https://api.example.com/items", policy)
+
+    host = FakeHost()
+    response = ResponseCache(path).fetch(host, "https://api.example.com/items", policy)
+
+    assert host.requests == []
+    assert response.json() == {"v": 1}
+
+
+def test_cached_endpoint_sets_the_policy_while_it_runs():
+    @response_cache.cached_endpoint(ttl=30, ignore_params=["_"])
+    def get_items():
+        return response_cache.active_cache_policy()
+
+    policy = get_items()
+
+    assert policy is get_items.cache_policy
+    assert policy.ttl == 30
+    assert policy.ignore_params == frozenset(["_"])
+    assert response_cache.active_cache_policy() is None
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+pytest.importorskip("flask")
+step_execution_engine = pytest.importorskip("usecases.step_execution_engine")
+
+StepExecutionEngine = step_execution_engine.StepExecutionEngine
+infer_step_dependencies = step_execution_engine.infer_step_dependencies
+
+STEPS = {
+    "Fetch the weather": "WeatherApi",
+    "Fetch the news": "NewsApi",
+    "Post a summary": "TwitterApi",
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, step_name, api_name):
+        with self.lock:
+            self.events.append(("start", step_name))
+        with self.lock:
+            self.events.append(("end", step_name))
+        return api_name
+
+    def assert_sequential(self, step_names):
+        expected = []
+        for step_name in step_names:
+            expected += [("start", step_name), ("end", step_name)]
+        assert self.events == expected
+
+
+def test_steps_without_dependencies_run_in_order():
+    recorder = Recorder()
+
+    results = StepExecutionEngine(max_workers=4).run(STEPS, recorder)
+
+    assert results == {step_name: api_name for step_name, api_name in STEPS.items()}
+    recorder.assert_sequential(list(STEPS))
+
+
+def test_independent_steps_run_concurrently():
+    both_running = threading.Barrier(2, timeout=5)
+    finished = []
+
+    def execute_step(step_name, api_name):
+        if step_name != "Post a summary":
+            # Fails with BrokenBarrierError unless both reads run at the same time.
+            both_running.wait()
+        finished.append(step_name)
+        return api_name
+
+    StepExecutionEngine(max_workers=4).run(STEPS, execute_step, dependencies={})
+
+    assert finished[-1] == "Post a summary"
+
+
+def test_declared_dependencies_are_followed():
+    recorder = Recorder()
+    steps = {"Fetch the news": "NewsApi", "Translate the news": "TranslateApi"}
+
+    StepExecutionEngine(max_workers=4).run(steps, recorder, dependencies={"Translate the news": ["Fetch the news"]})
+
+    recorder.assert_sequential(list(steps))
+
+
+def test_dependency_cycle_falls_back_to_order():
+    recorder = Recorder()
+    steps = {"Fetch the news": "NewsApi", "Translate the news": "TranslateApi"}
+    dependencies = {"Fetch the news": ["Translate the news"], "Translate the news": ["Fetch the news"]}
+
+    StepExecutionEngine(max_workers=4).run(steps, recorder, dependencies=dependencies)
+
+    recorder.assert_sequential(list(steps))
+
+
+def test_writes_wait_for_earlier_steps_and_same_api_steps_keep_their_order():
+    steps = {
+        "Fetch the weather": "WeatherApi",
+        "Fetch the forecast": "WeatherApi",
+        "Fetch the news": "NewsApi",
+        "Post a summary": "TwitterApi",
+        "Fetch the replies": "TwitterApi",
+    }
+
+    assert infer_step_dependencies(steps) == {
+        "Fetch the weather": [],
+        "Fetch the forecast": ["Fetch the weather"],
+        "Fetch the news": [],
+        "Post a summary": ["Fetch the weather", "Fetch the forecast", "Fetch the news"],
+        "Fetch the replies": ["Post a summary"],
+    }
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from infrastructure.task_graph import TaskGraph
+
+
+def test_children_start_once_their_parent_is_done():
+    graph = TaskGraph(max_workers=4)
+    order = []
+    lock = threading.Lock()
+
+    def task(name):
+        with lock:
+            order.append(name)
+        return name
+
+    def schedule_children(parent):
+        for child in range(2):
+            graph.submit(task, f"{parent}.{child}")
+
+    for root in ("a", "b"):
+        graph.submit(task, root, on_done=schedule_children)
+    graph.wait()
+
+    assert sorted(order) == ["a", "a.0", "a.1", "b", "b.0", "b.1"]
+    for child in ("a.0", "a.1"):
+        assert order.index("a") < order.index(child)
+    for child in ("b.0", "b.1"):
+        assert order.index("b") < order.index(child)
+
+
+def test_deep_graph_does_not_deadlock_a_single_worker():
+    graph = TaskGraph(max_workers=1)
+    done = []
+
+    def step(depth):
+        done.append(depth)
+        return depth
+
+    def next_level(depth):
+        if depth < 50:
+            graph.submit(step, depth + 1, on_done=next_level)
+
+    graph.submit(step, 0, on_done=next_level)
+    graph.wait()
+
+    assert done == list(range(51))
+
+
+def test_first_failure_is_raised_and_stops_new_tasks():
+    graph = TaskGraph(max_workers=2)
+    sibling_started = threading.Event()
+    failed = threading.Event()
+    ran = []
+
+    def slow_sibling():
+        sibling_started.set()
+        failed.wait(timeout=5)
+        # Give the failing task's callback time to record the error.
+        threading.Event().wait(0.05)
+        return "sibling"
+
+    def fail():
+        sibling_started.wait(timeout=5)
+        try:
+            raise ValueError("boom")
+        finally:
+            failed.set()
+
+    graph.submit(slow_sibling, on_done=lambda result: graph.submit(ran.append, "child"))
+    graph.submit(fail)
+    with pytest.raises(ValueError, match="boom"):
+        graph.wait()
+
+    assert ran == []
+
+
+def test_failing_callback_counts_as_a_failure():
+    graph = TaskGraph(max_workers=1)
+
+    def on_done(result):
+        raise RuntimeError("callback failed")
+
+    graph.submit(lambda: 1, on_done=on_done)
+    with pytest.raises(RuntimeError, match="callback failed"):
+        graph.wait()
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from domain.models.agent_creation_job import AgentCreationJob
+from domain.models.goal import Goal
+from domain.models.self_reflection import SelfReflection
+from domain.models.sub_goal import SubGoal
+from domain.models.workstream import Workstream
+from infrastructure.repositories.agent_creation_job_repository import AgentCreationJobRepository
+from infrastructure.task_graph import TaskGraph
+from usecases.agent_usecase import AgentUsecase, retry
+
+
+class AgentBlueprintEngine:
+    """
+    Generates the sub-goals, workstreams and modules of an agent as a dependency graph rather than
+    as three barriers: the sub-goals of a goal start as soon as the goal exists, the workstreams of a
+    sub-goal as soon as that sub-goal is generated, and the modules of a workstream as soon as the
+    workstream is. The result is the same list of SubGoal and Workstream objects, in the same order,
+    that generate_sub_goals and generate_workstreams produce.
+
+    When a job repository is configured every completed node is checkpointed, and a later request
+    for the same job restores those nodes instead of generating them again.
+    """
+
+    def __init__(self, agent_usecase: AgentUsecase, max_workers: int = None, node_retries: int = 3,
+                 job_repository: AgentCreationJobRepository = None):
+        self.agent_usecase = agent_usecase
+        self.max_workers = max_workers or int(os.getenv("AGENT_CREATION_MAX_WORKERS", "8"))
+        self.node_retries = node_retries
+        self.job_repository = job_repository
+
+    def start_job(self, job_id: str, role: str, report: dict) -> AgentCreationJob:
+        """
+        Resumes the unfinished job with the given ID, or starts a new one when there is none, when the
+        previous one completed, or when it was started for a different role or report.
+
+        :param job_id: ID of the job, the self reflection ID of the session creating the agent.
+        :return: The job, or None when checkpointing is not configured.
+        """
+        if self.job_repository is None:
+            return None
+
+        fingerprint = self._hash({"role": role, "report": report})
+        job = self.job_repository.get_job(job_id)
+        if job is not None and job.status != "completed" and job.fingerprint == fingerprint:
+            print(f"Resuming agent creation job {job_id} from {len(job.checkpoints)} checkpoints")
+            self.job_repository.update_job_status(job_id, "running")
+            return job
+
+        if job is not None:
+            self.job_repository.delete_job(job_id)
+        job = AgentCreationJob(id=job_id, fingerprint=fingerprint)
+        self.job_repository.create_job(job)
+        return job
+
+    def complete_job(self, job: AgentCreationJob) -> None:
+        if job is not None:
+            self.job_repository.update_job_status(job.id, "completed")
+
+    def fail_job(self, job: AgentCreationJob, error: Exception) -> None:
+        """Marks the job as failed, keeping its checkpoints for the next attempt."""
+        if job is None:
+            return
+        try:
+            self.job_repository.update_job_status(job.id, "failed", str(error))
+        except Exception as e:
+            print(f"Error marking agent creation job {job.id} as failed: {str(e)}")
+
+    def checkpointed(self, job: AgentCreationJob, key: str, func: Callable[[], Any],
+                     encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> Any:
+        """
+        Returns the checkpointed result of the given step, or runs func and checkpoints its result.
+
+        :param job: The job the step belongs to. When None, func is simply called.
+        :param key: Key of the step, unique within the job.
+        :param encode: Converts the result to a Firestore compatible value. Defaults to the identity.
+        :param decode: Converts a checkpointed value back to a result. Defaults to the identity.
+        """
+        if job is not None and key in job.checkpoints:
+            value = job.checkpoints[key]
+            return decode(value) if decode else value
+
+        result = func()
+        if job is not None:
+            value = encode(result) if encode else result
+            self.job_repository.save_checkpoint(job.id, key, value)
+            job.checkpoints[key] = value
+        return result
+
+    def generate(self, role: str, report: dict, goals: List[Goal], available_apis: list,
+                 self_reflection: SelfReflection, job: AgentCreationJob = None,
+                 on_node: Callable[[str, str, dict, float], None] = None) -> Tuple[List[SubGoal], List[Workstream]]:
+        """
+        :param job: The creation job to checkpoint nodes to and restore them from, if any.
+        :param on_node: Optional callback called with the type ("sub_goal", "workstream" or "module"), the key
+                        and the dict of every node as soon as it is generated or restored, along with the seconds
+                        the LLM call that generated it took. Siblings generated by one call share its duration,
+                        and restored nodes report None.
+        """
+        usecase = self.agent_usecase
+        on_node = on_node or (lambda node_type, key, value, duration: None)
+        graph = TaskGraph(self.max_workers)
+        lock = threading.Lock()
+        # A failing node is retried on its own instead of regenerating the whole hierarchy.
+        node = retry(max_retries=self.node_retries, delay=2)
+
+        durations: Dict[str, float] = {}
+
+        def schedule(key: str, func: Callable[..., Any], args: tuple, on_done: Callable[[Any], None],
+                     encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> None:
+            # Checkpointed nodes are restored right away; their children are scheduled as usual.
+            if job is not None and key in job.checkpoints:
+                value = job.checkpoints[key]
+                on_done(decode(value) if decode else value)
+                return
+
+            def run() -> Any:
+                started_at = time.perf_counter()
+                result = self.checkpointed(job, key, lambda: node(func)(*args), encode, decode)
+                durations[key] = time.perf_counter() - started_at
+                return result
+
+            graph.submit(run, on_done=on_done)
+
+        # Results are keyed by their position in the hierarchy so they can be reassembled in order.
+        sub_goals_by_goal: Dict[int, List[SubGoal]] = {}
+        workstreams_by_sub_goal: Dict[Tuple[int, int], List[dict]] = {}
+        modules_by_workstream: Dict[Tuple[int, int, int], List[dict]] = {}
+        module_objs: Dict[Tuple[int, int, int, int], dict] = {}
+
+        def on_sub_goals(goal_index: int, goal_key: str, sub_goals: List[SubGoal]) -> None:
+            with lock:
+                sub_goals_by_goal[goal_index] = sub_goals
+            for sub_goal_index, sub_goal in enumerate(sub_goals):
+                key = (goal_index, sub_goal_index)
+                checkpoint_key = f"{goal_key}-s{sub_goal_index}"
+                on_node("sub_goal", checkpoint_key, sub_goal.to_dict(), durations.get(goal_key))
+                schedule(checkpoint_key, usecase.generate_sub_goal_workstreams, (role, report, sub_goal, available_apis),
+                         on_done=lambda workstreams, key=key, checkpoint_key=checkpoint_key, sub_goal=sub_goal:
+                         on_workstreams(key, checkpoint_key, sub_goal, workstreams))
+
+        def on_workstreams(sub_goal_key: Tuple[int, int], checkpoint_key: str, sub_goal: SubGoal, workstreams: List[dict]) -> None:
+            with lock:
+                workstreams_by_sub_goal[sub_goal_key] = workstreams
+            for workstream_index, workstream_dict in enumerate(workstreams):
+                key = sub_goal_key + (workstream_index,)
+                workstream_checkpoint_key = f"{checkpoint_key}-w{workstream_index}"
+                on_node("workstream", workstream_checkpoint_key, dict(workstream_dict), durations.get(checkpoint_key))
+                schedule(workstream_checkpoint_key, usecase.generate_workstream_modules,
+                         (role, report, sub_goal, workstream_dict, available_apis),
+                         on_done=lambda modules, key=key, workstream_checkpoint_key=workstream_checkpoint_key,
+                         sub_goal=sub_goal, workstream_dict=workstream_dict:
+                         on_modules(key, workstream_checkpoint_key, sub_goal, workstream_dict, modules))
+
+        def on_modules(workstream_key: Tuple[int, int, int], checkpoint_key: str, sub_goal: SubGoal,
+                       workstream_dict: dict, modules: List[dict]) -> None:
+            with lock:
+                modules_by_workstream[workstream_key] = modules
+            for module_index, module_dict in enumerate(modules):
+                key = workstream_key + (module_index,)
+                module_checkpoint_key = f"{checkpoint_key}-m{module_index}"
+                schedule(module_checkpoint_key, usecase.generate_module,
+                         (report, sub_goal, workstream_dict, module_dict),
+                         on_done=lambda module_obj, key=key, module_checkpoint_key=module_checkpoint_key:
+                         on_module(key, module_checkpoint_key, module_obj))
+
+        def on_module(module_key: Tuple[int, int, int, int], checkpoint_key: str, module_obj: dict) -> None:
+            with lock:
+                module_objs[module_key] = module_obj
+            on_node("module", checkpoint_key, module_obj, durations.get(checkpoint_key))
+
+        for goal_index, goal in enumerate(goals):
+            # Goals are regenerated with new IDs on every request, so they are keyed by their content
+            # and restored sub-goals are re-attached to the current goal.
+            goal_key = "goal-" + self._hash({"goal": goal.goal, "kpis": [kpi.to_dict() for kpi in goal.kpis]})
+            schedule(goal_key, usecase.generate_goal_sub_goals, (role, report, goal),
+                     on_done=lambda sub_goals, goal_index=goal_index, goal_key=goal_key: on_sub_goals(goal_index, goal_key, sub_goals),
+                     encode=lambda sub_goals: [sub_goal.to_dict() for sub_goal in sub_goals],
+                     decode=lambda values, goal=goal: self._restore_sub_goals(values, goal))
+        graph.wait()
+
+        sub_goals = []
+        workstreams = []
+        for goal_index in range(len(goals)):
+            for sub_goal_index, sub_goal in enumerate(sub_goals_by_goal[goal_index]):
+                sub_goals.append(sub_goal)
+                sub_goal_key = (goal_index, sub_goal_index)
+                for workstream_index, workstream_dict in enumerate(workstreams_by_sub_goal[sub_goal_key]):
+                    workstream_key = sub_goal_key + (workstream_index,)
+                    modules = [
+                        module_objs[workstream_key + (module_index,)]
+                        for module_index in range(len(modules_by_workstream[workstream_key]))
+                    ]
+                    workstreams.append(usecase.build_workstream(role, sub_goal, workstream_dict, modules))
+        print(len(sub_goals), 'sub goals generated')
+        print(len(workstreams), 'workstreams generated')
+
+        self_reflection.subgoals = sub_goals
+        self_reflection.workstreams = workstreams
+        usecase.self_reflection_repository.update_self_reflection(self_reflection)
+
+        return sub_goals, workstreams
+
+    @staticmethod
+    def _restore_sub_goals(values: List[dict], goal: Goal) -> List[SubGoal]:
+        sub_goals = [SubGoal.from_dict(value) for value in values]
+        for sub_goal in sub_goals:
+            sub_goal.goal_id = goal.id
+            sub_goal.agent_id = goal.agent_id
+        return sub_goals
+
+    @staticmethod
+    def _hash(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
@@ -1,10 +1,14 @@
 import json
 import os
+import random
 import uuid
+from enum import Enum
 
 from proto.message import re
 from infrastructure.llm.open_ai_llm import OpenAiLLMService
-from infrastructure.llm.open_ai_schemas import BooleanSchema, StringSchema, ArraySchema, AnswersScehma, KpiSchema, ReportSchema, ModuleSchema, GoalSchema, SubGoalSchema, WorkstreamSchema, subgoals_schema, workstreams_schema, goals_schema, report_schema, modules_schema
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
+from infrastructure.llm.llm_response_cache import refresh_llm_cache
+from infrastructure.llm.open_ai_schemas import BooleanSchema, StringSchema, ArraySchema, AnswersScehma, KpiSchema, KpisSchema, ReportSchema, ModuleSchema, GoalSchema, SubGoalSchema, WorkstreamSchema, subgoals_schema, workstreams_schema, goals_schema, report_schema, modules_schema
 from domain.models.agent import Agent
 from domain.models.goal import Goal
 from domain.models.kpi import KPI
@@ -34,7 +38,9 @@ import google.generativeai as genai
 from infrastructure.api_trees import API_Utils
 
 import typing_extensions as typing
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple
 
 
@@ -45,7 +51,9 @@ def retry(max_retries: int, delay: int):
         def wrapper(*args, **kwargs):
             for attempt in range(max_retries):
                 try:
-                    return func(*args, **kwargs)
+                    # Retries ask the model again instead of getting the failed answer from the cache.
+                    with refresh_llm_cache(attempt > 0):
+                        return func(*args, **kwargs)
                 except Exception as e:
                     if attempt < max_retries - 1:
                         time.sleep(delay)
@@ -57,6 +65,42 @@ def retry(max_retries: int, delay: int):
     return decorator
 
 
+def _is_string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _call_with_retries(func, is_valid, max_retries: int, error_message: str):
+    """
+    Calls func until it returns a value accepted by is_valid, backing off exponentially between
+    attempts. The backoff only blocks the calling worker, so sibling calls keep running. Retries
+    bypass the LLM response cache, which would otherwise return the rejected answer again.
+    """
+    for attempt in range(max_retries):
+        try:
+            with refresh_llm_cache(attempt > 0):
+                result = func()
+            if is_valid(result):
+                return result
+        except json.JSONDecodeError:
+            pass
+
+        if attempt < max_retries - 1:
+            time.sleep(2**attempt)  # Exponential backoff
+    raise RuntimeError(error_message)
+
+
+class VerificationPolicy(Enum):
+    """
+    How generated workstreams and modules are checked against the available APIs.
+    OFF never verifies, SAMPLED verifies a random share of the nodes, FULL verifies every node,
+    and ASYNC_AFTER_COMMIT verifies every node in the background once the agent is stored.
+    """
+    OFF = "off"
+    SAMPLED = "sampled"
+    FULL = "full"
+    ASYNC_AFTER_COMMIT = "async_after_commit"
+
+
 # kpi_schema = genai.protos.Schema(
 #     type=genai.protos.Type.OBJECT,
 #     properties={
@@ -145,7 +189,11 @@ class AgentUsecase:
                  skill_repository: SkillRepository,
                  tags_repository: TagsRepository,
                  traits_repository: TraitsRepository,
-                 category_repository: CategoryRepository):
+                 category_repository: CategoryRepository,
+                 max_workers: int = None,
+                 batch_kpi_expected_values: bool = None,
+                 verification_policy: VerificationPolicy = None,
+                 verification_sample_rate: float = None):
 
         self.llm_service = llm_service
         self.api_repository = api_repository
@@ -160,6 +208,18 @@ class AgentUsecase:
         self.tags_repository = tags_repository
         self.traits_repository = traits_repository
         self.category_repository = category_repository  
+        self.max_workers = max_workers or int(os.getenv("AGENT_CREATION_MAX_WORKERS", "8"))
+        self._embedding_lock = threading.Lock()
+        if batch_kpi_expected_values is None:
+            batch_kpi_expected_values = os.getenv("KPI_EXPECTED_VALUES_BATCHED", "true").lower() not in ("0", "false", "no")
+        self.batch_kpi_expected_values = batch_kpi_expected_values
+        self.verification_policy = verification_policy or VerificationPolicy(
+            os.getenv("NODE_VERIFICATION_POLICY", VerificationPolicy.OFF.value).lower())
+        if verification_sample_rate is None:
+            verification_sample_rate = float(os.getenv("NODE_VERIFICATION_SAMPLE_RATE", "0.2"))
+        self.verification_sample_rate = verification_sample_rate
+        self._verification_executor = None
+        self._verification_executor_lock = threading.Lock()
 
     def _get_relevant_entities(self, query: str, entity_type: str) -> List[Dict]:
         """Retrieve relevant entities from the vector database based on a query and entity type."""
@@ -284,7 +344,7 @@ class AgentUsecase:
 
     def generate_goals(self, role: str, report: dict, self_reflection: SelfReflection) -> list:
         specific_needs = ','.join(report['specific_needs'])
-        kpis = ','.join([
+        agent_kpis = ','.join([
             f"{kpi['kpi']} with expected value {kpi['expected_value']}"
             for kpi in report['kpis']
         ])
@@ -302,7 +362,7 @@ class AgentUsecase:
         
         user persona : {report['user_persona']}
         specific needs : {specific_needs}
-        agent kpis: {kpis}
+        agent kpis: {agent_kpis}
         Given role: {role}
 
         Available APIs:
@@ -311,108 +371,55 @@ class AgentUsecase:
         Return your response as a JSON list of goal strings according to the response schema provided.
         """
 
-        response_schema = ArraySchema
-        goals_string = ""
         max_retries = 5
-        for attempt in range(max_retries):
-            response = self.llm_service.generate_content_with_Structured_schema(
+        goals_string = _call_with_retries(
+            lambda: self.llm_service.generate_content_with_Structured_schema(
                 system_instruction=system_instruction,
                 query=query,
-                response_schema=response_schema)
-            print(response.array)
-            try:
-                goals_string = response.array
-                if isinstance(goals_string, list) and all(
-                        isinstance(goal, str) for goal in goals_string):
-                    break
-            except json.JSONDecodeError:
-                pass
-
-            if attempt < max_retries - 1:
-                time.sleep(2**attempt)  # Exponential backoff
-        else:
-            raise RuntimeError(
-                "Failed to generate goals after multiple attempts")
-
-        goals = []
-        for goal in goals_string:
-            print(goal)
-            system_instruction = """You are an AI assistant designed to generate kpis for goals of an AI agent."""
-            query = f"""generate a list of at least 2 kpis that you think this goal should be measured against. These KPIs need to be measurable.  make sure to make it short and one sentence
-                user persona : {report['user_persona']} 
-                specific needs : {specific_needs}
-                agent kpis: {kpis}
-                goal : {goal}
-
-                Return your response as a JSON list of strings according to the response schema provided.
-                """
-            response_schema = ArraySchema
-
-            for attempt in range(max_retries):
-                response = self.llm_service.generate_content_with_Structured_schema(
-                    system_instruction=system_instruction,
-                    query=query,
-                    response_schema=response_schema)
-                print(response)
-                try:
-                    kpis_list = response.array
-                    if isinstance(kpis_list, list) and all(
-                            isinstance(kpi, str) for kpi in kpis_list):
-                        break
-                except json.JSONDecodeError:
-                    pass
-
-            if attempt < max_retries - 1:
-                time.sleep(2**attempt)  # Exponential backoff
+                response_schema=ArraySchema).array,
+            is_valid=_is_string_list,
+            max_retries=max_retries,
+            error_message="Failed to generate goals after multiple attempts")
+        print(goals_string)
+
+        # Each level of the tree fans out on the worker pool, so the latency is bounded by the
+        # depth of the tree (goals -> KPIs -> expected values) rather than by its node count.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            kpis_lists = list(executor.map(
+                lambda goal: self._generate_goal_kpis(report, specific_needs, agent_kpis, goal, max_retries),
+                goals_string))
+            print(kpis_lists)
+
+            context_description = "user persona, specific needs, agent KPIs, and goal"
+            contexts = [f"""
+                user persona: {report['user_persona']}
+                specific needs: {specific_needs}
+                agent KPIs: {agent_kpis}
+                goal: {goal}""" for goal in goals_string]
+
+            if self.batch_kpi_expected_values:
+                expected_values = list(executor.map(
+                    lambda context_kpis: self._generate_kpi_expected_values(
+                        context_description, context_kpis[0], context_kpis[1], max_retries),
+                    zip(contexts, kpis_lists)))
             else:
-                raise RuntimeError(
-                    f"Failed to generate KPIs for goal '{goal}' after multiple attempts"
-                )
+                flat_expected_values = iter(executor.map(
+                    lambda context_kpi: self._generate_kpi_expected_value(
+                        context_description, context_kpi[0], context_kpi[1], max_retries),
+                    [(context, kpi) for context, kpis_list in zip(contexts, kpis_lists) for kpi in kpis_list]))
+                expected_values = [[next(flat_expected_values) for _ in kpis_list] for kpis_list in kpis_lists]
 
-            print(kpis_list)
-
-            kpis = []
-            for kpi in kpis_list:
-                system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                query = f"""Generate an expected value for the KPI provided below according to the user persona, specific needs, agent KPIs, and goal. make sure to make it short and one sentence
-                    user persona: {report['user_persona']}
-                    specific needs: {specific_needs}
-                    agent KPIs: {kpis}
-                    goal: {goal}
-                    KPI: {kpi}
-                    """
-
-                response_schema = StringSchema
-
-                for attempt in range(max_retries):
-                    response = self.llm_service.generate_content_with_Structured_schema(
-                        system_instruction=system_instruction,
-                        query=query,
-                        response_schema=response_schema)
-                    try:
-                        expected_value = response.string
-                        if isinstance(expected_value, str):
-                            break
-                    except json.JSONDecodeError:
-                        pass
-
-                    if attempt < max_retries - 1:
-                        time.sleep(2**attempt)  # Exponential backoff
-                else:
-                    raise RuntimeError(
-                        f"Failed to generate expected value for KPI '{kpi}' after multiple attempts"
-                    )
-
-                kpi_obj = {'kpi': kpi, 'expected_value': expected_value}
-                kpis.append(kpi_obj)
+        goals = []
+        for goal, kpis_list, goal_expected_values in zip(goals_string, kpis_lists, expected_values):
+            kpis = [{'kpi': kpi, 'expected_value': expected_value}
+                    for kpi, expected_value in zip(kpis_list, goal_expected_values)]
 
             goal_data = [{
                 "name": goal,
                 "description": f"Goal for role {role}: {goal}",
                 "type": "goal"
             }]
-            self.embedding_service.add_entities(goal_data, "goal")
-
+            self._add_entities(goal_data, "goal")
 
             goal_obj = {'goal': goal, 'kpis': kpis}
             goals.append(goal_obj)
@@ -422,116 +429,102 @@ class AgentUsecase:
 
         return goals
 
+    def _generate_goal_kpis(self, report: dict, specific_needs: str, agent_kpis: str, goal: str, max_retries: int) -> list:
+        system_instruction = """You are an AI assistant designed to generate kpis for goals of an AI agent."""
+        query = f"""generate a list of at least 2 kpis that you think this goal should be measured against. These KPIs need to be measurable.  make sure to make it short and one sentence
+            user persona : {report['user_persona']} 
+            specific needs : {specific_needs}
+            agent kpis: {agent_kpis}
+            goal : {goal}
+
+            Return your response as a JSON list of strings according to the response schema provided.
+            """
+
+        return _call_with_retries(
+            lambda: self.llm_service.generate_content_with_Structured_schema(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=ArraySchema).array,
+            is_valid=_is_string_list,
+            max_retries=max_retries,
+            error_message=f"Failed to generate KPIs for goal '{goal}' after multiple attempts")
+
+    def _generate_kpi_expected_value(self, context_description: str, context: str, kpi: str, max_retries: int = 5) -> str:
+        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+        query = f"""Generate an expected value for the KPI provided below according to the {context_description}. make sure to make it short and one sentence
+            {context}
+            KPI: {kpi}
+            """
+
+        return _call_with_retries(
+            lambda: self.llm_service.generate_content_with_Structured_schema(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=StringSchema).string,
+            is_valid=lambda expected_value: isinstance(expected_value, str),
+            max_retries=max_retries,
+            error_message=f"Failed to generate expected value for KPI '{kpi}' after multiple attempts")
+
+    def _generate_kpi_expected_values(self, context_description: str, context: str, kpis_list: list, max_retries: int = 5) -> list:
+        """
+        Generates the expected values of all the KPIs of a node in a single structured call.
+        KPIs missing from the response are re-requested on their own until max_retries is reached.
+        Falls back to one call per KPI when batching is disabled.
+
+        :param context_description: What the context is made of, e.g. "user persona, specific needs, agent KPIs, and goal".
+        :param context: The context lines the expected values are generated against.
+        :param kpis_list: The KPIs to generate expected values for.
+        :return: The expected values, in the same order as kpis_list.
+        """
+        if not self.batch_kpi_expected_values:
+            return [self._generate_kpi_expected_value(context_description, context, kpi, max_retries) for kpi in kpis_list]
+
+        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+        expected_values = {}
+        for attempt in range(max_retries):
+            missing_kpis = [kpi for kpi in kpis_list if kpi not in expected_values]
+            if not missing_kpis:
+                break
+
+            formatted_kpis = "\n".join([f"- {kpi}" for kpi in missing_kpis])
+            query = f"""Generate an expected value for each of the KPIs provided below according to the {context_description}. make sure to make each one short and one sentence. Return every KPI exactly as it is written together with its expected value.
+                {context}
+                KPIs:
+                {formatted_kpis}
+                """
+
+            response = self.llm_service.generate_content_with_Structured_schema(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=KpisSchema)
+
+            returned_values = {
+                kpi_value.kpi.strip().lower(): kpi_value.expected_value
+                for kpi_value in response.kpis
+                if isinstance(kpi_value.expected_value, str) and kpi_value.expected_value.strip()
+            }
+            for kpi in missing_kpis:
+                if kpi.strip().lower() in returned_values:
+                    expected_values[kpi] = returned_values[kpi.strip().lower()]
+
+            if attempt < max_retries - 1 and len(expected_values) < len(kpis_list):
+                print(f"Expected values missing for {len(kpis_list) - len(expected_values)} KPIs, re-requesting them")
+                time.sleep(2**attempt)  # Exponential backoff
+        else:
+            missing_kpis = [kpi for kpi in kpis_list if kpi not in expected_values]
+            if missing_kpis:
+                raise RuntimeError(
+                    f"Failed to generate expected values for KPIs {missing_kpis} after multiple attempts")
+
+        return [expected_values[kpi] for kpi in kpis_list]
+
     @retry(max_retries=5, delay=2)
     def generate_sub_goals(self, role: str, report: dict,
                            goals: list[Goal], self_reflection: SelfReflection) -> list[SubGoal]:
         try:
-            specific_needs = ','.join(report['specific_needs'])
-            agent_kpis = ','.join([
-                f"{kpi['kpi']} with expected value {kpi['expected_value']}"
-                for kpi in report['kpis']
-            ])
             sub_goals = []
             for goal in goals:
-                goal_kpis = ','.join([
-                    f"{kpi.kpi} with expected value {kpi.expected_value}"
-                    for kpi in goal.kpis
-                ])
-
-                query = f"""
-                Return all of the APIs we have available.
-                """                
-
-                relevant_apis = self._get_relevant_entities(query=query, entity_type="api")
-                apis_context = "\n".join([f"{api['name']}: {api['description']}" for api in relevant_apis])
-
-                goal_descriptions = self._get_relevant_entities(query=query, entity_type="goal")
-
-                system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                query = f"""Generate 2 sub goals to break down the goal provided below that you think this AI {role} with the specified user persona and specific needs should have. These sub goals should be a way to divide and conquer the problem of the major goal. Make sure to write the API's you are considering to use don't mention the reason though.
-                            user persona : {report['user_persona']}
-                            specific needs : {specific_needs}
-                            agent kpis: {agent_kpis}
-                            goal : {goal.goal}
-                            goal kpis : {goal_kpis}
-                            User-provided goals:
-                            {goal_descriptions}
-
-                            Available APIs:
-                            {apis_context}
-                            """
-
-                response_schema = ArraySchema
-
-                response = self.llm_service.generate_content_with_Structured_schema(
-                    system_instruction=system_instruction,
-                    query=query,
-                    response_schema=response_schema)
-                sub_goals_list = response.array
-                if not isinstance(sub_goals_list, list):
-                    raise ValueError("Response is not as expected")
-                print("generated subgoals: ", sub_goals_list)
-                for sub_goal_string in sub_goals_list:
-                    system_instruction = """You are an AI assistant designed to generate KPIs for sub-goals of an AI agent. 
-                           Return your response as a JSON list of kpis.
-                           """
-
-                    query = f"""Generate at least two KPIs that you think this sub-goal should be measured against. make sure to make it short and one sentence
-                            These KPIs need to be quantified and measurable.
-                            user persona: {report['user_persona']}
-                            specific needs: {specific_needs}
-                            agent KPIs: {agent_kpis}
-                            Goal: {goal.goal}
-                            Goal KPIs: {goal_kpis}
-                            Sub-goal: {sub_goal_string}
-                            """
-
-                    response_schema = ArraySchema
-                    response = self.llm_service.generate_content_with_Structured_schema(
-                        system_instruction=system_instruction,
-                        query=query,
-                        response_schema=response_schema)
-                    kpis_list = response.array
-                    if not isinstance(kpis_list, list):
-                        raise ValueError("Response is not as expected")
-                    kpis = []
-                    for kpi in kpis_list:
-                        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                        query = f"""Generate an expected value for the KPI provided below according to the user persona, specific needs, agent KPIs, goal, and sub-goal. make sure to make it short and one sentence
-                                user persona: {report['user_persona']}
-                                specific needs: {specific_needs}
-                                agent KPIs: {agent_kpis}
-                                goal: {goal.goal}
-                                goal KPIs: {goal_kpis}  
-                                sub-goal: {sub_goal_string} 
-                                KPI: {kpi}  
-                                """
-
-                        response_schema = StringSchema
-                        response = self.llm_service.generate_content_with_Structured_schema(
-                            system_instruction=system_instruction,
-                            query=query,
-                            response_schema=response_schema)
-                        if not isinstance(response.string, str):
-                            raise ValueError("Response is not as expected")
-                        kpi_obj = KPI(kpi=kpi, expected_value=response.string)
-                        kpis.append(kpi_obj)
-
-                    sub_goal_obj = SubGoal(sub_goal_id=uuid.uuid4().hex,
-                                           goal_id=goal.id,
-                                           agent_id=goal.agent_id,
-                                           sub_goal=sub_goal_string,
-                                           kpis=kpis)
-
-                    
-                    sub_goal_data = [{
-                        "name": sub_goal_string,
-                        "description": f"Sub-goal for role {role} with goal '{goal.goal}': {sub_goal_string}",
-                        "type": "sub_goal"
-                    }]
-                    self.embedding_service.add_entities(sub_goal_data, "sub_goal")
-
-                    sub_goals.append(sub_goal_obj)
+                sub_goals.extend(self.generate_goal_sub_goals(role, report, goal))
 
             self_reflection.subgoals = sub_goals
             self.self_reflection_repository.update_self_reflection(self_reflection)
@@ -541,223 +534,123 @@ class AgentUsecase:
         except Exception as e:
             raise RuntimeError(f"Error generating sub-goals: {str(e)}")
 
-    @retry(max_retries=5, delay=2)
-    def generate_workstreams(self, role: str, report: dict,
-                             sub_goals: list[SubGoal],
-                             available_apis: list, self_reflection: SelfReflection) -> list[Workstream]:
-        try:
-            specific_needs = ','.join(report['specific_needs'])
-            agent_kpis = ','.join([
-                f"{kpi['kpi']} with expected value {kpi['expected_value']}"
-                for kpi in report['kpis']
-            ])
-            workstreams = []
+    def generate_goal_sub_goals(self, role: str, report: dict, goal: Goal) -> list[SubGoal]:
+        """Generate the sub-goals of a single goal, along with their KPIs."""
+        specific_needs = ','.join(report['specific_needs'])
+        agent_kpis = ','.join([
+            f"{kpi['kpi']} with expected value {kpi['expected_value']}"
+            for kpi in report['kpis']
+        ])
+        goal_kpis = ','.join([
+            f"{kpi.kpi} with expected value {kpi.expected_value}"
+            for kpi in goal.kpis
+        ])
 
-            for sub_goal in sub_goals:
-                sub_goal_kpis = ','.join([
-                    f"{kpi.kpi} with expected value {kpi.expected_value}"
-                    for kpi in sub_goal.kpis
-                ])
-
-                max_attempts = 3  # Limit the number of attempts for verification
-                attempts = 0
-                workstreams_dict = None
-
-                while attempts < max_attempts:  # Attempt verification only a limited number of times
-                    query = f"""
-                    Return all of the APIs we have available.
-                    """    
-                    relevant_apis = self._get_relevant_entities(query=query, entity_type="api")
-                    apis_context = "\n".join([f"{api['name']}: {api['description']}" for api in relevant_apis[:5]])
-                    
-                    sub_goal_descriptions = self._get_relevant_entities(query=query, entity_type="sub_goal")
-
-                    system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                    query = f"""
-                    Generate 2 workstreams to achieve the sub-goal provided below for the AI {role} with the specified user persona specific needs. The workstreams should be doable by the available apis. The frequency should be one of the following: daily, weekly, monthly, quarterly, yearly. Make sure to add relevant KPIs with the expected value to each workstream.
+        query = f"""
+        Return all of the APIs we have available.
+        """                
+
+        relevant_apis = self._get_relevant_entities(query=query, entity_type="api")
+        apis_context = "\n".join([f"{api['name']}: {api['description']}" for api in relevant_apis])
+
+        goal_descriptions = self._get_relevant_entities(query=query, entity_type="goal")
+
+        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+        query = f"""Generate 2 sub goals to break down the goal provided below that you think this AI {role} with the specified user persona and specific needs should have. These sub goals should be a way to divide and conquer the problem of the major goal. Make sure to write the API's you are considering to use don't mention the reason though.
                     user persona : {report['user_persona']}
                     specific needs : {specific_needs}
                     agent kpis: {agent_kpis}
-                    sub-goal : {sub_goal.sub_goal}
-                    sub-goal kpis : {sub_goal_kpis}
-                    available apis : {','.join(available_apis)}
-                    Sub-goals:
-                    {sub_goal_descriptions}
+                    goal : {goal.goal}
+                    goal kpis : {goal_kpis}
+                    User-provided goals:
+                    {goal_descriptions}
 
                     Available APIs:
                     {apis_context}
                     """
 
-                    response_schema = workstreams_schema
-                    response = self.llm_service.generate_content_with_json_format(
-                        system_instruction=system_instruction,
-                        query=query,
-                        response_schema=response_schema)
-
-                    res = json.loads(response)
-                    workstreams_dict = res["workstreams"]
-                    if not isinstance(workstreams_dict, list):
-                        raise ValueError("Response is not a list as expected")
-
-                    #Verify the generated workstreams
-                    verified = all(
-                        self.verify_node(
-                            workstream['workstream'],
-                            self.generate_nodes_apis(workstream['workstream'],
-                                                     available_apis))
-                        for workstream in workstreams_dict)
-                    print("verification of workstreams: ", verified)
-                    verified = True
-
-                    if verified:
-                        print("Workstreams verified")
-                        break  # Break if verification succeeds
-                    else:
-                        print(
-                            f"Verification failed, retrying... (Attempt {attempts + 1})"
-                        )
-                        attempts += 1  # Increment attempt count
+        response_schema = ArraySchema
 
-                if not workstreams_dict or not verified:
-                    raise RuntimeError(
-                        "Failed to generate valid workstreams after multiple attempts"
-                    )
+        response = self.llm_service.generate_content_with_Structured_schema(
+            system_instruction=system_instruction,
+            query=query,
+            response_schema=response_schema)
+        sub_goals_list = response.array
+        if not isinstance(sub_goals_list, list):
+            raise ValueError("Response is not as expected")
+        print("generated subgoals: ", sub_goals_list)
+
+        sub_goals = []
+        for sub_goal_string in sub_goals_list:
+            system_instruction = """You are an AI assistant designed to generate KPIs for sub-goals of an AI agent. 
+                   Return your response as a JSON list of kpis.
+                   """
+
+            query = f"""Generate at least two KPIs that you think this sub-goal should be measured against. make sure to make it short and one sentence
+                    These KPIs need to be quantified and measurable.
+                    user persona: {report['user_persona']}
+                    specific needs: {specific_needs}
+                    agent KPIs: {agent_kpis}
+                    Goal: {goal.goal}
+                    Goal KPIs: {goal_kpis}
+                    Sub-goal: {sub_goal_string}
+                    """
+
+            response_schema = ArraySchema
+            response = self.llm_service.generate_content_with_Structured_schema(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=response_schema)
+            kpis_list = response.array
+            if not isinstance(kpis_list, list):
+                raise ValueError("Response is not as expected")
+            expected_values = self._generate_kpi_expected_values(
+                context_description="user persona, specific needs, agent KPIs, goal, and sub-goal",
+                context=f"""
+                        user persona: {report['user_persona']}
+                        specific needs: {specific_needs}
+                        agent KPIs: {agent_kpis}
+                        goal: {goal.goal}
+                        goal KPIs: {goal_kpis}  
+                        sub-goal: {sub_goal_string}""",
+                kpis_list=kpis_list)
+            kpis = [KPI(kpi=kpi, expected_value=expected_value)
+                    for kpi, expected_value in zip(kpis_list, expected_values)]
+
+            sub_goal_obj = SubGoal(sub_goal_id=uuid.uuid4().hex,
+                                   goal_id=goal.id,
+                                   agent_id=goal.agent_id,
+                                   sub_goal=sub_goal_string,
+                                   kpis=kpis)
+
+            sub_goal_data = [{
+                "name": sub_goal_string,
+                "description": f"Sub-goal for role {role} with goal '{goal.goal}': {sub_goal_string}",
+                "type": "sub_goal"
+            }]
+            self._add_entities(sub_goal_data, "sub_goal")
+
+            sub_goals.append(sub_goal_obj)
+
+        return sub_goals
+
+    @retry(max_retries=5, delay=2)
+    def generate_workstreams(self, role: str, report: dict,
+                             sub_goals: list[SubGoal],
+                             available_apis: list, self_reflection: SelfReflection) -> list[Workstream]:
+        try:
+            workstreams = []
+
+            for sub_goal in sub_goals:
+                workstreams_dict = self.generate_sub_goal_workstreams(role, report, sub_goal, available_apis)
 
                 for workstream_dict in workstreams_dict:
-                    max_task_attempts = 3  # Limit task generation retries
-                    task_attempts = 0
-                    module_list = None
-
-                    while task_attempts < max_task_attempts:  # Retry for tasks verification
-                        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                        query = f"""Generate 2 tasks that break down the specific workstream into smaller, manageable components. Each task should represent a distinct task or process necessary to achieve the overall goal of the workstream. also make sure that the tasks are doable by the available apis. Since the generated tasks are going to be verified make sure to improve and change the task if it is not doable by the available apis.
-                                    user persona : {report['user_persona']}
-                                    specific needs : {specific_needs}
-                                    agent kpis: {agent_kpis}
-                                    sub-goal : {sub_goal.sub_goal}
-                                    sub-goal kpis : {sub_goal_kpis}
-                                    workstream : {workstream_dict['workstream']}
-                                    available apis : {','.join(available_apis)}
-                                    """
-                        response_schema = modules_schema
-
-                        response = self.llm_service.generate_content_with_json_format(
-                            system_instruction=system_instruction,
-                            query=query,
-                            response_schema=response_schema)
-
-                        module_list = json.loads(response)["modules"]
-                        if not isinstance(module_list, list):
-                            raise ValueError(
-                                "Response is not a list as expected")
-
-                        #Verify the tasks
-                        verified = all(
-                            self.verify_node(
-                                module,
-                                self.generate_nodes_apis(
-                                    module, available_apis))
-                            for module in module_list)
-                        verified = True
-
-                        if verified:
-                            print("modules verified")
-                            break
-                        else:
-                            print(
-                                f"Task verification failed, retrying... (Attempt {task_attempts + 1})"
-                            )
-                            task_attempts += 1
-
-                    if not module_list or not verified:
-                        raise RuntimeError(
-                            "Failed to generate valid tasks after multiple attempts"
-                        )
-
-                    modules = []
-                    for module_dict in module_list:
-                        module = module_dict["module"]
-                        freq_module = module_dict["frequency"]
-                        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                        query = f"""Generate at least 2 kpis for the task provided below according to the user persona, specific needs, agent KPIs, sub-goal, workstream, and task. make sure to make it short and one sentence
-                                user persona: {report['user_persona']}
-                                specific needs: {specific_needs}
-                                sub-goal: {sub_goal.sub_goal}
-                                workstream: {workstream_dict['workstream']}
-                                workstream kpis: {','.join([f"{kpi['kpi']} with expected value {kpi['expected_value']}" for kpi in workstream_dict['kpis']])}
-                                task: {module}
-                                """
-
-                        response_schema = ArraySchema
-                        response = self.llm_service.generate_content_with_Structured_schema(
-                            system_instruction=system_instruction,
-                            query=query,
-                            response_schema=response_schema)
-                        module_kpis = response.array
-                        print("module_kpis123", module_kpis)
-                        if not isinstance(module_kpis, list):
-                            raise ValueError(
-                                "Module KPIs Response is not as expected")
-                        kpis = []
-                        for kpi in module_kpis:
-                            system_instruction = """You are an AI assistant designed to help users create personalized agents."""
-                            query = f"""Generate an expected value for the KPI provided below according to the user persona, specific needs, agent KPIs, sub-goal, workstream, task, and kpi. make sure to make it short and one sentence
-                                    user persona: {report['user_persona']}
-                                    specific needs: {specific_needs}
-                                    agent KPIs: {agent_kpis}
-                                    sub-goal: {sub_goal.sub_goal}
-                                    sub-goal KPIs: {sub_goal_kpis}
-                                    workstream: {workstream_dict['workstream']}
-                                    workstream kpis: {','.join([f"{kpi['kpi']} with expected value {kpi['expected_value']}" for kpi in workstream_dict['kpis']])}
-                                    task: {module}
-                                    KPI: {kpi}
-                                    """
-
-                            response_schema = StringSchema
-                            response = self.llm_service.generate_content_with_Structured_schema(
-                                system_instruction=system_instruction,
-                                query=query,
-                                response_schema=response_schema)
-                            print("detail kpi module", response)
-                            if not isinstance(response.string, str):
-                                raise ValueError(
-                                    "Module KPI Details Response is not as expected"
-                                )
-                            kpi_obj = {
-                                'kpi': kpi,
-                                'expected_value': response.string
-                            }
-                            kpis.append(kpi_obj)
-
-                        print(f"module_object-{freq_module}-")
-                        
-                        #get the apis for the module by multi-traversing the tree
-                        modules_apis = API_Utils().multi_traverse_api_tree(module)
-                        module_obj = {
-                            'module': module,
-                            'kpis': kpis,
-                            'frequency': freq_module,
-                            'apis': modules_apis
-                        }
-
-                        modules.append(module_obj)
-                        print("added module", module_obj)
-
-                    workstream_dict['modules'] = modules
-                    workstream = Workstream.from_dict(workstream_dict)
-                    workstream.id = uuid.uuid4().hex
-                    workstream.sub_goal_id = sub_goal.id
-                    workstream.goal_id = sub_goal.goal_id
-                    workstream.agent_id = sub_goal.agent_id
-
-                    workstream_data = [{
-                        "name": workstream_dict["workstream"],
-                        "description": f"Workstream for sub-goal '{sub_goal.sub_goal}' with role '{role}': {workstream_dict['workstream']}",
-                        "type": "workstream"
-                    }]
-                    self.embedding_service.add_entities(workstream_data, "workstream")
-
-                    workstreams.append(workstream)
+                    module_list = self.generate_workstream_modules(role, report, sub_goal, workstream_dict, available_apis)
+                    modules = [
+                        self.generate_module(report, sub_goal, workstream_dict, module_dict)
+                        for module_dict in module_list
+                    ]
+                    workstreams.append(self.build_workstream(role, sub_goal, workstream_dict, modules))
                     print("appenddeddddddddddddddddddddddddd")
             print('Workstreams generated')
             self_reflection.workstreams = workstreams
@@ -768,6 +661,228 @@ class AgentUsecase:
         except Exception as e:
             print(e)
             raise RuntimeError(f"Error generating workstreams: {str(e)}")
+
+    def generate_sub_goal_workstreams(self, role: str, report: dict, sub_goal: SubGoal, available_apis: list) -> list[dict]:
+        """Generate the workstreams of a single sub-goal, without their modules."""
+        specific_needs = ','.join(report['specific_needs'])
+        agent_kpis = ','.join([
+            f"{kpi['kpi']} with expected value {kpi['expected_value']}"
+            for kpi in report['kpis']
+        ])
+        sub_goal_kpis = ','.join([
+            f"{kpi.kpi} with expected value {kpi.expected_value}"
+            for kpi in sub_goal.kpis
+        ])
+
+        max_attempts = 3  # Limit the number of attempts for verification
+        attempts = 0
+        workstreams_dict = None
+
+        while attempts < max_attempts:  # Attempt verification only a limited number of times
+            query = f"""
+            Return all of the APIs we have available.
+            """    
+            relevant_apis = self._get_relevant_entities(query=query, entity_type="api")
+            apis_context = "\n".join([f"{api['name']}: {api['description']}" for api in relevant_apis[:5]])
+            
+            sub_goal_descriptions = self._get_relevant_entities(query=query, entity_type="sub_goal")
+
+            system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+            query = f"""
+            Generate 2 workstreams to achieve the sub-goal provided below for the AI {role} with the specified user persona specific needs. The workstreams should be doable by the available apis. The frequency should be one of the following: daily, weekly, monthly, quarterly, yearly. Make sure to add relevant KPIs with the expected value to each workstream.
+            user persona : {report['user_persona']}
+            specific needs : {specific_needs}
+            agent kpis: {agent_kpis}
+            sub-goal : {sub_goal.sub_goal}
+            sub-goal kpis : {sub_goal_kpis}
+            available apis : {','.join(available_apis)}
+            Sub-goals:
+            {sub_goal_descriptions}
+
+            Available APIs:
+            {apis_context}
+            """
+
+            response_schema = workstreams_schema
+            # A retry must not get the rejected answer back from the response cache.
+            response = self.llm_service.generate_content_with_json_format(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=response_schema)
+
+            res = json.loads(response)
+            workstreams_dict = res["workstreams"]
+            if not isinstance(workstreams_dict, list):
+                raise ValueError("Response is not a list as expected")
+
+            #Verify the generated workstreams
+            verified = self._verify_nodes(
+                [workstream['workstream'] for workstream in workstreams_dict], available_apis, use_cache=False)
+            print("verification of workstreams: ", verified)
+
+            if verified:
+                print("Workstreams verified")
+                break  # Break if verification succeeds
+            else:
+                print(
+                    f"Verification failed, retrying... (Attempt {attempts + 1})"
+                )
+                attempts += 1  # Increment attempt count
+
+        if not workstreams_dict or not verified:
+            raise RuntimeError(
+                "Failed to generate valid workstreams after multiple attempts"
+            )
+
+        return workstreams_dict
+
+    def generate_workstream_modules(self, role: str, report: dict, sub_goal: SubGoal, workstream_dict: dict, available_apis: list) -> list[dict]:
+        """Generate the modules (tasks) of a single workstream, without their KPIs and APIs."""
+        specific_needs = ','.join(report['specific_needs'])
+        agent_kpis = ','.join([
+            f"{kpi['kpi']} with expected value {kpi['expected_value']}"
+            for kpi in report['kpis']
+        ])
+        sub_goal_kpis = ','.join([
+            f"{kpi.kpi} with expected value {kpi.expected_value}"
+            for kpi in sub_goal.kpis
+        ])
+
+        max_task_attempts = 3  # Limit task generation retries
+        task_attempts = 0
+        module_list = None
+
+        while task_attempts < max_task_attempts:  # Retry for tasks verification
+            system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+            query = f"""Generate 2 tasks that break down the specific workstream into smaller, manageable components. Each task should represent a distinct task or process necessary to achieve the overall goal of the workstream. also make sure that the tasks are doable by the available apis. Since the generated tasks are going to be verified make sure to improve and change the task if it is not doable by the available apis.
+                        user persona : {report['user_persona']}
+                        specific needs : {specific_needs}
+                        agent kpis: {agent_kpis}
+                        sub-goal : {sub_goal.sub_goal}
+                        sub-goal kpis : {sub_goal_kpis}
+                        workstream : {workstream_dict['workstream']}
+                        available apis : {','.join(available_apis)}
+                        """
+            response_schema = modules_schema
+
+            # A retry must not get the rejected answer back from the response cache.
+            response = self.llm_service.generate_content_with_json_format(
+                system_instruction=system_instruction,
+                query=query,
+                response_schema=response_schema)
+
+            module_list = json.loads(response)["modules"]
+            if not isinstance(module_list, list):
+                raise ValueError(
+                    "Response is not a list as expected")
+
+            #Verify the tasks
+            verified = self._verify_nodes([module['module'] for module in module_list], available_apis, use_cache=False)
+
+            if verified:
+                print("modules verified")
+                break
+            else:
+                print(
+                    f"Task verification failed, retrying... (Attempt {task_attempts + 1})"
+                )
+                task_attempts += 1
+
+        if not module_list or not verified:
+            raise RuntimeError(
+                "Failed to generate valid tasks after multiple attempts"
+            )
+
+        return module_list
+
+    def generate_module(self, report: dict, sub_goal: SubGoal, workstream_dict: dict, module_dict: dict) -> dict:
+        """Generate the KPIs and the APIs of a single module."""
+        specific_needs = ','.join(report['specific_needs'])
+        agent_kpis = ','.join([
+            f"{kpi['kpi']} with expected value {kpi['expected_value']}"
+            for kpi in report['kpis']
+        ])
+        sub_goal_kpis = ','.join([
+            f"{kpi.kpi} with expected value {kpi.expected_value}"
+            for kpi in sub_goal.kpis
+        ])
+
+        module = module_dict["module"]
+        freq_module = module_dict["frequency"]
+        system_instruction = """You are an AI assistant designed to help users create personalized agents."""
+        query = f"""Generate at least 2 kpis for the task provided below according to the user persona, specific needs, agent KPIs, sub-goal, workstream, and task. make sure to make it short and one sentence
+                user persona: {report['user_persona']}
+                specific needs: {specific_needs}
+                sub-goal: {sub_goal.sub_goal}
+                workstream: {workstream_dict['workstream']}
+                workstream kpis: {','.join([f"{kpi['kpi']} with expected value {kpi['expected_value']}" for kpi in workstream_dict['kpis']])}
+                task: {module}
+                """
+
+        response_schema = ArraySchema
+        response = self.llm_service.generate_content_with_Structured_schema(
+            system_instruction=system_instruction,
+            query=query,
+            response_schema=response_schema)
+        module_kpis = response.array
+        print("module_kpis123", module_kpis)
+        if not isinstance(module_kpis, list):
+            raise ValueError(
+                "Module KPIs Response is not as expected")
+        expected_values = self._generate_kpi_expected_values(
+            context_description="user persona, specific needs, agent KPIs, sub-goal, workstream, task, and kpi",
+            context=f"""
+                    user persona: {report['user_persona']}
+                    specific needs: {specific_needs}
+                    agent KPIs: {agent_kpis}
+                    sub-goal: {sub_goal.sub_goal}
+                    sub-goal KPIs: {sub_goal_kpis}
+                    workstream: {workstream_dict['workstream']}
+                    workstream kpis: {','.join([f"{kpi['kpi']} with expected value {kpi['expected_value']}" for kpi in workstream_dict['kpis']])}
+                    task: {module}""",
+            kpis_list=module_kpis)
+        print("detail kpi module", expected_values)
+        kpis = [{
+            'kpi': kpi,
+            'expected_value': expected_value
+        } for kpi, expected_value in zip(module_kpis, expected_values)]
+
+        print(f"module_object-{freq_module}-")
+        
+        #get the apis for the module by multi-traversing the tree
+        modules_apis = API_Utils().multi_traverse_api_tree(module)
+        module_obj = {
+            'module': module,
+            'kpis': kpis,
+            'frequency': freq_module,
+            'apis': modules_apis
+        }
+        print("added module", module_obj)
+
+        return module_obj
+
+    def build_workstream(self, role: str, sub_goal: SubGoal, workstream_dict: dict, modules: list[dict]) -> Workstream:
+        """Assemble a Workstream from its generated dict and modules, and index it in the vector database."""
+        workstream_dict['modules'] = modules
+        workstream = Workstream.from_dict(workstream_dict)
+        workstream.id = uuid.uuid4().hex
+        workstream.sub_goal_id = sub_goal.id
+        workstream.goal_id = sub_goal.goal_id
+        workstream.agent_id = sub_goal.agent_id
+
+        workstream_data = [{
+            "name": workstream_dict["workstream"],
+            "description": f"Workstream for sub-goal '{sub_goal.sub_goal}' with role '{role}': {workstream_dict['workstream']}",
+            "type": "workstream"
+        }]
+        self._add_entities(workstream_data, "workstream")
+
+        return workstream
+
+    def _add_entities(self, entities: List[Dict], entity_type: str) -> None:
+        # The vector store deduplicates with a read-then-write, so concurrent writers are serialized.
+        with self._embedding_lock:
+            self.embedding_service.add_entities(entities, entity_type)
     
 
     def generate_skills(self, role, specific_needs, self_reflection,agent_id) -> list:
@@ -981,7 +1096,8 @@ class AgentUsecase:
             response = self.llm_service.generate_content_with_Structured_schema(
                 system_instruction=system_instruction,
                 query=query,
-                response_schema=response_schema)
+                response_schema=response_schema,
+                use_cache=True)
             print(response)
             parsed_response = response.array
 
@@ -990,7 +1106,7 @@ class AgentUsecase:
             raise RuntimeError(
                 f"Error creating relevant apis for the agent: {str(e)}")
 
-    def verify_node(self, description: str, apis: list) -> bool:
+    def verify_node(self, description: str, apis: list, use_cache: bool = True) -> bool:
         try:
             system_instruction = """
             You are an AI assistant tasked with evaluating whether a specified action can be executed using the provided APIs. 
@@ -1006,7 +1122,8 @@ class AgentUsecase:
             response = self.llm_service.generate_content_with_Structured_schema(
                 system_instruction=system_instruction,
                 query=query,
-                response_schema=response_schema)
+                response_schema=response_schema,
+                use_cache=use_cache)
             print(response)
             parsed_response = response.boolean
 
@@ -1015,7 +1132,54 @@ class AgentUsecase:
             raise RuntimeError(
                 f"Error verifying node feasibility with APIs: {str(e)}")
 
-    def generate_nodes_apis(self, node, apis: list) -> list:
+    def _verify_nodes(self, descriptions: list[str], available_apis: list, use_cache: bool = True) -> bool:
+        """
+        Verifies generated nodes inline according to the verification policy. Returns True without
+        calling the LLM when the policy is OFF or ASYNC_AFTER_COMMIT, or when no node is sampled.
+        Pass use_cache=False when the check decides a retry, so a cached verdict is not repeated.
+        """
+        if self.verification_policy == VerificationPolicy.FULL:
+            selected = descriptions
+        elif self.verification_policy == VerificationPolicy.SAMPLED:
+            selected = [description for description in descriptions if random.random() < self.verification_sample_rate]
+        else:
+            return True
+
+        return all(self._verify_node_with_apis(description, available_apis, use_cache) for description in selected)
+
+    def _verify_node_with_apis(self, description: str, available_apis: list, use_cache: bool = True) -> bool:
+        return self.verify_node(description, self.generate_nodes_apis(description, available_apis, use_cache), use_cache)
+
+    def verify_nodes_after_commit(self, workstreams: list[Workstream], available_apis: list) -> None:
+        """
+        Starts the background verification of a stored agent's workstreams and modules when the policy
+        is ASYNC_AFTER_COMMIT. Each workstream is updated in the repository with the verified flags of
+        itself and its modules once its checks are done; a failed check never affects the agent creation.
+        """
+        if self.verification_policy != VerificationPolicy.ASYNC_AFTER_COMMIT:
+            return
+
+        with self._verification_executor_lock:
+            if self._verification_executor is None:
+                self._verification_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("NODE_VERIFICATION_MAX_WORKERS", "2")))
+            for workstream in workstreams:
+                self._verification_executor.submit(self._verify_and_flag_workstream, workstream, available_apis)
+
+    def _verify_and_flag_workstream(self, workstream: Workstream, available_apis: list) -> None:
+        try:
+            workstream.verified = self._verify_node_with_apis(workstream.workstream, available_apis)
+            for module in workstream.modules:
+                module.verified = self._verify_node_with_apis(module.module, available_apis)
+            self.workstream_repository.update_workstream(workstream)
+
+            unverified = [module.module for module in workstream.modules if not module.verified]
+            if not workstream.verified or unverified:
+                print(f"Workstream {workstream.id} flagged by verification, unverified modules: {unverified}")
+        except Exception as e:
+            print(f"Error verifying workstream {workstream.id}: {str(e)}")
+
+    def generate_nodes_apis(self, node, apis: list, use_cache: bool = True) -> list:
         try:
             system_instruction = """
             You are an AI assistant tasked with generating a list of APIs that can be used to perform a specific action.
@@ -1031,7 +1195,8 @@ class AgentUsecase:
             response = self.llm_service.generate_content_with_Structured_schema(
                 system_instruction=system_instruction,
                 query=query,
-                response_schema=response_schema)
+                response_schema=response_schema,
+                use_cache=use_cache)
             print(response)
             parsed_response = response.array
 
@@ -1042,7 +1207,7 @@ class AgentUsecase:
     def validate_role_ethics(self,role, description):
 
         try:
-            openai_llm = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=os.getenv('OPENAI_API_KEY'))
+            openai_llm = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
             system_instruction = (
                 "You are an ethics compliance evaluator for company. Validate if a role and its description align with basic ethical guidelines "
                 "and do not cause harm. Respond in the structured schema format provided."
@@ -1084,7 +1249,7 @@ class AgentUsecase:
         
     def validate_user_input(self, role, input):
         try:
-            openai_llm = OpenAiLLMService(model_name="gpt-4o-2024-08-06", api_key=os.getenv('OPENAI_API_KEY'))
+            openai_llm = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
             system_instruction = (
                 "You are an ethics compliance evaluator for our company. Validate if a role and its description align with basic ethical guidelines "
                 "and do not cause harm. Respond in the structured schema format provided."
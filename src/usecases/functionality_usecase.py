@@ -10,6 +10,8 @@ from infrastructure.report_service import ReportGeneration
 from infrastructure.api_trees import API_Utils
 from infrastructure.parameter_generation import Parameter_Generation
 from infrastructure.llm.open_ai_llm import OpenAiLLMService
+from infrastructure.llm.llm_client_registry import get_openai_llm_service
+from infrastructure.llm.llm_response_cache import refresh_llm_cache
 from infrastructure.llm.open_ai_schemas import ArraySchema, ModulesSchema, StringSchema, step_schema , summary_schema
 from domain.models.workstream import Workstream
 from infrastructure.llm import llm_step_generation_service as llmGen
@@ -19,10 +21,18 @@ from infrastructure.llm.llm_function_calling_service import LLM_function_calling
 from infrastructure.llm.llm_service import LLMService
 import datetime
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from domain.models.module import Module
 from typing_extensions import TypedDict
 
 from infrastructure.performance_analyzer import PerformanceAnalyzer
+from usecases.step_execution_engine import WRITE_STEP_PATTERN, StepExecutionEngine, bind_app_context
+from infrastructure.api_imports import get_api_instance
+from infrastructure.endpoint_selection_cache import api_method_set_version
+from infrastructure.execution_plan_cache import ExecutionPlanCache, get_execution_plan_cache, split_plan_arguments
+from infrastructure.rate_limiter import jittered_backoff
 
 class Steps(TypedDict):
     steps: list[str]
@@ -30,11 +40,13 @@ class Steps(TypedDict):
 if not os.path.exists('logs'):
     os.makedirs('logs')
 
-llm = OpenAiLLMService(model_name="gpt-4o-2024-08-06",
-                       api_key=os.getenv('OPENAI_API_KEY'))
+llm = get_openai_llm_service(model_name="gpt-4o-2024-08-06")
 
 class AgentFunctionalityUsecase:
-    
+
+    # Steps run concurrently, so their log entries are written one at a time.
+    _log_lock = threading.Lock()
+
     def log_metrics(self, step, status, error_message=None, execution_time=None):
         print("LOGGING HAS STARTED")
         metrics_entry = {
@@ -44,17 +56,18 @@ class AgentFunctionalityUsecase:
             "error_message": error_message,
             "execution_time": execution_time
         }
-        with open('logs/logs.txt', 'a') as log_file:
+        with self._log_lock, open('logs/logs.txt', 'a') as log_file:
             log_file.write(json.dumps(metrics_entry, indent=2) + '\n')
 
     
-    def Generate_steps(self, strategy: str, apis: list) -> Dict[str, str]:
+    def Generate_steps(self, strategy: str, apis: list, dependencies: Dict[str, List[str]] = None) -> Dict[str, str]:
         """
         Generate steps for a given strategy, ensuring alignment with available API endpoints.
         
         Args:
             strategy (str): High-level task description for which steps are generated.
             apis (list): List of available API functions to be mapped.
+            dependencies (dict): When given, filled with the earlier steps whose output every step uses.
             
         Returns:
             Dict[str, str]: Generated steps mapped to available APIs.
@@ -62,7 +75,7 @@ class AgentFunctionalityUsecase:
         function_call_service = LLM_function_calling_service()
         generator = llmGen.LLM_step_generation_service()
 
-        functions = generator.Generate_steps(strategy=strategy, apis=apis)
+        functions = generator.Generate_steps(strategy=strategy, apis=apis, dependencies=dependencies)
         print("The list of functions has been generated and returned", type(functions), "with length of", len(functions))
         return functions
         
@@ -116,15 +129,50 @@ class AgentFunctionalityUsecase:
             return steps[step_key]
 
 
-    def Execute_steps(self, steps: Dict[str, str]) -> dict:
+    def Execute_steps(self, steps: Dict[str, str], dependencies: Dict[str, List[str]] = None,
+                      plan_calls: Dict[str, dict] = None, cancelled: threading.Event = None) -> dict:
         """
         Executes a sequence of steps by calling respective API functions, generates parameters for missing ones, and handles retries for errors.
         It retries the same function with generated parameters first and then regenerates the function up to three times.
+        Independent steps run concurrently, see StepExecutionEngine; the results keep the order of the steps.
         
         :param steps: A dictionary where the keys are step names and values are API names.
+        :param dependencies: The names of the steps every step depends on, see Generate_steps. The steps run in order when not given.
+        :param plan_calls: When given, filled with the call that completed every successful step, see ExecutionPlanCache.
+        :param cancelled: When set, steps that have not started yet and retries are skipped with a Cancelled error.
         :return: A dictionary containing execution results for all steps.
         """
         logger.info("Execution of the functions has started")
+        results = StepExecutionEngine().run(
+            steps,
+            lambda step_name, api_name: self._execute_step(steps, step_name, api_name, cancelled),
+            dependencies,
+        )
+
+        steps_execution = []
+        user_prompt_data = {}
+        for step_name in steps:
+            step_execution, user_prompts, plan_call = results.get(step_name, ([], {}, None))
+            steps_execution.extend(step_execution)
+            user_prompt_data.update(user_prompts)
+            if plan_calls is not None and plan_call is not None:
+                plan_calls[step_name] = plan_call
+
+        logger.info("Execution of all functions completed.")
+        return {
+            "steps_execution": steps_execution,
+            "user_prompts": user_prompt_data
+        }
+
+    def _execute_step(self, steps: Dict[str, str], step_name: str, api_name: str,
+                      cancelled: threading.Event = None) -> Tuple[List[dict], dict, dict]:
+        """
+        Executes a single step with its retries and regenerations. Once cancelled is set, the step stops
+        before its next attempt.
+
+        :return: A tuple of the execution entries of the step, the user prompts it requires, by API name,
+                 and the call that completed it (None when it did not succeed).
+        """
         argument_generator = Parameter_Generation()
         api_calling = api_mapper.API_calling_function()
         utils_functionality = API_Utils()
@@ -132,24 +180,69 @@ class AgentFunctionalityUsecase:
         steps_execution = []
         user_prompt_data = {}
         max_retries = 3
+        plan_call = None
+
+        print(f"Executing step: {step_name}")
+        retry = 0
+        iteration_response = None
+        user_arguments = {}
+        run_dependent = []
+        while retry <= max_retries:
+            if cancelled is not None and cancelled.is_set():
+                iteration_response = self._cancelled_response()
+                steps_execution.append({
+                    "function": step_name,
+                    "iteration_response": iteration_response
+                })
+                break
+            try:
+                if not isinstance(api_name, str):
+                    self.log_metrics(step_name, "failure", f"Invalid type for API in step '{step_name}'")
+                    iteration_response = {
+                        "endpoint_name": None,
+                        "status": "error",
+                        "details": {
+                            "code": 400,
+                            "error_type": "InvalidAPIType",
+                            "message": f"Invalid type for API in step '{step_name}': expected str, got {type(api_name)}",
+                            "confidence": 1.0
+                        },
+                        "required_parameters": {}
+                    }
+                    steps_execution.append({
+                        "function": step_name,
+                        "iteration_response": iteration_response
+                    })
+                    break
 
-        for step_name, api_name in steps.items():
-            print(f"Executing step: {step_name}")
-            retry = 0
-            iteration_response = None
-            user_arguments = {}
-            while retry <= max_retries:
-                try:
-                    if not isinstance(api_name, str):
-                        self.log_metrics(step_name, "failure", f"Invalid type for API in step '{step_name}'")
+                selection_step = step_name
+                # A retry selects again after the endpoint failed, so it must not reuse the cached decision.
+                with refresh_llm_cache(retry > 0):
+                    selected_endpoint, required_parameters, confidence_score, score_reason = utils_functionality.select_endpoint(api_name=api_name, query=step_name)
+                if confidence_score < 0.85:
+                    for regen_attempt in range(max_retries):
+                        new_step = generator.re_generate_step(
+                            step_name=step_name,
+                            selected_endpoint=selected_endpoint.__name__,
+                            score_reason=score_reason
+                        )
+                        print(f"Regenerated step {regen_attempt + 1}: {new_step}")
+                        check = llm.decide_endpoint_score(query=new_step, endpoint_name=selected_endpoint.__name__)
+                        if check:
+                            step_name = new_step
+                            confidence_score = 0.85  
+                            break
+                    else:
+                        print(f"Failed to achieve sufficient confidence score after {max_retries} attempts for step '{step_name}'.")
+                        self.log_metrics(step_name, "failure", "Low confidence score after retries.")
                         iteration_response = {
-                            "endpoint_name": None,
+                            "endpoint_name": selected_endpoint.__name__,
                             "status": "error",
                             "details": {
                                 "code": 400,
-                                "error_type": "InvalidAPIType",
-                                "message": f"Invalid type for API in step '{step_name}': expected str, got {type(api_name)}",
-                                "confidence": 1.0
+                                "error_type": "LowConfidenceScore",
+                                "message": f"Failed to execute attempts for step '{step_name}' since the confidence is low to our .",
+                                "confidence": confidence_score
                             },
                             "required_parameters": {}
                         }
@@ -158,205 +251,419 @@ class AgentFunctionalityUsecase:
                             "iteration_response": iteration_response
                         })
                         break
-
-                    selected_endpoint, required_parameters, confidence_score, score_reason = utils_functionality.select_endpoint(api_name=api_name, query=step_name)              
-                    if confidence_score < 0.85:
-                        for regen_attempt in range(max_retries):
-                            new_step = generator.re_generate_step(
-                                step_name=step_name,
-                                selected_endpoint=selected_endpoint.__name__,
-                                score_reason=score_reason
-                            )
-                            print(f"Regenerated step {regen_attempt + 1}: {new_step}")
-                            check = llm.decide_endpoint_score(query=new_step, endpoint_name=selected_endpoint.__name__)
-                            if check:
-                                step_name = new_step
-                                confidence_score = 0.85  
-                                break
-                        else:
-                            print(f"Failed to achieve sufficient confidence score after {max_retries} attempts for step '{step_name}'.")
-                            self.log_metrics(step_name, "failure", "Low confidence score after retries.")
-                            iteration_response = {
-                                "endpoint_name": selected_endpoint.__name__,
-                                "status": "error",
-                                "details": {
-                                    "code": 400,
-                                    "error_type": "LowConfidenceScore",
-                                    "message": f"Failed to execute attempts for step '{step_name}' since the confidence is low to our .",
-                                    "confidence": confidence_score
-                                },
-                                "required_parameters": {}
-                            }
-                            steps_execution.append({
-                                "function": step_name,
-                                "iteration_response": iteration_response
-                            })
-                            break
-                    if required_parameters:
-                        missing_parameters = [p for p in required_parameters if p not in user_arguments]
-                    else:
-                        missing_parameters = []
-
-                    if missing_parameters:
-                        can_run, generated_arguments = argument_generator.generate_arguments(function=selected_endpoint, parameters=missing_parameters)
-                        if not can_run:
-                            print(f"Parameter generation failed for API '{api_name}'. Requesting user input.")
-                            user_prompt_data[api_name] = generated_arguments
-                            self.log_metrics(step_name, "failure", f"Missing user input for API '{api_name}'.")
-                            iteration_response = {
-                                "endpoint_name": selected_endpoint.__name__,
-                                "status": "input_required",
-                                "details": "Waiting for user input",
-                                "required_parameters": missing_parameters,
-                                "confidence_score": confidence_score
-                            }
-                            steps_execution.append({
-                                "function": step_name,
-                                "iteration_response": iteration_response
-                            })
-                            break
-
-                        if isinstance(generated_arguments, str):
-                            generated_arguments = json.loads(generated_arguments)
-
-                        user_arguments.update(generated_arguments)
-
-                    iteration_response = api_calling.endpoint_calling(
-                        selected_endpoint=selected_endpoint,
-                        user_parameters=user_arguments,
-                        confidence_score=confidence_score,
-                    )
-
-                    if iteration_response["status"] == "success":
-                        self.log_metrics(step_name, "success")
+                if required_parameters:
+                    missing_parameters = [p for p in required_parameters if p not in user_arguments]
+                else:
+                    missing_parameters = []
+
+                if missing_parameters:
+                    can_run, generated_arguments = argument_generator.generate_arguments(
+                        function=selected_endpoint, parameters=missing_parameters, run_dependent=run_dependent)
+                    if not can_run:
+                        print(f"Parameter generation failed for API '{api_name}'. Requesting user input.")
+                        user_prompt_data[api_name] = generated_arguments
+                        self.log_metrics(step_name, "failure", f"Missing user input for API '{api_name}'.")
+                        iteration_response = {
+                            "endpoint_name": selected_endpoint.__name__,
+                            "status": "input_required",
+                            "details": "Waiting for user input",
+                            "required_parameters": missing_parameters,
+                            "confidence_score": confidence_score
+                        }
                         steps_execution.append({
                             "function": step_name,
                             "iteration_response": iteration_response
                         })
                         break
 
-                    if iteration_response["status"] == "error":
-                        print(f"The function '{step_name}' failed. Attempting to regenerate function.")
-                        regenerated_success = False
-                        for regen_attempt in range(max_retries):
-                            regenerated_step = self.regenerate_step_with_context(steps, step_name, iteration_response["details"])
-                            print(f"Regenerated step {regen_attempt + 1}: {regenerated_step}")
-
-                            iteration_response = api_calling.endpoint_calling(
-                                selected_endpoint=selected_endpoint,
-                                required_parameters=required_parameters,
-                                confidence_score=confidence_score
-                            )
-
-                            if iteration_response["status"] == "success":
-                                self.log_metrics(step_name, "success")
-                                steps_execution.append({
-                                    "function": step_name,
-                                    "iteration_response": iteration_response
-                                })
-                                regenerated_success = True
-                                break
-                            
-                        if regenerated_success:
-                            break
+                    if isinstance(generated_arguments, str):
+                        generated_arguments = json.loads(generated_arguments)
 
-                except Exception as e:
-                    self.log_metrics(step_name, "failure", str(e))
-                    print(f"Error during '{step_name}': {e}")
-                    iteration_response = {
-                        "endpoint_name": None,
-                        "status": "error",
-                        "details": {
-                            "code": 500,
-                            "error_type": type(e).__name__,
-                            "message": f"An unexpected error occurred during step execution: {str(e)}",
-                            "confidence": 0.0
-                        },
-                        "required_parameters": {}
-                    }
+                    user_arguments.update(generated_arguments)
+
+                iteration_response = api_calling.endpoint_calling(
+                    selected_endpoint=selected_endpoint,
+                    user_parameters=user_arguments,
+                    confidence_score=confidence_score,
+                )
+
+                if iteration_response["status"] == "success":
+                    self.log_metrics(step_name, "success")
                     steps_execution.append({
                         "function": step_name,
                         "iteration_response": iteration_response
                     })
+                    plan_call = self._plan_call(api_name, selected_endpoint, user_arguments, confidence_score, run_dependent)
                     break
 
-                retry += 1
+                if iteration_response["status"] == "error":
+                    print(f"The function '{step_name}' failed. Attempting to regenerate function.")
+                    regenerated_success = False
+                    for regen_attempt in range(max_retries):
+                        regenerated_step = self.regenerate_step_with_context(steps, step_name, iteration_response["details"])
+                        print(f"Regenerated step {regen_attempt + 1}: {regenerated_step}")
+
+                        iteration_response = api_calling.endpoint_calling(
+                            selected_endpoint=selected_endpoint,
+                            required_parameters=required_parameters,
+                            confidence_score=confidence_score
+                        )
+
+                        if iteration_response["status"] == "success":
+                            self.log_metrics(step_name, "success")
+                            steps_execution.append({
+                                "function": step_name,
+                                "iteration_response": iteration_response
+                            })
+                            plan_call = self._plan_call(api_name, selected_endpoint, {}, confidence_score)
+                            regenerated_success = True
+                            break
+                        
+                    if regenerated_success:
+                        break
+
+                    # The endpoint keeps failing for this step, so it is selected again next time
+                    utils_functionality.forget_endpoint(api_name=api_name, query=selection_step)
 
-            logger.info(f"Execution completed for step '{step_name}' with status: {iteration_response['status']}")
+            except Exception as e:
+                self.log_metrics(step_name, "failure", str(e))
+                print(f"Error during '{step_name}': {e}")
+                iteration_response = {
+                    "endpoint_name": None,
+                    "status": "error",
+                    "details": {
+                        "code": 500,
+                        "error_type": type(e).__name__,
+                        "message": f"An unexpected error occurred during step execution: {str(e)}",
+                        "confidence": 0.0
+                    },
+                    "required_parameters": {}
+                }
+                steps_execution.append({
+                    "function": step_name,
+                    "iteration_response": iteration_response
+                })
+                break
 
-        logger.info("Execution of all functions completed.")
+            # Back off before calling the failing endpoint again, so retries do not hammer its host.
+            if cancelled is not None:
+                cancelled.wait(jittered_backoff(retry))
+            else:
+                time.sleep(jittered_backoff(retry))
+            retry += 1
+
+        logger.info(f"Execution completed for step '{step_name}' with status: {iteration_response['status']}")
+        return steps_execution, user_prompt_data, plan_call
+
+    @staticmethod
+    def _cancelled_response() -> dict:
         return {
-            "steps_execution": steps_execution,
-            "user_prompts": user_prompt_data
+            "endpoint_name": None,
+            "status": "error",
+            "details": {
+                "code": 408,
+                "error_type": "Cancelled",
+                "message": "The step was not run because its module timed out.",
+                "confidence": 0.0
+            },
+            "required_parameters": {}
         }
-    def Execute_modules(self, agent_id, modules: List[Module]) -> List[dict]:
-        performance_analyzer = PerformanceAnalyzer(LLMService(model_name="gemini-1.5-flash"))
-        repository = ModuleExecutionRepository()
-        modules_performance = []
-        results = []
+
+    def Execute_modules(self, agent_id, modules: List[Module], max_workers: int = None,
+                        module_timeout: float = None) -> Tuple[dict, bool]:
+        """
+        Generates and executes the steps of every module, analyzes its performance and summarizes it.
+        The modules of a workstream are independent, so they run concurrently on a bounded pool; a
+        failing or timed out module does not affect the others. Results keep the order of the modules,
+        and the executions are stored together once every module is done.
+
+        A timed out module is cancelled: it starts no further steps or retries and is not analyzed or
+        stored. Calls it already has in flight cannot be interrupted and may still complete, with
+        their side effects.
+
+        :param agent_id: ID of the agent the modules belong to.
+        :param modules: The modules to execute.
+        :param max_workers: How many modules run at once. Defaults to MODULE_EXECUTION_MAX_WORKERS; 1 runs them one after another.
+        :param module_timeout: Seconds a module may run before it is reported as failed. Defaults to MODULE_EXECUTION_TIMEOUT_SECONDS.
+        :return: A tuple of a dictionary with the results of the modules and whether an error occurred.
+        """
+        max_workers = max_workers or int(os.getenv("MODULE_EXECUTION_MAX_WORKERS", "4"))
+        module_timeout = module_timeout or float(os.getenv("MODULE_EXECUTION_TIMEOUT_SECONDS", "600"))
         print("This is the amount of modules", len(modules))
         print("These are the modules:", modules)
 
+        started_at: Dict[int, float] = {}
+        cancelled = [threading.Event() for _ in modules]
+
+        # Modules run in the app context of the caller, so their steps can be bound to it in turn.
+        @bind_app_context
+        def run(idx: int, module: Module) -> dict:
+            started_at[idx] = time.perf_counter()
+            return self._execute_module(agent_id, idx, len(modules), module, cancelled[idx])
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(modules) or 1)))
+        futures = [executor.submit(run, idx, module) for idx, module in enumerate(modules)]
+
+        results = []
+        executions = []
         error_occurred = False
-        for idx, module in enumerate(modules):
-            print(f"Processing module {idx + 1}/{len(modules)}: {module.module}")
+        for idx, (module, future) in enumerate(zip(modules, futures)):
+            outcome = self._wait_for_module(future, started_at, idx, module_timeout)
+            if outcome is None:
+                print(f"Module {idx + 1} timed out after {module_timeout} seconds, cancelling its remaining steps")
+                cancelled[idx].set()
+                outcome = {
+                    "error_occurred": True,
+                    "result": {
+                        "module": module.module,
+                        "steps_execution": (
+                            f"Module execution timed out after {module_timeout} seconds. Its remaining steps were "
+                            "cancelled, but the calls it had in flight may still complete and have side effects."),
+                        "performance": "Error on updating the performance.",
+                        "execution_summary": None,
+                    },
+                }
+            error_occurred = error_occurred or outcome["error_occurred"]
+            if outcome.get("result") is not None:
+                results.append(outcome["result"])
+            if outcome.get("execution") is not None:
+                executions.append(outcome["execution"])
+        # Timed out modules finish their calls in flight in the background; their results are discarded.
+        executor.shutdown(wait=False)
+
+        if executions:
             try:
-                steps = self.Generate_steps(module.module, module.apis)
-                print(f"Generated steps for module {idx + 1}: {steps}")
+                ModuleExecutionRepository().create_executions(executions)
+                print("stored on repository")
             except Exception as e:
-                print(f"Step generation failed for module {idx + 1}: {str(e)}")
-                modules_performance.append({"module": module.module, "error": f"Step generation failed: {str(e)}"})
+                print(f"Storing the module executions failed: {str(e)}")
                 error_occurred = True
-                continue
 
-            try:
-                result = self.Execute_steps(steps)
+        return {
+            "results": results,
+        }, error_occurred
 
-                # check if some steps failed to execute
-                if any(iteration["iteration_response"]["status"] == "error" for iteration in result["steps_execution"]):
-                    error_occurred = True
+    @staticmethod
+    def _wait_for_module(future, started_at: Dict[int, float], idx: int, module_timeout: float):
+        """
+        Waits for a module until it is done or has been running for module_timeout seconds. Time spent
+        queued behind other modules does not count.
 
-                print('Module execution result', result)
+        :return: The outcome of the module, or None when it timed out.
+        """
+        while True:
+            start = started_at.get(idx)
+            remaining = module_timeout if start is None else module_timeout - (time.perf_counter() - start)
+            if remaining <= 0:
+                return None
+            try:
+                return future.result(timeout=min(remaining, 1.0))
+            except FuturesTimeoutError:
+                continue
 
-                module_performance = performance_analyzer.analyze_module_performance(module, result)
-                print('kkkkkkkkkkkkkkkkk')
-                print(f"Analyzed performance for module {idx + 1}: {module_performance}")
-                expectations = [{"expected_value": kpi.expected_value} for kpi in module.kpis]
-                metrics = [{"kpi": kpi.kpi} for kpi in module.kpis]
-                execution_summary= self.generate_execution_summary(module=module.module,expectations=expectations,metrics=metrics,module_executions=result)
-                print("here is the summary of the execution", execution_summary)
-                
-                execution = ModuleExecution(
-                    agent_id=agent_id,
-                    execution_time=datetime.utcnow(),
-                    result=json.dumps(result),  
-                    summary=execution_summary,
+    def replay_plan(self, plan: dict, plan_calls: Dict[str, dict] = None, cancelled: threading.Event = None) -> dict:
+        """
+        Executes the steps of a stored execution plan by calling the planned endpoints with the planned
+        arguments, without planning the steps again. Arguments that depend on the run are generated
+        again, and write steps are always planned again, as is a step whose planned call fails, as in
+        Execute_steps. Independent steps run concurrently, and the result has the shape of Execute_steps.
+
+        :param plan: The plan, see ExecutionPlanCache.
+        :param plan_calls: When given, filled with the call that completed every successful step.
+        :param cancelled: When set, steps that have not started yet are skipped with a Cancelled error.
+        :return: A dictionary containing execution results for all steps.
+        """
+        steps = plan["steps"]
+        api_calling = api_mapper.API_calling_function()
+
+        def replay_step(step_name: str, api_name: str) -> Tuple[List[dict], dict, dict]:
+            if cancelled is not None and cancelled.is_set():
+                return [{"function": step_name, "iteration_response": self._cancelled_response()}], {}, None
+            # What a write step sends depends on what this run fetched, so it is always planned again.
+            if WRITE_STEP_PATTERN.search(step_name):
+                return self._execute_step(steps, step_name, api_name, cancelled)
+
+            call = plan["calls"].get(step_name)
+            endpoint = getattr(get_api_instance(call["api_name"]), call["endpoint_name"], None) if call else None
+            arguments = dict(call["arguments"]) if call else {}
+            if endpoint is not None and call.get("regenerate"):
+                can_run, generated_arguments = Parameter_Generation().generate_arguments(
+                    function=endpoint, parameters=call["regenerate"])
+                if not can_run:
+                    endpoint = None
+                else:
+                    if isinstance(generated_arguments, str):
+                        generated_arguments = json.loads(generated_arguments)
+                    arguments.update(generated_arguments)
+            if endpoint is not None:
+                iteration_response = api_calling.endpoint_calling(
+                    selected_endpoint=endpoint,
+                    user_parameters=arguments,
+                    confidence_score=call.get("confidence", 1.0),
                 )
-                repository.create_execution(execution)
-                print("stored on repository")
-                modules_performance.append(module_performance)
-                results.append({
+                if iteration_response["status"] == "success":
+                    self.log_metrics(step_name, "success")
+                    return [{"function": step_name, "iteration_response": iteration_response}], {}, call
+                print(f"The planned call of step '{step_name}' failed, planning the step again.")
+            return self._execute_step(steps, step_name, api_name, cancelled)
+
+        results = StepExecutionEngine().run(steps, replay_step, plan.get("dependencies"))
+        steps_execution = []
+        user_prompt_data = {}
+        for step_name in steps:
+            step_execution, user_prompts, plan_call = results.get(step_name, ([], {}, None))
+            steps_execution.extend(step_execution)
+            user_prompt_data.update(user_prompts)
+            if plan_calls is not None and plan_call is not None:
+                plan_calls[step_name] = plan_call
+        plan_cache = get_execution_plan_cache()
+        if plan_cache is not None:
+            plan_cache.record_replay(plan["plan_hash"])
+        return {
+            "steps_execution": steps_execution,
+            "user_prompts": user_prompt_data
+        }
+
+    @staticmethod
+    def _plan_call(api_name: str, endpoint, arguments: dict, confidence: float, run_dependent: list = None) -> dict:
+        """
+        :param run_dependent: The arguments flagged as depending on the run when they were generated, see
+                              Parameter_Generation.generate_arguments. Empty when none was flagged.
+        :return: The call that completed a step, as stored in an execution plan. Arguments that depend
+                 on the run are not stored; their parameters are listed under regenerate instead.
+        """
+        static_arguments, regenerate = split_plan_arguments(endpoint, arguments, run_dependent)
+        return {"api_name": api_name, "endpoint_name": endpoint.__name__, "arguments": static_arguments,
+                "regenerate": regenerate, "confidence": confidence}
+
+    @staticmethod
+    def _get_current_plan(plan_cache: ExecutionPlanCache, plan_hash: str) -> dict:
+        """
+        :return: The stored plan of a module, or None when there is none or an API it calls has changed.
+        """
+        if plan_cache is None:
+            return None
+        plan = plan_cache.get(plan_hash)
+        if plan is None:
+            return None
+        if any("regenerate" not in call for call in plan["calls"].values()):
+            # Stored before run dependent arguments were split off, so its arguments may be stale.
+            plan_cache.invalidate(plan_hash)
+            return None
+        for api_name, version in plan.get("api_versions", {}).items():
+            api_instance = get_api_instance(api_name)
+            if api_instance is None or api_method_set_version(api_instance) != version:
+                print(f"The execution plan {plan_hash} is outdated, planning again")
+                plan_cache.invalidate(plan_hash)
+                return None
+        return plan
+
+    @staticmethod
+    def _store_plan(plan_cache: ExecutionPlanCache, plan_hash: str, plan: dict, steps: Dict[str, str],
+                    plan_calls: Dict[str, dict], dependencies: Dict[str, List[str]] = None) -> None:
+        """
+        Stores the plan of a module when every step completed, so the next run replays it. A replayed
+        plan is stored again when one of its steps had to be planned again, and dropped when a step
+        could not be completed at all.
+        """
+        if plan_cache is None or not steps:
+            return
+        if set(plan_calls) != set(steps):
+            if plan is not None:
+                plan_cache.invalidate(plan_hash)
+            return
+        if plan is not None and plan_calls == plan["calls"]:
+            return
+        try:
+            api_versions = {
+                call["api_name"]: api_method_set_version(get_api_instance(call["api_name"]))
+                for call in plan_calls.values()
+            }
+            plan_cache.set(plan_hash, steps, plan_calls, api_versions, dependencies or None)
+        except Exception as e:
+            print(f"Storing the execution plan failed: {str(e)}")
+
+    def _execute_module(self, agent_id, idx: int, total: int, module: Module,
+                        cancelled: threading.Event = None) -> dict:
+        """
+        Runs a single module: step generation, step execution, performance analysis and summary.
+        Once cancelled is set, the module starts no further steps and is neither analyzed nor stored.
+
+        :return: A dictionary with the result entry of the module, the execution to store and whether an error occurred.
+        """
+        print(f"Processing module {idx + 1}/{total}: {module.module}")
+        plan_cache = get_execution_plan_cache()
+        plan_hash = ExecutionPlanCache.plan_hash(agent_id, module.module, module.apis)
+        plan = self._get_current_plan(plan_cache, plan_hash)
+        if plan is not None:
+            steps = plan["steps"]
+            dependencies = plan.get("dependencies")
+            print(f"Replaying the execution plan of module {idx + 1}")
+        else:
+            try:
+                dependencies = {}
+                steps = self.Generate_steps(module.module, module.apis, dependencies)
+                print(f"Generated steps for module {idx + 1}: {steps}")
+            except Exception as e:
+                print(f"Step generation failed for module {idx + 1}: {str(e)}")
+                return {"error_occurred": True, "result": None}
+
+        error_occurred = False
+        execution_summary = None
+        try:
+            plan_calls = {}
+            if plan is not None:
+                result = self.replay_plan(plan, plan_calls, cancelled)
+            else:
+                result = self.Execute_steps(steps, dependencies or None, plan_calls=plan_calls, cancelled=cancelled)
+            if cancelled is not None and cancelled.is_set():
+                print(f"Module {idx + 1} was cancelled, discarding its results")
+                return {"error_occurred": True, "result": None}
+            self._store_plan(plan_cache, plan_hash, plan, steps, plan_calls, dependencies)
+
+            # check if some steps failed to execute
+            if any(iteration["iteration_response"]["status"] == "error" for iteration in result["steps_execution"]):
+                error_occurred = True
+
+            print('Module execution result', result)
+
+            performance_analyzer = PerformanceAnalyzer(LLMService(model_name="gemini-1.5-flash"))
+            module_performance = performance_analyzer.analyze_module_performance(module, result)
+            print(f"Analyzed performance for module {idx + 1}: {module_performance}")
+            expectations = [{"expected_value": kpi.expected_value} for kpi in module.kpis]
+            metrics = [{"kpi": kpi.kpi} for kpi in module.kpis]
+            execution_summary= self.generate_execution_summary(module=module.module,expectations=expectations,metrics=metrics,module_executions=result)
+            print("here is the summary of the execution", execution_summary)
+
+            execution = ModuleExecution(
+                agent_id=agent_id,
+                execution_time=datetime.datetime.utcnow(),
+                result=json.dumps(result),
+                summary=execution_summary,
+            )
+            return {
+                "error_occurred": error_occurred,
+                "execution": execution,
+                "result": {
                     "module": module.module,
                     "steps_execution": result,
                     "performance": module_performance,
                     "execution_summary": execution_summary,
-                })
-                
-            except Exception as e:
-                print(f"Step execution failed for module {idx + 1}: {str(e)}")
-                error_occurred = True
-                modules_performance.append({"module": module.module, "error": f"Step execution failed: {str(e)}"})
-                results.append({
+                },
+            }
+
+        except Exception as e:
+            print(f"Step execution failed for module {idx + 1}: {str(e)}")
+            return {
+                "error_occurred": True,
+                "result": {
                     "module": module.module,
                     "steps_execution": f"Step execution failed: {str(e)}",
                     "performance": "Error on updating the performance.",
                     "execution_summary": execution_summary
-                })
-                continue
+                },
+            }
 
-        return {
-            "results": results,
-        }
     def generate_execution_summary(
         self,
         module: str,
@@ -0,0 +1,156 @@
+import functools
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List
+
+from flask import current_app, has_app_context
+
+from infrastructure.task_graph import TaskGraph
+
+
+# Steps that change something outside of the agent. They may rely on what the steps before them
+# fetched, and the steps after them may rely on the change, so they are never run alongside others.
+WRITE_STEP_PATTERN = re.compile(
+    r"\b(send|post|publish|notify|share|create|update|delete|remove|schedule|upload|email|reply|tweet|write|save|store)\w*\b",
+    re.IGNORECASE,
+)
+
+
+def bind_app_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Binds func to the Flask app context of the caller, when it has one, so the API clients can use
+    current_app from the worker threads func runs on. Every call pushes its own app context.
+    """
+    if not has_app_context():
+        return func
+    app = current_app._get_current_object()
+
+    @functools.wraps(func)
+    def run_in_app_context(*args, **kwargs):
+        with app.app_context():
+            return func(*args, **kwargs)
+
+    return run_in_app_context
+
+
+def infer_step_dependencies(steps: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Infers the orderings that hold whatever the steps declare, from the step descriptions and their
+    APIs: steps that use the same API run in their original order, a write step waits for every step
+    before it, and every step after a write waits for it. Whether a read uses the output of a read
+    from another API cannot be told from the descriptions, so that has to be declared.
+
+    :param steps: A dictionary where the keys are step names and values are API names.
+    :return: A dictionary of every step name to the names of the steps it depends on.
+    """
+    dependencies: Dict[str, List[str]] = {}
+    last_step_by_api: Dict[str, str] = {}
+    last_write = None
+    since_last_write: List[str] = []
+
+    for step_name, api_name in steps.items():
+        depends_on = set()
+        if last_write is not None:
+            depends_on.add(last_write)
+        if isinstance(api_name, str) and api_name in last_step_by_api:
+            depends_on.add(last_step_by_api[api_name])
+
+        if WRITE_STEP_PATTERN.search(step_name):
+            depends_on.update(since_last_write)
+            last_write = step_name
+            since_last_write = []
+        else:
+            since_last_write.append(step_name)
+
+        if isinstance(api_name, str):
+            last_step_by_api[api_name] = step_name
+        dependencies[step_name] = [name for name in steps if name in depends_on]
+    return dependencies
+
+
+class StepExecutionEngine:
+    """
+    Runs the steps of a module as a dependency graph on a bounded thread pool. A step starts as soon
+    as every step it depends on is done, so independent steps, such as reads from different APIs,
+    run concurrently. The dependencies are declared by the caller, typically by the step generator,
+    and completed with infer_step_dependencies. Steps without declared dependencies run in order.
+    Steps run in the Flask app context of the caller, see bind_app_context.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or int(os.getenv("STEP_EXECUTION_MAX_WORKERS", "4"))
+
+    def run(self, steps: Dict[str, str], execute_step: Callable[[str, str], Any],
+            dependencies: Dict[str, List[str]] = None) -> Dict[str, Any]:
+        """
+        :param steps: A dictionary where the keys are step names and values are API names.
+        :param execute_step: Called with the name and API of every step; must handle its own errors.
+        :param dependencies: The names of the steps every step depends on. When not given, every step
+                             depends on the one before it. Dependencies on unknown steps are ignored.
+        :return: The result of execute_step for every step name.
+        """
+        execute_step = bind_app_context(execute_step)
+        if dependencies is None:
+            dependencies = self._in_order(steps)
+        else:
+            inferred = infer_step_dependencies(steps)
+            dependencies = {step_name: list(dependencies.get(step_name) or []) + inferred[step_name]
+                            for step_name in steps}
+        if self._has_cycle(steps, dependencies):
+            print("Step dependencies contain a cycle, running the steps in order")
+            dependencies = self._in_order(steps)
+
+        waiting_on = {step_name: {name for name in dependencies.get(step_name, []) if name in steps and name != step_name}
+                      for step_name in steps}
+        dependents: Dict[str, List[str]] = {step_name: [] for step_name in steps}
+        for step_name, depends_on in waiting_on.items():
+            for name in depends_on:
+                dependents[name].append(step_name)
+
+        results: Dict[str, Any] = {}
+        lock = threading.Lock()
+        graph = TaskGraph(self.max_workers)
+
+        def on_done(step_name: str, result: Any) -> None:
+            ready = []
+            with lock:
+                results[step_name] = result
+                for dependent in dependents[step_name]:
+                    waiting_on[dependent].discard(step_name)
+                    if not waiting_on[dependent]:
+                        ready.append(dependent)
+            for dependent in ready:
+                submit(dependent)
+
+        def submit(step_name: str) -> None:
+            graph.submit(execute_step, step_name, steps[step_name],
+                         on_done=lambda result, step_name=step_name: on_done(step_name, result))
+
+        for step_name in [name for name, depends_on in waiting_on.items() if not depends_on]:
+            submit(step_name)
+        graph.wait()
+        return results
+
+    @staticmethod
+    def _in_order(steps: Dict[str, str]) -> Dict[str, List[str]]:
+        step_names = list(steps)
+        return {step_name: step_names[index - 1:index] for index, step_name in enumerate(step_names)}
+
+    @staticmethod
+    def _has_cycle(steps: Dict[str, str], dependencies: Dict[str, List[str]]) -> bool:
+        visiting, done = set(), set()
+
+        def visit(step_name: str) -> bool:
+            if step_name in done:
+                return False
+            if step_name in visiting:
+                return True
+            visiting.add(step_name)
+            if any(visit(name) for name in dependencies.get(step_name, []) if name in steps and name != step_name):
+                return True
+            visiting.discard(step_name)
+            done.add(step_name)
+            return False
+
+        return any(visit(step_name) for step_name in steps)